@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.instrumentation import QueryStats, start_query_stats, stop_query_stats
+
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+http_requests = registry.counter("http_requests_total", "HTTP requests.", ("method", "route", "status"))
+http_duration = registry.histogram("http_request_duration_seconds", "Request latency.", ("method", "route"))
+db_queries = registry.histogram(
+    "db_queries_per_request", "SQL statements per request.", ("method", "route"), buckets=QUERY_COUNT_BUCKETS
+)
+db_time = registry.histogram("db_time_per_request_seconds", "Time spent in SQL per request.", ("method", "route"))
+db_pool_wait = registry.histogram(
+    "db_pool_wait_per_request_seconds", "Time spent waiting for pooled connections per request.", ("method", "route")
+)
+db_slowest = registry.gauge(
+    "db_slowest_statement_seconds", "Slowest single statement seen per route.", ("method", "route")
+)
+db_n_plus_one = registry.counter(
+    "db_n_plus_one_requests_total", "Requests that repeated one statement shape N+1 style.", ("method", "route")
+)
+
+
+class RouteSQLStats:
+    """Per-route slowest statement and repeated shapes, for /admin/sql-stats."""
+
+    def __init__(self, max_shapes: int = 20):
+        self.max_shapes = max_shapes
+        self._routes: dict[tuple[str, str], dict] = {}
+        self._warned: set[tuple[str, str, str]] = set()
+
+    def record(self, method: str, route: str, stats: QueryStats, repeated: list[tuple[str, int]]) -> None:
+        entry = self._routes.setdefault(
+            (method, route),
+            {"requests": 0, "queries": 0, "slowest_seconds": 0.0, "slowest_statement": None, "n_plus_one": {}},
+        )
+        entry["requests"] += 1
+        entry["queries"] += stats.queries
+        if stats.slowest_seconds > entry["slowest_seconds"]:
+            entry["slowest_seconds"] = stats.slowest_seconds
+            entry["slowest_statement"] = stats.slowest_statement
+        for shape, count in repeated:
+            seen = entry["n_plus_one"]
+            if shape in seen or len(seen) < self.max_shapes:
+                seen[shape] = max(seen.get(shape, 0), count)
+            if (method, route, shape) not in self._warned:
+                self._warned.add((method, route, shape))
+                logger.warning("N+1 suspected on %s %s: %d x %s", method, route, count, shape[:300])
+
+    def snapshot(self) -> list[dict]:
+        return [
+            {"method": method, "route": route, **entry, "avg_queries": entry["queries"] / entry["requests"]}
+            for (method, route), entry in sorted(self._routes.items(), key=lambda item: item[0][1])
+        ]
+
+
+route_sql_stats = RouteSQLStats()
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class SQLMetricsMiddleware:
+    """Collects per-route request and SQL metrics (pure ASGI, so streamed bodies are not buffered).
+
+    With ``sql_debug_headers`` the request's query count, DB time, pool wait,
+    slowest statement time and N+1 suspects are returned as ``X-DB-*`` headers.
+    Statements of a streamed body that run after the headers went out are
+    counted in the metrics but cannot appear in the headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_query_stats()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_summary(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.sql_debug_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.queries)
+                    headers["X-DB-Time-ms"] = f"{stats.db_seconds * 1000:.1f}"
+                    headers["X-DB-Pool-Wait-ms"] = f"{stats.pool_wait_seconds * 1000:.1f}"
+                    headers["X-DB-Slowest-ms"] = f"{stats.slowest_seconds * 1000:.1f}"
+                    repeated = stats.repeated(settings.sql_n_plus_one_threshold)
+                    if repeated:
+                        headers["X-DB-N-Plus-One"] = "; ".join(f"{count}x {shape[:120]}" for shape, count in repeated[:3])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_summary)
+        finally:
+            stop_query_stats(token)
+            self._observe(scope, status, time.perf_counter() - started, stats)
+
+    @staticmethod
+    def _observe(scope: Scope, status: int, elapsed: float, stats: QueryStats) -> None:
+        method, route = scope["method"], _route_label(scope)
+        http_requests.inc(method, route, str(status))
+        http_duration.observe(method, route, value=elapsed)
+        db_queries.observe(method, route, value=stats.queries)
+        db_time.observe(method, route, value=stats.db_seconds)
+        db_pool_wait.observe(method, route, value=stats.pool_wait_seconds)
+        db_slowest.set_max(method, route, value=stats.slowest_seconds)
+        repeated = stats.repeated(settings.sql_n_plus_one_threshold)
+        if repeated:
+            db_n_plus_one.inc(method, route)
+        route_sql_stats.record(method, route, stats, repeated)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.middleware import route_sql_stats
+from app.db.session import get_read_db
+from app.services.olap_snapshot import ledger_snapshot
+from app.services.period_balance_service import PeriodBalanceService
+from app.services.posting_pipeline import posting_pipeline
+from app.services.reference_catalog import reference_catalog
+from app.services.report_cache import report_cache
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/reference-catalog")
+async def reference_catalog_stats():
+    return reference_catalog.stats()
+
+
+@router.get("/posting-pipeline")
+async def posting_pipeline_stats():
+    return posting_pipeline.stats()
+
+
+@router.get("/period-balance/check")
+async def period_balance_check(db: AsyncSession = Depends(get_read_db)):
+    mismatches = await PeriodBalanceService(db).check()
+    return {"consistent": not mismatches, "mismatches": mismatches}
+
+
+@router.get("/report-cache")
+async def report_cache_stats():
+    return report_cache.stats()
+
+
+@router.get("/olap-snapshot")
+async def olap_snapshot_stats():
+    return ledger_snapshot.stats()
+
+
+@router.get("/sql-stats")
+async def sql_stats():
+    return route_sql_stats.snapshot()
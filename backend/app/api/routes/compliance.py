@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.schemas.compliance import BoardComplianceStatus, ComplianceIssue
 from app.services.compliance_service import ComplianceService
 
@@ -8,7 +8,7 @@ router = APIRouter(prefix="/compliance", tags=["compliance"])
 
 
 @router.get("/board", response_model=BoardComplianceStatus)
-async def board_compliance(db: AsyncSession = Depends(get_db)):
+async def board_compliance(db: AsyncSession = Depends(get_read_db)):
     service = ComplianceService(db)
     stats, issues = await service.evaluate_board()
     return BoardComplianceStatus(
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.exceptions import DuplicateRRNException
+from app.db.session import get_db, get_read_db
+from app.schemas.donation import DonationReceiptRead, DonorRRN
+from app.services.donor_service import DonorService
+
+router = APIRouter(prefix="/donors", tags=["donors"])
+
+
+@router.put("/{donor_id}/rrn", status_code=204)
+async def set_donor_rrn(donor_id: str, payload: DonorRRN, db: AsyncSession = Depends(get_db)):
+    service = DonorService(db)
+    try:
+        sensitive = await service.set_rrn(donor_id, payload.rrn)
+    except DuplicateRRNException as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if sensitive is None:
+        raise HTTPException(status_code=404, detail="Donor not found")
+
+
+@router.post("/receipts/lookup", response_model=list[DonationReceiptRead])
+async def lookup_receipts(payload: DonorRRN, db: AsyncSession = Depends(get_read_db)):
+    service = DonorService(db)
+    return await service.receipts_by_rrn(payload.rrn)
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_read_db
+from app.schemas.fiscal_period import FiscalPeriodClose, FiscalPeriodCloseResult, FiscalPeriodRead
+from app.services.fiscal_period_service import FiscalPeriodService
+
+router = APIRouter(prefix="/fiscal-periods", tags=["fiscal-periods"])
+
+
+@router.get("", response_model=list[FiscalPeriodRead])
+async def list_fiscal_periods(db: AsyncSession = Depends(get_read_db)):
+    return await FiscalPeriodService(db).list_periods()
+
+
+@router.post("/{fiscal_year}/close", response_model=FiscalPeriodCloseResult)
+async def close_fiscal_period(fiscal_year: int, payload: FiscalPeriodClose, db: AsyncSession = Depends(get_db)):
+    try:
+        return await FiscalPeriodService(db).close(fiscal_year, payload.closed_by, payload.net_assets_account_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
+@router.post("/{fiscal_year}/reopen", response_model=FiscalPeriodRead)
+async def reopen_fiscal_period(fiscal_year: int, db: AsyncSession = Depends(get_db)):
+    try:
+        return await FiscalPeriodService(db).reopen(fiscal_year)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
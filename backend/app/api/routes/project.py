@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.schemas.project import ProjectCreate, ProjectRead
 
 router = APIRouter(prefix="/projects", tags=["projects"])
@@ -13,7 +13,7 @@ async def create_project(payload: ProjectCreate, db: AsyncSession = Depends(get_
 
 
 @router.get("/{project_id}", response_model=ProjectRead)
-async def get_project(project_id: str, db: AsyncSession = Depends(get_db)):
+async def get_project(project_id: str, db: AsyncSession = Depends(get_read_db)):
     # TODO: implement service layer
     return {
         "id": project_id,
@@ -1,9 +1,15 @@
 from datetime import date
-from fastapi import APIRouter, Depends, Query
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.services.reporting_service import ReportingService
+from app.db.session import get_db, get_read_db, read_engine
+from app.core.config import settings
+from app.services.ledger_export_service import LedgerExportService
+from app.services.olap_snapshot import DIMENSIONS, ledger_snapshot
+from app.services.report_cache import report_cache
+from app.services.reporting_service import ReportingService, comparative_range
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
@@ -12,10 +18,19 @@ router = APIRouter(prefix="/reports", tags=["reports"])
 async def financials(
     start: date = Query(...),
     end: date = Query(...),
-    db: AsyncSession = Depends(get_db),
+    granularity: str | None = Query(None, pattern="^(month|quarter|year)$"),
+    compare: str | None = Query(None, pattern="^(previous|prior_year)$"),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    service = ReportingService(db)
-    return await service.financial_statements(start, end)
+    if compare and not granularity:
+        raise HTTPException(status_code=400, detail="compare requires a granularity")
+    return await report_cache.get_or_compute(
+        db,
+        "financials",
+        {"start": start, "end": end, "granularity": granularity, "compare": compare},
+        lambda session: ReportingService(session).financial_statements(start, end, granularity, compare),
+        *comparative_range(start, end, granularity, compare),
+    )
 
 
 @router.get("/reserve")
@@ -25,17 +40,194 @@ async def reserve(
     limit_rate: float = Query(0.5),
     penalty_rate: float = Query(0.1),
     unused_amount: float = Query(0),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    service = ReportingService(db)
-    return await service.reserve_simulation(start, end, limit_rate, penalty_rate, unused_amount)
+    return await report_cache.get_or_compute(
+        db,
+        "reserve",
+        {
+            "start": start,
+            "end": end,
+            "limit_rate": limit_rate,
+            "penalty_rate": penalty_rate,
+            "unused_amount": unused_amount,
+        },
+        lambda session: ReportingService(session).reserve_simulation(
+            start, end, limit_rate, penalty_rate, unused_amount
+        ),
+        start,
+        end,
+    )
+
+
+@router.get("/reserve/grid")
+async def reserve_grid(
+    start: date = Query(...),
+    end: date = Query(...),
+    limit_rate: list[float] = Query(...),
+    penalty_rate: list[float] = Query(...),
+    unused_amount: list[float] = Query(...),
+    by_year: bool = Query(False),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        return await report_cache.get_or_compute(
+            db,
+            "reserve-grid",
+            {
+                "start": start,
+                "end": end,
+                "limit_rate": limit_rate,
+                "penalty_rate": penalty_rate,
+                "unused_amount": unused_amount,
+                "by_year": by_year,
+            },
+            lambda session: ReportingService(session).reserve_scenario_grid(
+                start, end, limit_rate, penalty_rate, unused_amount, by_year
+            ),
+            start,
+            end,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 @router.get("/compliance")
 async def compliance(
-    prev_year_revenue: float = Query(...),
-    current_public_spend: float = Query(...),
+    prev_year_revenue: float | None = Query(None),
+    current_public_spend: float | None = Query(None),
+    fiscal_year: int | None = Query(None, description="Derive both figures from the ledger for this year"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if prev_year_revenue is not None and current_public_spend is not None:
+        return await report_cache.get_or_compute(
+            db,
+            "compliance",
+            {"prev_year_revenue": prev_year_revenue, "current_public_spend": current_public_spend},
+            lambda session: ReportingService(session).public_spending_compliance(
+                prev_year_revenue, current_public_spend
+            ),
+        )
+    year = fiscal_year or date.today().year
+
+    async def derive(session: AsyncSession) -> dict:
+        return (await ReportingService(session).public_spending_compliance_trend(year, year))["years"][0]
+
+    return await report_cache.get_or_compute(
+        db,
+        "compliance", {"fiscal_year": year}, derive, date(year - 1, 1, 1), date(year, 12, 31)
+    )
+
+
+@router.get("/compliance/trend")
+async def compliance_trend(
+    from_year: int = Query(...),
+    to_year: int = Query(...),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if from_year > to_year:
+        raise HTTPException(status_code=400, detail="from_year must not be after to_year")
+    return await report_cache.get_or_compute(
+        db,
+        "compliance-trend",
+        {"from_year": from_year, "to_year": to_year},
+        lambda session: ReportingService(session).public_spending_compliance_trend(from_year, to_year),
+        date(from_year - 1, 1, 1),
+        date(to_year, 12, 31),
+    )
+
+
+@router.get("/olap")
+async def olap(
+    group_by: list[str] = Query([]),
+    start: date | None = Query(None),
+    end: date | None = Query(None),
+    project: list[str] = Query([]),
+    project_type: list[str] = Query([]),
+    account: list[str] = Query([]),
+    level1: list[str] = Query([]),
+    level2: list[str] = Query([]),
+    level3: list[str] = Query([]),
+    # Incremental refresh loads just-committed heads, so read the primary, not a replica
     db: AsyncSession = Depends(get_db),
+):
+    if not settings.olap_snapshot_enabled:
+        raise HTTPException(status_code=404, detail="OLAP snapshot is disabled")
+    unknown = [name for name in group_by if name not in DIMENSIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown group_by dimension(s): {unknown}")
+    await ledger_snapshot.refresh(db)
+    filters = {
+        name: values
+        for name, values in (
+            ("project", project),
+            ("project_type", project_type),
+            ("account", account),
+            ("level1", level1),
+            ("level2", level2),
+            ("level3", level3),
+        )
+        if values
+    }
+    try:
+        rows = ledger_snapshot.query(group_by, start, end, filters)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"group_by": group_by, "rows": rows}
+
+
+@router.get("/trial-balance")
+async def trial_balance(
+    start: date = Query(...),
+    end: date = Query(...),
+    project_id: UUID | None = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await report_cache.get_or_compute(
+        db,
+        "trial-balance",
+        {"start": start, "end": end, "project_id": project_id},
+        # Opening balances depend on all history, so key on the global ledger version
+        lambda session: ReportingService(session).trial_balance(start, end, project_id),
+    )
+
+
+@router.get("/ledger/export")
+async def ledger_export(
+    start: date = Query(...),
+    end: date = Query(...),
+    project_id: UUID | None = Query(None),
+    account_code_id: UUID | None = Query(None),
+    after: str | None = Query(None, description="Resume after this row cursor"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+):
+    # The stream opens its own connection: it outlives the request-scoped session.
+    service = LedgerExportService(read_engine)
+    try:
+        stmt = service.build_query(start, end, project_id, account_code_id, after)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"ledger-{start}-{end}.{format}"
+    return StreamingResponse(
+        service.stream(stmt, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/ledger/{account_code_id}")
+async def account_ledger(
+    account_code_id: UUID,
+    start: date = Query(...),
+    end: date = Query(...),
+    project_id: UUID | None = Query(None),
+    after: str | None = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
 ):
     service = ReportingService(db)
-    return await service.public_spending_compliance(prev_year_revenue, current_public_spend)
+    try:
+        return await service.account_ledger(account_code_id, start, end, project_id, after, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
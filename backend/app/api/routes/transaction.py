@@ -1,12 +1,83 @@
-from fastapi import APIRouter, Depends
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.exceptions import BudgetExceededException, PeriodArchivedException, PeriodClosedException
 from app.db.session import get_db
-from app.schemas.transaction import TransactionHeadCreate, TransactionHeadRead
+from app.models.transaction import TransactionHead
+from app.schemas.transaction import (
+    JournalImportError,
+    JournalImportResult,
+    TransactionHeadCreate,
+    TransactionHeadRead,
+    TransactionPost,
+    TransactionStatusUpdate,
+)
+from app.services.journal_import_service import JournalImportService
+from app.services.posting_pipeline import post_transaction
+from app.services.transaction_service import TransactionLineInput, TransactionService
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
 
 @router.post("", response_model=TransactionHeadRead)
-async def create_transaction(payload: TransactionHeadCreate, db: AsyncSession = Depends(get_db)):
-    # TODO: implement service layer
-    return payload.model_dump() | {"id": "00000000-0000-0000-0000-000000000000"}
+async def create_transaction(payload: TransactionPost, db: AsyncSession = Depends(get_db)):
+    head = TransactionHead(**payload.model_dump(include=set(TransactionHeadCreate.model_fields)))
+    lines = [
+        TransactionLineInput(
+            project_id=str(line.project_id),
+            account_code_id=str(line.account_code_id),
+            debit_amount=line.debit_amount,
+            credit_amount=line.credit_amount,
+            evidence_url=line.evidence_url,
+        )
+        for line in payload.lines
+    ]
+    try:
+        return await post_transaction(db, head, lines, payload.user_role, payload.force_on_budget_exceed)
+    except (BudgetExceededException, PeriodClosedException, PeriodArchivedException) as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
+@router.patch("/{head_id}/status", response_model=TransactionHeadRead)
+async def update_transaction_status(
+    head_id: str,
+    payload: TransactionStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+):
+    service = TransactionService(db)
+    try:
+        head = await service.update_status(head_id, payload.status, payload.approved_by)
+    except PeriodClosedException as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    if not head:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return head
+
+
+@router.post("/import", response_model=JournalImportResult)
+async def import_transactions(
+    request: Request,
+    created_by: UUID = Query(...),
+    format: str | None = Query(None, pattern="^(csv|ndjson)$"),
+    status: str = Query("DRAFT", pattern="^(DRAFT|APPROVED)$"),
+    user_role: str = Query("staff"),
+    force_on_budget_exceed: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+):
+    fmt = format
+    if fmt is None:
+        content_type = request.headers.get("content-type", "")
+        fmt = "ndjson" if "ndjson" in content_type or "jsonl" in content_type else "csv"
+    service = JournalImportService(db)
+    try:
+        report = await service.import_stream(
+            request.stream(), fmt, created_by, status, user_role, force_on_budget_exceed
+        )
+    except (BudgetExceededException, PeriodArchivedException) as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return JournalImportResult(
+        imported_heads=report.imported_heads,
+        imported_lines=report.imported_lines,
+        rejected_rows=report.rejected_rows,
+        errors=[JournalImportError(**error) for error in report.errors],
+    )
@@ -0,0 +1,61 @@
+"""Fill the RRN blind-index column for rows written before it existed.
+
+Usage:
+    python -m app.commands.backfill_rrn_blind_index [--table donor_sensitive]
+        [--chunk-size N] [--workers N] [--max-rows-per-second N] [--all | --duplicates]
+
+Run once after migration 0006; re-running picks up where an interrupted run
+stopped. Use ``--all`` to recompute every row after changing
+RRN_BLIND_INDEX_KEY_B64 (lookups miss rows until it finishes). The donor
+index is unique, so a donor whose RRN another donor already holds is left
+unindexed and logged; ``--duplicates`` lists those pairs without writing.
+Resolve them (merge the donors or correct the RRN) and run the backfill again.
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.exceptions import UnknownEncryptionKeyException
+from app.services.key_rotation_service import ENCRYPTED_RRN_COLUMNS
+from app.services.rrn_blind_index_service import BlindIndexBackfillJob
+
+
+async def _run(args: argparse.Namespace) -> int:
+    for table in args.table or list(ENCRYPTED_RRN_COLUMNS):
+        try:
+            job = BlindIndexBackfillJob(
+                table,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                max_rows_per_second=args.max_rows_per_second,
+                recompute_all=args.all,
+            )
+            if args.duplicates:
+                for row, holder in await job.duplicates():
+                    print(f"{table}: {row} is unindexed; its RRN is held by {holder}")
+                continue
+            progress = await job.run()
+        except (UnknownEncryptionKeyException, ValueError) as exc:
+            print(str(exc), file=sys.stderr)
+            return 1
+        print(
+            f"{progress.table}: {progress.rows_written} rows indexed, "
+            f"{progress.rows_skipped} skipped (changed concurrently or RRN already indexed on another row)"
+        )
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", action="append", choices=sorted(ENCRYPTED_RRN_COLUMNS), help="repeatable (default: all)")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="decryption processes (0 = in-process)")
+    parser.add_argument("--max-rows-per-second", type=float, default=None, help="0 = unthrottled")
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument("--all", action="store_true", help="recompute rows that already have an index")
+    modes.add_argument("--duplicates", action="store_true", help="list rows left unindexed by a duplicate RRN")
+    sys.exit(asyncio.run(_run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
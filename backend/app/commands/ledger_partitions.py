@@ -0,0 +1,58 @@
+"""Manage the yearly partitions of the ledger tables.
+
+Usage:
+    python -m app.commands.ledger_partitions list
+    python -m app.commands.ledger_partitions ensure [--ahead N] [--year YEAR ...]
+    python -m app.commands.ledger_partitions archive YEAR
+    python -m app.commands.ledger_partitions restore YEAR
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from app.db.session import AsyncSessionLocal
+from app.services.ledger_partition_service import LedgerPartitionService
+
+
+async def _run(args: argparse.Namespace) -> int:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            service = LedgerPartitionService(session)
+            if args.command == "list":
+                for partition in await service.list_partitions():
+                    print(json.dumps(partition, ensure_ascii=False))
+                return 0
+            if args.command == "ensure":
+                if args.year:
+                    created = await service.ensure_years(args.year)
+                else:
+                    created = await service.ensure_ahead(args.ahead)
+                print(f"ledger partitions created: {created}")
+                return 0
+            try:
+                if args.command == "archive":
+                    result = await service.archive(args.fiscal_year)
+                else:
+                    result = await service.restore(args.fiscal_year)
+            except ValueError as exc:
+                print(str(exc), file=sys.stderr)
+                return 1
+            print(json.dumps(result, ensure_ascii=False, default=str))
+            return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list")
+    ensure = commands.add_parser("ensure")
+    ensure.add_argument("--ahead", type=int, default=None, help="years after the current one (default: settings)")
+    ensure.add_argument("--year", type=int, action="append", help="create partitions for this year (repeatable)")
+    for name in ("archive", "restore"):
+        commands.add_parser(name).add_argument("fiscal_year", type=int)
+    sys.exit(asyncio.run(_run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
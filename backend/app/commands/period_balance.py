@@ -0,0 +1,39 @@
+"""Maintain the monthly period_balance rollup.
+
+Usage:
+    python -m app.commands.period_balance rebuild
+    python -m app.commands.period_balance check
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from app.db.session import AsyncSessionLocal
+from app.services.period_balance_service import PeriodBalanceService
+
+
+async def _run(command: str) -> int:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            service = PeriodBalanceService(session)
+            if command == "rebuild":
+                rows = await service.rebuild()
+                print(f"period_balance rebuilt: {rows} rows")
+                return 0
+            mismatches = await service.check()
+            for mismatch in mismatches:
+                print(json.dumps(mismatch, ensure_ascii=False))
+            print(f"{len(mismatches)} mismatched (project, account, month) rows")
+            return 1 if mismatches else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_run(args.command)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Re-encrypt stored RRNs under the active (or given) key, online.
+
+Usage:
+    python -m app.commands.rotate_rrn_keys status
+    python -m app.commands.rotate_rrn_keys run [--table donor_sensitive] [--to-key KEY_ID]
+        [--chunk-size N] [--workers N] [--max-rows-per-second N] [--restart]
+
+Rotating: add the new key as RRN_ENCRYPTION_KEY_B64/RRN_ENCRYPTION_KEY_ID, move
+the old one into RRN_DECRYPTION_KEYS, deploy, then run this command. It can be
+stopped and re-run; it resumes from its checkpoint. Drop the old key once
+``status`` shows no rows left under it.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from app.core.exceptions import UnknownEncryptionKeyException
+from app.db.session import AsyncSessionLocal
+from app.services.key_rotation_service import ENCRYPTED_RRN_COLUMNS, KeyRotationJob, KeyRotationService
+
+
+async def _run(args: argparse.Namespace) -> int:
+    if args.command == "status":
+        async with AsyncSessionLocal() as session:
+            status = await KeyRotationService(session).status()
+        print(json.dumps(status, ensure_ascii=False, indent=2, default=str))
+        return 0
+
+    for table in args.table or list(ENCRYPTED_RRN_COLUMNS):
+        try:
+            job = KeyRotationJob(
+                table,
+                target_key_id=args.to_key,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                max_rows_per_second=args.max_rows_per_second,
+            )
+            progress = await job.run(restart=args.restart)
+        except (UnknownEncryptionKeyException, ValueError) as exc:
+            print(str(exc), file=sys.stderr)
+            return 1
+        print(
+            f"{progress.table}: {progress.rows_written} rows re-encrypted under {job.target_key_id}, "
+            f"{progress.rows_skipped} changed concurrently and skipped"
+        )
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status")
+    run = commands.add_parser("run")
+    run.add_argument("--table", action="append", choices=sorted(ENCRYPTED_RRN_COLUMNS), help="repeatable (default: all)")
+    run.add_argument("--to-key", help="target key id (default: RRN_ENCRYPTION_KEY_ID)")
+    run.add_argument("--chunk-size", type=int, default=None)
+    run.add_argument("--workers", type=int, default=None, help="re-encryption processes (0 = in-process)")
+    run.add_argument("--max-rows-per-second", type=float, default=None, help="0 = unthrottled")
+    run.add_argument("--restart", action="store_true", help="ignore the checkpoint and start a new pass")
+    sys.exit(asyncio.run(_run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,156 @@
+from __future__ import annotations
+
 import base64
+import hashlib
+import hmac
 import os
+from functools import lru_cache
+from typing import Iterable, Sequence
+
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
 from app.core.config import settings
+from app.core.exceptions import UnknownEncryptionKeyException
+from app.core.executors import run_crypto
+
+
+NONCE_SIZE = 12
 
 
-def _load_key() -> bytes:
-    key = base64.b64decode(settings.rrn_encryption_key_b64)
+def _decode_key(key_id: str, key_b64: str) -> bytes:
+    key = base64.b64decode(key_b64)
     if len(key) != 32:
-        raise ValueError("rrn_encryption_key_b64 must decode to 32 bytes for AES-256.")
+        raise ValueError(f"RRN key {key_id} must decode to 32 bytes for AES-256.")
     return key
 
 
+class RRNKeyring:
+    """AES-256-GCM ciphers by key id, each built once.
+
+    New ciphertexts use the active key; decryption picks the key by the id
+    stored next to the ciphertext (``rrn_key_id`` / ``encryption_key_id``), so
+    rows written under retired keys stay readable while they are rotated.
+    Payloads are ``nonce (12 bytes) || ciphertext || tag``.
+    """
+
+    def __init__(self, keys: dict[str, bytes], active_key_id: str):
+        if active_key_id not in keys:
+            raise ValueError(f"Active RRN key {active_key_id} is not in the keyring.")
+        self.active_key_id = active_key_id
+        self._ciphers = {key_id: AESGCM(key) for key_id, key in keys.items()}
+
+    @classmethod
+    def from_settings(cls, active_key_id: str | None = None) -> RRNKeyring:
+        """Keyring of the configured keys; ``active_key_id`` overrides which one encrypts."""
+        keys = {key_id: _decode_key(key_id, key_b64) for key_id, key_b64 in settings.rrn_decryption_keys.items()}
+        configured = settings.rrn_encryption_key_id
+        keys[configured] = _decode_key(configured, settings.rrn_encryption_key_b64)
+        return cls(keys, active_key_id or configured)
+
+    @property
+    def key_ids(self) -> list[str]:
+        return list(self._ciphers)
+
+    def cipher(self, key_id: str) -> AESGCM:
+        try:
+            return self._ciphers[key_id]
+        except KeyError:
+            raise UnknownEncryptionKeyException(key_id) from None
+
+    def encrypt(self, plain_text: str) -> bytes:
+        nonce = os.urandom(NONCE_SIZE)
+        return nonce + self._ciphers[self.active_key_id].encrypt(nonce, plain_text.encode("utf-8"), None)
+
+    def decrypt(self, payload: bytes | memoryview, key_id: str) -> str:
+        view = memoryview(payload)
+        return self.cipher(key_id).decrypt(view[:NONCE_SIZE], view[NONCE_SIZE:], None).decode("utf-8")
+
+    def encrypt_many(self, plain_texts: Sequence[str]) -> list[bytes]:
+        """Encrypt with the active key; nonces come from one urandom read."""
+        aesgcm = self._ciphers[self.active_key_id]
+        nonces = memoryview(os.urandom(NONCE_SIZE * len(plain_texts)))
+        payloads = []
+        for i, plain_text in enumerate(plain_texts):
+            nonce = nonces[i * NONCE_SIZE : (i + 1) * NONCE_SIZE]
+            payloads.append(bytes(nonce) + aesgcm.encrypt(nonce, plain_text.encode("utf-8"), None))
+        return payloads
+
+    def decrypt_many(self, payloads: Iterable[bytes | memoryview], key_ids: Iterable[str] | str) -> list[str]:
+        """Decrypt payloads in order; ``key_ids`` is one id per payload or a single id for all."""
+        payloads = list(payloads)
+        if isinstance(key_ids, str):
+            ciphers = [self.cipher(key_ids)] * len(payloads)
+        else:
+            ciphers = [self.cipher(key_id) for key_id in key_ids]
+            if len(ciphers) != len(payloads):
+                raise ValueError("decrypt_many needs exactly one key id per payload.")
+        plain_texts = []
+        for payload, aesgcm in zip(payloads, ciphers):
+            view = memoryview(payload)
+            plain_texts.append(aesgcm.decrypt(view[:NONCE_SIZE], view[NONCE_SIZE:], None).decode("utf-8"))
+        return plain_texts
+
+
+def normalize_rrn(rrn: str) -> str:
+    """Digits only, so "900101-1234567" and "9001011234567" index alike."""
+    return "".join(ch for ch in rrn if ch.isdigit())
+
+
+class RRNBlindIndex:
+    """Keyed HMAC-SHA256 of the normalized RRN, for equality lookups on ciphertext rows.
+
+    The HMAC key is separate from the encryption keys, so rotating those
+    leaves the index untouched; changing this key needs a full backfill.
+    """
+
+    def __init__(self, key: bytes):
+        if len(key) < 32:
+            raise ValueError("rrn_blind_index_key_b64 must decode to at least 32 bytes.")
+        # Keyed once; each value continues from a copy of the keyed state
+        self._keyed = hmac.new(key, digestmod=hashlib.sha256)
+
+    def compute(self, rrn: str) -> bytes:
+        mac = self._keyed.copy()
+        mac.update(normalize_rrn(rrn).encode("ascii"))
+        return mac.digest()
+
+    def compute_many(self, rrns: Iterable[str]) -> list[bytes]:
+        return [self.compute(rrn) for rrn in rrns]
+
+
+@lru_cache(maxsize=1)
+def get_rrn_blind_index() -> RRNBlindIndex:
+    return RRNBlindIndex(base64.b64decode(settings.rrn_blind_index_key_b64))
+
+
+@lru_cache(maxsize=1)
+def get_rrn_keyring() -> RRNKeyring:
+    return RRNKeyring.from_settings()
+
+
 def encrypt_rrn(plain_text: str) -> bytes:
-    key = _load_key()
-    aesgcm = AESGCM(key)
-    nonce = os.urandom(12)
-    ct = aesgcm.encrypt(nonce, plain_text.encode("utf-8"), None)
-    return nonce + ct
-
-
-def decrypt_rrn(payload: bytes) -> str:
-    key = _load_key()
-    aesgcm = AESGCM(key)
-    nonce = payload[:12]
-    ct = payload[12:]
-    plain = aesgcm.decrypt(nonce, ct, None)
-    return plain.decode("utf-8")
+    """Encrypt with the active key (stored with ``get_rrn_keyring().active_key_id``)."""
+    return get_rrn_keyring().encrypt(plain_text)
+
+
+def decrypt_rrn(payload: bytes, key_id: str | None = None) -> str:
+    keyring = get_rrn_keyring()
+    return keyring.decrypt(payload, key_id or keyring.active_key_id)
+
+
+def _protect_rrn(rrn: str) -> tuple[bytes, str, bytes]:
+    keyring = get_rrn_keyring()
+    return keyring.encrypt(rrn), keyring.active_key_id, get_rrn_blind_index().compute(rrn)
+
+
+async def protect_rrn(rrn: str) -> tuple[bytes, str, bytes]:
+    """(ciphertext, key id, blind index) for storing an RRN, computed on the crypto executor."""
+    return await run_crypto(_protect_rrn, rrn)
+
+
+async def rrn_blind_index(rrn: str) -> bytes:
+    return await run_crypto(get_rrn_blind_index().compute, rrn)
+
+
+async def decrypt_rrn_async(payload: bytes, key_id: str | None = None) -> str:
+    return await run_crypto(decrypt_rrn, payload, key_id)
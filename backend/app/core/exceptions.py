@@ -6,3 +6,28 @@ class BudgetExceededException(Exception):
         self.project_id = project_id
         self.remaining = remaining
         self.amount = amount
+
+
+class PeriodClosedException(Exception):
+    def __init__(self, fiscal_year: int):
+        super().__init__(f"Fiscal year {fiscal_year} is closed")
+        self.fiscal_year = fiscal_year
+
+
+class PeriodArchivedException(Exception):
+    def __init__(self, fiscal_year: int):
+        super().__init__(f"Fiscal year {fiscal_year} is archived; its ledger partitions are detached")
+        self.fiscal_year = fiscal_year
+
+
+class UnknownEncryptionKeyException(Exception):
+    def __init__(self, key_id: str):
+        super().__init__(f"Encryption key {key_id} is not configured")
+        self.key_id = key_id
+
+
+class DuplicateRRNException(Exception):
+    def __init__(self, table: str, existing_id: str | None):
+        super().__init__(f"RRN is already registered in {table}" + (f" ({existing_id})" if existing_id else ""))
+        self.table = table
+        self.existing_id = existing_id
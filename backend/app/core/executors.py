@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+
+executor_queue_depth = registry.gauge(
+    "executor_queue_depth",
+    "Calls waiting for a free worker.",
+    ("pool",),
+    collect=lambda: {(pool.name,): pool.queued for pool in _pools},
+)
+executor_in_flight = registry.gauge(
+    "executor_in_flight",
+    "Calls running on a worker.",
+    ("pool",),
+    collect=lambda: {(pool.name,): pool.in_flight for pool in _pools},
+)
+executor_wait = registry.histogram(
+    "executor_wait_seconds", "Time a call waited for a free worker.", ("pool",)
+)
+executor_run = registry.histogram(
+    "executor_run_seconds", "Time from handing a call to a worker until its result.", ("pool",)
+)
+
+_pools: list[BoundedExecutor] = []
+
+
+class BoundedExecutor:
+    """Runs blocking calls on a fixed-size pool without ever over-filling it.
+
+    At most ``max_workers`` calls are handed to the pool at a time; further
+    callers wait on the event loop (counted as queue depth, timed as wait), so
+    a burst queues where it is visible instead of inside the executor. The pool
+    is created on first use, so processes that never hash a password never
+    spawn the bcrypt workers.
+    """
+
+    def __init__(self, name: str, factory: Callable[[int], Executor], max_workers: int):
+        if max_workers < 1:
+            raise ValueError(f"{name} executor needs at least one worker")
+        self.name = name
+        self.max_workers = max_workers
+        self.queued = 0
+        self.in_flight = 0
+        self._factory = factory
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        _pools.append(self)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # One per event loop: CLI commands call asyncio.run more than once per process
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._loop = loop
+        return self._slots
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        slots = self._semaphore()
+        self.queued += 1
+        queued_at = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            self.queued -= 1
+        started = time.perf_counter()
+        executor_wait.observe(self.name, value=started - queued_at)
+        self.in_flight += 1
+        try:
+            if self._executor is None:
+                self._executor = self._factory(self.max_workers)
+            call = functools.partial(fn, *args, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        finally:
+            self.in_flight -= 1
+            executor_run.observe(self.name, value=time.perf_counter() - started)
+            slots.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def _thread_pool(max_workers: int) -> Executor:
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crypto")
+
+
+def _process_pool(max_workers: int) -> Executor:
+    # Spawned, not forked: children must not inherit the event loop or DB connections
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+# RRN-sized AES-GCM/HMAC calls are short; threads keep them off the loop without pickling
+crypto_executor = BoundedExecutor("crypto", _thread_pool, settings.crypto_executor_workers)
+# bcrypt burns ~100-300 ms of CPU per call; separate processes keep that off the API process
+password_executor = BoundedExecutor("password_hash", _process_pool, settings.password_hash_workers)
+# reportlab/pypdf are pure Python; a package render would hold the GIL for its whole run
+document_executor = BoundedExecutor("document_render", _process_pool, settings.document_render_workers)
+
+
+async def run_crypto(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    return await crypto_executor.run(fn, *args, **kwargs)
+
+
+async def run_password_hash(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """``fn`` and its arguments are pickled to a worker process; pass module-level functions."""
+    return await password_executor.run(fn, *args, **kwargs)
+
+
+async def run_document_render(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """``fn`` and its arguments are pickled to a worker process; pass module-level functions."""
+    return await document_executor.run(fn, *args, **kwargs)
+
+
+def shutdown_executors() -> None:
+    for pool in _pools:
+        pool.shutdown()
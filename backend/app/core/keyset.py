@@ -0,0 +1,63 @@
+import base64
+import hashlib
+import hmac
+import uuid
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple
+
+from app.core.config import settings
+
+
+class KeysetCursor(NamedTuple):
+    tx_date: date
+    head_id: uuid.UUID
+    line_id: uuid.UUID
+    balance: Decimal | None = None
+
+    @property
+    def key(self) -> tuple[date, uuid.UUID, uuid.UUID]:
+        return self.tx_date, self.head_id, self.line_id
+
+
+def _signature(scope: str, raw: str) -> str:
+    mac = hmac.new(settings.cursor_secret.encode("utf-8"), f"{scope}|{raw}".encode("ascii"), hashlib.sha256)
+    return base64.urlsafe_b64encode(mac.digest()[:16]).decode("ascii").rstrip("=")
+
+
+def encode_cursor(
+    tx_date: date,
+    head_id: uuid.UUID,
+    line_id: uuid.UUID,
+    balance: Decimal | None = None,
+    scope: str | None = None,
+) -> str:
+    """Opaque cursor; a carried ``balance`` is signed together with ``scope`` (the query parameters)."""
+    raw = f"{tx_date.isoformat()}|{head_id}|{line_id}"
+    if balance is not None:
+        if scope is None:
+            raise ValueError("A cursor carrying a balance needs a scope to sign")
+        raw += f"|{balance}"
+        raw += f"|{_signature(scope, raw)}"
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: str | None = None) -> KeysetCursor:
+    """Decode a cursor; with ``scope`` it must carry a balance signed for that same scope."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = base64.urlsafe_b64decode(padded).decode("ascii").split("|")
+        if scope is None:
+            if len(parts) != 3:
+                raise ValueError(cursor)
+            balance = None
+        else:
+            if len(parts) != 5:
+                raise ValueError(cursor)
+            *signed, signature = parts
+            if not hmac.compare_digest(signature, _signature(scope, "|".join(signed))):
+                raise ValueError(cursor)
+            balance = Decimal(parts[3])
+        return KeysetCursor(date.fromisoformat(parts[0]), uuid.UUID(parts[1]), uuid.UUID(parts[2]), balance)
+    except (ArithmeticError, ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
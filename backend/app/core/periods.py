@@ -0,0 +1,29 @@
+from datetime import date, timedelta
+
+
+def year_month(d: date) -> int:
+    return d.year * 100 + d.month
+
+
+def month_end(d: date) -> date:
+    next_month = (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def split_full_months(start: date, end: date) -> tuple[tuple[date, date] | None, list[tuple[date, date]]]:
+    """Split [start, end] into a whole-month span and the partial-month edges.
+
+    Returns ``(full, edges)`` where ``full`` is the (first_day, last_day) span
+    covering only complete months (or None) and ``edges`` are the raw date
+    ranges left over at either end.
+    """
+    first_full = start if start.day == 1 else month_end(start) + timedelta(days=1)
+    last_full = end if end == month_end(end) else end.replace(day=1) - timedelta(days=1)
+    if first_full > last_full:
+        return None, [(start, end)]
+    edges: list[tuple[date, date]] = []
+    if start < first_full:
+        edges.append((start, first_full - timedelta(days=1)))
+    if last_full < end:
+        edges.append((last_full + timedelta(days=1), end))
+    return (first_full, last_full), edges
@@ -1,5 +1,7 @@
 from passlib.context import CryptContext
 
+from app.core.executors import run_password_hash
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -9,3 +11,12 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
+
+
+async def hash_password_async(password: str) -> str:
+    """``hash_password`` on the bcrypt process pool; use this from request handlers."""
+    return await run_password_hash(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await run_password_hash(verify_password, plain, hashed)
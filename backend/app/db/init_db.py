@@ -1,8 +1,31 @@
-from app.db.base import Base
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
 from app.db.session import engine
-import app.models  # noqa: F401  # ensure models are registered
+
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def expected_revisions() -> set[str]:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    return set(ScriptDirectory.from_config(config).get_heads())
 
 
 async def init_db() -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """Refuse to start unless the database is at the migration head.
+
+    Schema changes are applied with ``alembic upgrade head``, never at startup.
+    """
+    async with engine.connect() as conn:
+        current = await conn.run_sync(lambda sync_conn: set(MigrationContext.configure(sync_conn).get_current_heads()))
+    expected = expected_revisions()
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema revision {sorted(current) or 'none'} does not match {sorted(expected)}; "
+            "run `alembic upgrade head` from backend/ before starting the API."
+        )
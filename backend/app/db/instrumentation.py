@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter as _Tally
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import registry
+
+
+_PARAM = re.compile(r"\$\d+(?:::[\w\[\]]+)?|%\(\w+\)s|%s")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+# Transaction control the ORM issues per unit of work, not per row
+_IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape with parameters, literals and IN/VALUES lists folded."""
+    shape = _PARAM.sub("?", statement)
+    shape = _LITERAL.sub("?", shape)
+    shape = _LIST.sub("(?...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryStats:
+    """Database work done on behalf of one request."""
+
+    queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+    shapes: _Tally = field(default_factory=_Tally)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.queries += 1
+        self.db_seconds += elapsed
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+        if not statement.lstrip().upper().startswith(_IGNORED_PREFIXES):
+            self.shapes[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run at least ``threshold`` times (N+1 suspects)."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+def start_query_stats() -> tuple[QueryStats, object]:
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_query_stats(token) -> None:
+    _current_stats.reset(token)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that charges the time spent waiting for a connection to the request."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats = _current_stats.get()
+            if stats is not None:
+                stats.pool_wait_seconds += time.perf_counter() - started
+
+
+_engines: dict[str, AsyncEngine] = {}
+
+
+def _pool_connections() -> dict[tuple, float]:
+    values: dict[tuple, float] = {}
+    for name, engine in _engines.items():
+        pool = engine.sync_engine.pool
+        if hasattr(pool, "checkedout"):
+            values[(name, "in_use")] = pool.checkedout()
+            values[(name, "idle")] = pool.checkedin()
+    return values
+
+
+registry.gauge(
+    "db_pool_connections",
+    "Connections per engine pool by state.",
+    ("pool", "state"),
+    collect=_pool_connections,
+)
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> AsyncEngine:
+    """Time every cursor execution and attribute it to the current request."""
+    sync_engine = engine.sync_engine
+    _engines[name] = engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+    return engine
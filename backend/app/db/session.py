@@ -1,10 +1,57 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.instrumentation import InstrumentedQueuePool, instrument_engine
 
-engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+
+def _create_engine(name: str, url: str, pool_size: int, max_overflow: int, statement_cache_size: int) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        connect_args={
+            # SQLAlchemy's prepared-statement cache and asyncpg's own; 0 disables
+            # both (needed behind PgBouncer in transaction pooling mode)
+            "prepared_statement_cache_size": statement_cache_size,
+            "statement_cache_size": statement_cache_size,
+        },
+    )
+    return instrument_engine(engine, name)
+
+
+engine = _create_engine(
+    "primary",
+    settings.database_url,
+    settings.db_pool_size,
+    settings.db_max_overflow,
+    settings.db_statement_cache_size,
+)
 AsyncSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
+# Reporting reads get their own pool (on the replica when configured) so long
+# report queries never hold connections that postings are waiting for.
+read_engine = _create_engine(
+    "read",
+    settings.database_read_url or settings.database_url,
+    settings.db_read_pool_size,
+    settings.db_read_max_overflow,
+    settings.db_read_statement_cache_size,
+).execution_options(postgresql_readonly=True)
+ReadSessionLocal = sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+# Read-only sessions on the primary, for reads that must not lag behind a commit
+# (report-cache misses). Their own pool: heavy reports never take posting connections.
+primary_read_engine = _create_engine(
+    "primary_read",
+    settings.database_url,
+    settings.db_primary_read_pool_size,
+    settings.db_primary_read_max_overflow,
+    settings.db_read_statement_cache_size,
+).execution_options(postgresql_readonly=True)
+PrimaryReadSessionLocal = sessionmaker(bind=primary_read_engine, class_=AsyncSession, expire_on_commit=False)
+
 
 async def get_db():
     async with AsyncSessionLocal() as session:
@@ -14,3 +61,9 @@ async def get_db():
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db():
+    """Session in a READ ONLY transaction; it is rolled back on close, never committed."""
+    async with ReadSessionLocal() as session:
+        yield session
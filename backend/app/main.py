@@ -1,8 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.executors import shutdown_executors
+from app.api.middleware import SQLMetricsMiddleware
 from app.api.router import api_router
+from app.api.routes.metrics import router as metrics_router
 from app.db.init_db import init_db
+from app.services.ledger_partition_service import ledger_partition_maintainer
+from app.services.posting_pipeline import posting_pipeline
 
 app = FastAPI(title=settings.app_name)
 
@@ -15,9 +20,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.metrics_enabled:
+    app.add_middleware(SQLMetricsMiddleware)
+    app.include_router(metrics_router)
+
 app.include_router(api_router, prefix="/api") # 라우터에 /api 접두사 추가 (일반적인 관례)
 
 
 @app.on_event("startup")
 async def on_startup() -> None:
     await init_db()
+    if settings.posting_group_commit_enabled:
+        await posting_pipeline.start()
+    if settings.ledger_partition_maintenance_enabled:
+        await ledger_partition_maintainer.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await posting_pipeline.stop()
+    await ledger_partition_maintainer.stop()
+    shutdown_executors()
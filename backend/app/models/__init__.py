@@ -5,10 +5,13 @@ from app.models.donor import Donor, DonorSensitive
 from app.models.donation import Donation, DonationReceipt
 from app.models.allocation import AllocationRule, AllocationRuleItem, AllocationResult
 from app.models.budget import Budget
+from app.models.period_balance import PeriodBalance
+from app.models.fiscal_period import FiscalPeriod, ClosingBalance
 from app.models.audit import AuditLog
 from app.models.approval import ApprovalStep, TransactionApproval
 from app.models.board_member import BoardMember
 from app.models.board_meeting import BoardMeeting, BoardAgenda, BoardAttendance, NotaryPackage
+from app.models.key_rotation import KeyRotationCheckpoint
 
 __all__ = [
     "Project",
@@ -23,6 +26,9 @@ __all__ = [
     "AllocationRuleItem",
     "AllocationResult",
     "Budget",
+    "PeriodBalance",
+    "FiscalPeriod",
+    "ClosingBalance",
     "AuditLog",
     "ApprovalStep",
     "TransactionApproval",
@@ -31,4 +37,5 @@ __all__ = [
     "BoardAgenda",
     "BoardAttendance",
     "NotaryPackage",
+    "KeyRotationCheckpoint",
 ]
@@ -1,12 +1,14 @@
 import uuid
-from sqlalchemy import String, Date, Numeric, ForeignKey
+from sqlalchemy import String, Date, Numeric, ForeignKey, ForeignKeyConstraint, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
+from app.models.transaction import PARTITION_BY_TX_DATE
 
 
 class AllocationRule(Base):
     __tablename__ = "allocation_rule"
+    __table_args__ = (Index("ix_allocation_rule_project_effective", "project_id", "effective_from"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -19,6 +21,7 @@ class AllocationRule(Base):
 
 class AllocationRuleItem(Base):
     __tablename__ = "allocation_rule_item"
+    __table_args__ = (UniqueConstraint("rule_id", "target_project_id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     rule_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("allocation_rule.id", ondelete="CASCADE"), nullable=False)
@@ -28,9 +31,22 @@ class AllocationRuleItem(Base):
 
 class AllocationResult(Base):
     __tablename__ = "allocation_result"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["source_line_id", "tx_date"], ["transaction_line.id", "transaction_line.tx_date"], ondelete="CASCADE"
+        ),
+        ForeignKeyConstraint(
+            ["allocated_line_id", "tx_date"], ["transaction_line.id", "transaction_line.tx_date"], ondelete="CASCADE"
+        ),
+        # Both line FKs cascade on delete
+        Index("ix_allocation_result_source_line_id", "source_line_id"),
+        Index("ix_allocation_result_allocated_line_id", "allocated_line_id"),
+        PARTITION_BY_TX_DATE,
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    source_line_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("transaction_line.id", ondelete="CASCADE"), nullable=False)
-    allocated_line_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("transaction_line.id", ondelete="CASCADE"), nullable=False)
+    tx_date: Mapped[Date] = mapped_column(Date, primary_key=True)  # both lines belong to one head
+    source_line_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    allocated_line_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     rule_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("allocation_rule.id"), nullable=False)
     allocated_amount: Mapped[Numeric] = mapped_column(Numeric(18, 2), nullable=False)
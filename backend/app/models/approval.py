@@ -1,8 +1,9 @@
 import uuid
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, Date, ForeignKey, ForeignKeyConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
+from app.models.transaction import PARTITION_BY_TX_DATE
 
 
 class ApprovalStep(Base):
@@ -16,9 +17,17 @@ class ApprovalStep(Base):
 
 class TransactionApproval(Base):
     __tablename__ = "transaction_approval"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["head_id", "tx_date"], ["transaction_head.id", "transaction_head.tx_date"], ondelete="CASCADE"
+        ),
+        Index("ix_transaction_approval_head_id", "head_id"),
+        PARTITION_BY_TX_DATE,
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    head_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("transaction_head.id", ondelete="CASCADE"), nullable=False)
+    head_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    tx_date: Mapped[Date] = mapped_column(Date, primary_key=True)  # copied from the head
     step_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("approval_step.id"), nullable=False)
     status: Mapped[str] = mapped_column(String(20), nullable=False)
     decided_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
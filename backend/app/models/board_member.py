@@ -1,6 +1,6 @@
 import uuid
 from datetime import date
-from sqlalchemy import String, Date, Boolean, ForeignKey, LargeBinary
+from sqlalchemy import String, Date, Boolean, ForeignKey, Index, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
@@ -8,11 +8,15 @@ from app.db.base import Base
 
 class BoardMember(Base):
     __tablename__ = "board_member"
+    # Not unique: a re-appointed member gets one row per term (overlaps are rejected by the service)
+    __table_args__ = (Index("ix_board_member_rrn_blind_index", "rrn_blind_index"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     rrn_encrypted: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
     rrn_key_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    # HMAC of the normalized RRN (app.core.crypto.RRNBlindIndex); NULL until backfilled
+    rrn_blind_index: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     address: Mapped[str] = mapped_column(String(300), nullable=False)
     term_start: Mapped[date] = mapped_column(Date, nullable=False)
     term_end: Mapped[date] = mapped_column(Date, nullable=False)
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import String, Date, Numeric, Boolean, ForeignKey
+from sqlalchemy import String, Date, Numeric, Boolean, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
@@ -7,6 +7,10 @@ from app.db.base import Base
 
 class Donation(Base):
     __tablename__ = "donation"
+    __table_args__ = (
+        Index("ix_donation_project_donated_at", "project_id", "donated_at"),
+        Index("ix_donation_donor_id", "donor_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     donor_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("donor.id"), nullable=False)
@@ -20,6 +24,7 @@ class Donation(Base):
 
 class DonationReceipt(Base):
     __tablename__ = "donation_receipt"
+    __table_args__ = (Index("ix_donation_receipt_donation_id", "donation_id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     donation_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("donation.id", ondelete="CASCADE"), nullable=False)
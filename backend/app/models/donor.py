@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import String, LargeBinary
+from sqlalchemy import String, LargeBinary, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
@@ -16,7 +16,19 @@ class Donor(Base):
 
 class DonorSensitive(Base):
     __tablename__ = "donor_sensitive"
+    __table_args__ = (
+        Index(
+            "uq_donor_sensitive_rrn_blind_index",
+            "rrn_blind_index",
+            unique=True,
+            postgresql_where=text("rrn_blind_index IS NOT NULL"),
+        ),
+    )
 
-    donor_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    donor_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("donor.id", ondelete="CASCADE"), primary_key=True
+    )
     rrn_encrypted: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
     encryption_key_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    # HMAC of the normalized RRN (app.core.crypto.RRNBlindIndex); NULL until backfilled
+    rrn_blind_index: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
@@ -0,0 +1,38 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Integer, Numeric, String, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class FiscalPeriod(Base):
+    __tablename__ = "fiscal_period"
+
+    fiscal_year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    status: Mapped[str] = mapped_column(String(10), nullable=False, default="OPEN")  # OPEN / CLOSED
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    closed_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    net_assets_account_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("account_code.id"), nullable=True
+    )
+    # Set while the year's ledger partitions sit in the archive schema
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class ClosingBalance(Base):
+    """Frozen year-end figures of a closed fiscal year per project and account."""
+
+    __tablename__ = "closing_balance"
+
+    fiscal_year: Mapped[int] = mapped_column(Integer, ForeignKey("fiscal_period.fiscal_year"), primary_key=True)
+    project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("project.id"), primary_key=True)
+    account_code_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("account_code.id"), primary_key=True)
+    # Approved movement of the year (before closing entries)
+    debit_total: Mapped[Numeric] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+    credit_total: Mapped[Numeric] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+    # Year-end closing entries (revenue/expense into net assets)
+    closing_debit: Mapped[Numeric] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+    closing_credit: Mapped[Numeric] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+    # Cumulative debit - credit after closing, carried into the next year
+    balance: Mapped[Numeric] = mapped_column(Numeric(18, 2), nullable=False, default=0)
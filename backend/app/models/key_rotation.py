@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class KeyRotationCheckpoint(Base):
+    """Progress of re-encrypting one table's RRN column under a target key."""
+
+    __tablename__ = "key_rotation_checkpoint"
+
+    table_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    target_key_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    # Primary key of the last row of the last committed chunk (keyset position)
+    last_pk: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    rows_rotated: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # Rows changed by someone else between read and write; left for the next pass
+    rows_skipped: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,19 @@
+import uuid
+from sqlalchemy import Integer, Numeric, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class PeriodBalance(Base):
+    __tablename__ = "period_balance"
+    __table_args__ = (
+        # Year/month range reads (annual compliance totals, statements)
+        Index("ix_period_balance_year_month", "year_month"),
+    )
+
+    project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("project.id"), primary_key=True)
+    account_code_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("account_code.id"), primary_key=True)
+    year_month: Mapped[int] = mapped_column(Integer, primary_key=True)  # YYYYMM
+    debit_total: Mapped[Numeric] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+    credit_total: Mapped[Numeric] = mapped_column(Numeric(18, 2), nullable=False, default=0)
@@ -1,15 +1,27 @@
 import uuid
-from sqlalchemy import String, Date, Numeric, ForeignKey
+from sqlalchemy import and_, String, Date, Numeric, ForeignKey, ForeignKeyConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 
 
+# Ledger tables are range-partitioned by tx_date, one partition per fiscal year.
+# The partition key is part of every primary key and of the foreign keys between them.
+PARTITION_BY_TX_DATE = {"postgresql_partition_by": "RANGE (tx_date)"}
+
+
 class TransactionHead(Base):
     __tablename__ = "transaction_head"
+    __table_args__ = (
+        # Keyset order of approved heads (account ledger / exports)
+        Index("ix_transaction_head_approved_date_id", "tx_date", "id", postgresql_where=text("status = 'APPROVED'")),
+        # Status queues and date-range filters on any status
+        Index("ix_transaction_head_status_date", "status", "tx_date", postgresql_include=["id"]),
+        PARTITION_BY_TX_DATE,
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tx_date: Mapped[Date] = mapped_column(Date, nullable=False)
+    tx_date: Mapped[Date] = mapped_column(Date, primary_key=True)
     description: Mapped[str | None] = mapped_column(String(500), nullable=True)
     status: Mapped[str] = mapped_column(String(20), nullable=False)
     created_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
@@ -18,11 +30,52 @@ class TransactionHead(Base):
 
 class TransactionLine(Base):
     __tablename__ = "transaction_line"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["head_id", "tx_date"], ["transaction_head.id", "transaction_head.tx_date"], ondelete="CASCADE"
+        ),
+        # Account ledger pages and trial balance per account
+        Index(
+            "ix_transaction_line_account_head_id",
+            "account_code_id",
+            "head_id",
+            "id",
+            postgresql_include=["project_id", "debit_amount", "credit_amount"],
+        ),
+        # Lines of a head: rollup apply, balance trigger, cascades, report joins
+        Index(
+            "ix_transaction_line_head_id",
+            "head_id",
+            postgresql_include=["project_id", "account_code_id", "debit_amount", "credit_amount"],
+        ),
+        # Per-project statements and ledgers
+        Index(
+            "ix_transaction_line_project_account",
+            "project_id",
+            "account_code_id",
+            postgresql_include=["head_id", "debit_amount", "credit_amount"],
+        ),
+        PARTITION_BY_TX_DATE,
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    head_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("transaction_head.id", ondelete="CASCADE"), nullable=False)
+    head_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    tx_date: Mapped[Date] = mapped_column(Date, primary_key=True)  # copied from the head
     project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("project.id"), nullable=False)
     account_code_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("account_code.id"), nullable=False)
     debit_amount: Mapped[Numeric] = mapped_column(Numeric(18, 2), nullable=False, default=0)
     credit_amount: Mapped[Numeric] = mapped_column(Numeric(18, 2), nullable=False, default=0)
     evidence_url: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+# Join on the partition key as well, so head and line partitions pair up
+LINE_HEAD_JOIN = and_(TransactionHead.id == TransactionLine.head_id, TransactionHead.tx_date == TransactionLine.tx_date)
+
+
+def tx_date_between(start, end):
+    """Date range on both ledger tables.
+
+    Postgres does not carry range predicates across the join, so each side
+    gets its own and both prune to the partitions of the years in range.
+    """
+    return and_(TransactionHead.tx_date.between(start, end), TransactionLine.tx_date.between(start, end))
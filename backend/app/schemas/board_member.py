@@ -20,6 +20,7 @@ class BoardMemberCreate(BoardMemberBase):
 
 class BoardMemberUpdate(BaseModel):
     name: str | None = None
+    rrn: str | None = Field(default=None, min_length=6)
     address: str | None = None
     term_start: date | None = None
     term_end: date | None = None
@@ -1,6 +1,6 @@
 from datetime import date
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class DonorBase(BaseModel):
@@ -20,6 +20,12 @@ class DonorRead(DonorBase):
         from_attributes = True
 
 
+class DonorRRN(BaseModel):
+    """RRN in the request body only, never in the URL (it would end up in access logs)."""
+
+    rrn: str = Field(min_length=6)
+
+
 class DonationBase(BaseModel):
     donor_id: UUID
     project_id: UUID
@@ -39,3 +45,16 @@ class DonationRead(DonationBase):
 
     class Config:
         from_attributes = True
+
+
+class DonationReceiptRead(BaseModel):
+    id: UUID
+    donation_id: UUID
+    donor_id: UUID
+    donated_at: date
+    receipt_no: str
+    issued_amount: float
+    status: str
+
+    class Config:
+        from_attributes = True
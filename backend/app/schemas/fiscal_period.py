@@ -0,0 +1,29 @@
+from datetime import datetime
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class FiscalPeriodRead(BaseModel):
+    fiscal_year: int
+    status: str
+    closed_at: datetime | None = None
+    closed_by: UUID | None = None
+    net_assets_account_id: UUID | None = None
+    archived_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class FiscalPeriodClose(BaseModel):
+    closed_by: UUID
+    net_assets_account_id: UUID | None = None
+
+
+class FiscalPeriodCloseResult(BaseModel):
+    fiscal_year: int
+    status: str
+    closed_at: datetime
+    net_assets_account_id: UUID
+    balances: int
+    net_result: float
@@ -1,6 +1,7 @@
 from datetime import date
+from decimal import Decimal
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TransactionHeadBase(BaseModel):
@@ -15,6 +16,25 @@ class TransactionHeadCreate(TransactionHeadBase):
     pass
 
 
+class TransactionPostLine(BaseModel):
+    project_id: UUID
+    account_code_id: UUID
+    debit_amount: Decimal = Decimal("0")
+    credit_amount: Decimal = Decimal("0")
+    evidence_url: str | None = None
+
+
+class TransactionPost(TransactionHeadBase):
+    lines: list[TransactionPostLine]
+    user_role: str = "staff"
+    force_on_budget_exceed: bool = False
+
+
+class TransactionStatusUpdate(BaseModel):
+    status: str = Field(pattern="^(DRAFT|APPROVED|REJECTED)$")
+    approved_by: UUID | None = None
+
+
 class TransactionHeadRead(TransactionHeadBase):
     id: UUID
 
@@ -40,3 +60,16 @@ class TransactionLineRead(TransactionLineBase):
 
     class Config:
         from_attributes = True
+
+
+class JournalImportError(BaseModel):
+    row: int
+    entry_ref: str | None = None
+    message: str
+
+
+class JournalImportResult(BaseModel):
+    imported_heads: int
+    imported_lines: int
+    rejected_rows: int
+    errors: list[JournalImportError]
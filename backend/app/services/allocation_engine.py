@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Sequence
+
+import numpy as np
+
+from app.services.reference_catalog import AllocationRuleItemEntry
+
+
+RATIO_SCALE = 10_000  # allocation_rule_item.ratio is NUMERIC(6,4)
+CENT = Decimal("0.01")
+
+
+def to_cents(amounts: Sequence[Decimal]) -> np.ndarray:
+    return np.fromiter((int((amount / CENT).to_integral_value()) for amount in amounts), dtype=np.int64, count=len(amounts))
+
+
+def from_cents(cents: int) -> Decimal:
+    return (Decimal(int(cents)) * CENT).quantize(CENT)
+
+
+def largest_remainder(amounts_cents: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Split each amount across columns in proportion to integer weights.
+
+    ``amounts_cents`` has shape (n,), ``weights`` has shape (n, k) or (k,) with
+    non-negative integers (zero-padded for rules with fewer items). Each row of
+    the result sums exactly to its amount; the cents left over after flooring
+    go to the columns with the largest fractional remainders, so rounding is
+    not biased toward any one project.
+    """
+    amounts = np.asarray(amounts_cents, dtype=np.int64)
+    weights = np.broadcast_to(np.asarray(weights, dtype=np.int64), (amounts.shape[0], np.shape(weights)[-1]))
+    totals = weights.sum(axis=1)
+    if np.any(totals <= 0):
+        raise ValueError("Each allocation row needs at least one positive weight.")
+    if amounts.size and int(np.abs(amounts).max()) * int(totals.max()) >= np.iinfo(np.int64).max:
+        raise OverflowError("Amount too large for integer-cents allocation.")
+
+    scaled = amounts[:, None] * weights
+    base = scaled // totals[:, None]
+    remainders = scaled - base * totals[:, None]
+    shortfall = amounts - base.sum(axis=1)
+
+    # Rank columns by remainder (desc, stable so ties go to the earlier item)
+    order = np.argsort(-remainders, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    rows = np.arange(amounts.shape[0])[:, None]
+    ranks[rows, order] = np.arange(weights.shape[1])[None, :]
+    return base + (ranks < shortfall[:, None])
+
+
+@dataclass(frozen=True)
+class AllocationShare:
+    target_project_id: uuid.UUID
+    amount: Decimal
+
+
+class AllocationEngine:
+    """Batch allocator over the ratio matrix of the allocation rules in use."""
+
+    def __init__(self, items_by_rule: dict[uuid.UUID, list[AllocationRuleItemEntry]]):
+        self.rule_ids = list(items_by_rule)
+        self._rule_index = {rule_id: i for i, rule_id in enumerate(self.rule_ids)}
+        width = max((len(items) for items in items_by_rule.values()), default=0)
+        self.weights = np.zeros((len(self.rule_ids), width), dtype=np.int64)
+        self.targets: list[list[uuid.UUID]] = []
+        for i, rule_id in enumerate(self.rule_ids):
+            items = items_by_rule[rule_id]
+            self.weights[i, : len(items)] = [int(item.ratio * RATIO_SCALE) for item in items]
+            self.targets.append([item.target_project_id for item in items])
+
+    def allocate(self, amounts: Sequence[Decimal], rule_ids: Sequence[uuid.UUID]) -> list[list[AllocationShare]]:
+        if not amounts:
+            return []
+        rule_idx = np.fromiter((self._rule_index[rule_id] for rule_id in rule_ids), dtype=np.int64, count=len(rule_ids))
+        cents = largest_remainder(to_cents(amounts), self.weights[rule_idx])
+        shares: list[list[AllocationShare]] = []
+        for row, ri in zip(cents.tolist(), rule_idx.tolist()):
+            targets = self.targets[ri]
+            shares.append([AllocationShare(target, from_cents(part)) for target, part in zip(targets, row)])
+        return shares
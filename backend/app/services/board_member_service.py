@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.crypto import encrypt_rrn
-from app.core.config import settings
+from app.core.crypto import protect_rrn, rrn_blind_index
+from app.core.exceptions import DuplicateRRNException
 from app.models.board_member import BoardMember
 from app.schemas.board_member import BoardMemberCreate, BoardMemberUpdate
 
@@ -16,12 +16,51 @@ class BoardMemberService:
         result = await self.db.execute(select(BoardMember))
         return list(result.scalars().all())
 
+    async def find_by_rrn(self, rrn: str) -> BoardMember | None:
+        """Indexed equality lookup on the blind index; rows not yet backfilled are not found.
+
+        A re-appointed member has one row per term; the latest term is returned.
+        """
+        result = await self.db.execute(
+            select(BoardMember)
+            .where(BoardMember.rrn_blind_index == await rrn_blind_index(rrn))
+            .order_by(BoardMember.term_end.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def _check_overlapping_terms(self, member: BoardMember, blind_index: bytes) -> None:
+        """A person may serve several terms, one row each, but not two at once.
+
+        The blind index is not unique, so concurrent writes for the same RRN
+        are serialized on a transaction-scoped advisory lock instead; the check
+        and the write then see each other.
+        """
+        await self.db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext('board_member_rrn'), :key)"),
+            {"key": int.from_bytes(blind_index[:4], "big", signed=True)},
+        )
+        stmt = select(BoardMember.id).where(
+            BoardMember.rrn_blind_index == blind_index,
+            BoardMember.term_start <= member.term_end,
+            BoardMember.term_end >= member.term_start,
+        )
+        if member.id is not None:
+            stmt = stmt.where(BoardMember.id != member.id)
+        existing = (await self.db.execute(stmt.limit(1))).scalar_one_or_none()
+        if existing is not None:
+            raise DuplicateRRNException("board_member", str(existing))
+
+    async def _set_rrn(self, member: BoardMember, rrn: str) -> None:
+        payload, key_id, blind_index = await protect_rrn(rrn)
+        await self._check_overlapping_terms(member, blind_index)
+        member.rrn_encrypted = payload
+        member.rrn_key_id = key_id
+        member.rrn_blind_index = blind_index
+
     async def create_member(self, data: BoardMemberCreate) -> BoardMember:
-        encrypted = encrypt_rrn(data.rrn)
         member = BoardMember(
             name=data.name,
-            rrn_encrypted=encrypted,
-            rrn_key_id=settings.rrn_encryption_key_id,
             address=data.address,
             term_start=data.term_start,
             term_end=data.term_end,
@@ -30,6 +69,7 @@ class BoardMemberService:
             is_foreigner=data.is_foreigner,
             special_relation_to_id=data.special_relation_to_id,
         )
+        await self._set_rrn(member, data.rrn)
         self.db.add(member)
         await self.db.flush()
         return member
@@ -39,8 +79,14 @@ class BoardMemberService:
         member = result.scalar_one_or_none()
         if not member:
             return None
-        for field, value in data.model_dump(exclude_unset=True).items():
+        changes = data.model_dump(exclude_unset=True)
+        rrn = changes.pop("rrn", None)
+        for field, value in changes.items():
             setattr(member, field, value)
+        if rrn is not None:
+            await self._set_rrn(member, rrn)
+        elif member.rrn_blind_index is not None and {"term_start", "term_end"} & changes.keys():
+            await self._check_overlapping_terms(member, member.rrn_blind_index)
         self.db.add(member)
         await self.db.flush()
         return member
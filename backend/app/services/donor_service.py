@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.crypto import protect_rrn, rrn_blind_index
+from app.core.exceptions import DuplicateRRNException
+from app.models.donation import Donation, DonationReceipt
+from app.models.donor import Donor, DonorSensitive
+
+
+RRN_BLIND_INDEX = "uq_donor_sensitive_rrn_blind_index"
+
+
+class DonorService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def find_by_rrn(self, rrn: str) -> Donor | None:
+        """Indexed equality lookup on the blind index; rows not yet backfilled are not found."""
+        return await self._find_by_blind_index(await rrn_blind_index(rrn))
+
+    async def _find_by_blind_index(self, blind_index: bytes) -> Donor | None:
+        result = await self.db.execute(
+            select(Donor)
+            .join(DonorSensitive, DonorSensitive.donor_id == Donor.id)
+            .where(DonorSensitive.rrn_blind_index == blind_index)
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def set_rrn(self, donor_id: str, rrn: str) -> DonorSensitive | None:
+        donor = await self.db.get(Donor, donor_id)
+        if donor is None:
+            return None
+        payload, key_id, blind_index = await protect_rrn(rrn)
+        existing = await self._find_by_blind_index(blind_index)
+        if existing is not None and existing.id != donor.id:
+            raise DuplicateRRNException("donor_sensitive", str(existing.id))
+        sensitive = await self.db.get(DonorSensitive, donor.id) or DonorSensitive(donor_id=donor.id)
+        # The check above misses a concurrent insert; the unique blind index catches it.
+        # The savepoint keeps the session usable to look up the row that won.
+        savepoint = await self.db.begin_nested()
+        try:
+            sensitive.rrn_encrypted = payload
+            sensitive.encryption_key_id = key_id
+            sensitive.rrn_blind_index = blind_index
+            self.db.add(sensitive)
+            await self.db.flush()
+        except IntegrityError as exc:
+            await savepoint.rollback()
+            if RRN_BLIND_INDEX not in str(exc.orig):
+                raise
+            existing = await self._find_by_blind_index(blind_index)
+            raise DuplicateRRNException("donor_sensitive", str(existing.id) if existing else None) from exc
+        await savepoint.commit()
+        return sensitive
+
+    async def receipts_by_rrn(self, rrn: str) -> list[dict]:
+        """Donation receipts of the donor with this RRN, newest first, without decrypting any row."""
+        result = await self.db.execute(
+            select(
+                DonationReceipt.id,
+                DonationReceipt.donation_id,
+                Donation.donor_id,
+                Donation.donated_at,
+                DonationReceipt.receipt_no,
+                DonationReceipt.issued_amount,
+                DonationReceipt.status,
+            )
+            .join(Donation, Donation.id == DonationReceipt.donation_id)
+            .join(DonorSensitive, DonorSensitive.donor_id == Donation.donor_id)
+            .where(DonorSensitive.rrn_blind_index == await rrn_blind_index(rrn))
+            .order_by(Donation.donated_at.desc(), DonationReceipt.receipt_no)
+        )
+        return [dict(row._mapping) for row in result]
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime
+from typing import Iterable
+
+from sqlalchemy import ARRAY, String, bindparam, delete, func, select, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import PeriodClosedException
+from app.models.account_code import AccountCode
+from app.models.fiscal_period import ClosingBalance, FiscalPeriod
+from app.services.report_cache import mark_ledger_changed
+
+
+NET_ASSETS_LEVEL1 = "순자산"
+DEFAULT_NET_ASSETS_LEVEL2 = "보통순자산"
+CLOSED_LEVEL1 = ["수익", "비용"]
+
+# Opening balance of the year being closed: last year's carried balance, or
+# (for the first close) all approved history before the year.
+CARRIED_OPENING_SQL = """
+    SELECT project_id, account_code_id, 0, 0, balance
+    FROM closing_balance
+    WHERE fiscal_year = :fiscal_year - 1
+"""
+HISTORY_OPENING_SQL = """
+    SELECT project_id, account_code_id, 0, 0, debit_total - credit_total
+    FROM period_balance
+    WHERE year_month < :first_month
+"""
+
+CLOSE_SQL = """
+    WITH movement (project_id, account_code_id, debit, credit, opening) AS (
+      SELECT project_id, account_code_id, debit_total, credit_total, 0
+      FROM period_balance
+      WHERE year_month BETWEEN :first_month AND :last_month
+      UNION ALL
+      {opening_sql}
+    ),
+    pre_close AS (
+      SELECT m.project_id, m.account_code_id, a.level1 = ANY(:closed_level1) AS is_closed,
+             SUM(m.debit) AS debit, SUM(m.credit) AS credit,
+             SUM(m.opening + m.debit - m.credit) AS balance
+      FROM movement m
+      JOIN account_code a ON a.id = m.account_code_id
+      GROUP BY m.project_id, m.account_code_id, a.level1
+    ),
+    closing (project_id, account_code_id, debit, credit, balance, closing) AS (
+      -- Zero every revenue/expense balance ...
+      SELECT project_id, account_code_id, debit, credit, balance,
+             CASE WHEN is_closed THEN -balance ELSE 0 END
+      FROM pre_close
+      UNION ALL
+      -- ... and book the net result of each project on net assets
+      SELECT project_id, :net_assets_account_id, 0, 0, 0, SUM(balance)
+      FROM pre_close
+      WHERE is_closed
+      GROUP BY project_id
+    )
+    INSERT INTO closing_balance
+      (fiscal_year, project_id, account_code_id, debit_total, credit_total, closing_debit, closing_credit, balance)
+    SELECT :fiscal_year, project_id, account_code_id, SUM(debit), SUM(credit),
+           GREATEST(SUM(closing), 0), GREATEST(-SUM(closing), 0), SUM(balance + closing)
+    FROM closing
+    GROUP BY project_id, account_code_id
+    HAVING SUM(debit) <> 0 OR SUM(credit) <> 0 OR SUM(closing) <> 0 OR SUM(balance + closing) <> 0
+"""
+
+
+class FiscalPeriodService:
+    """Fiscal-year close: posting lock plus frozen closing balances.
+
+    Posting paths check their years with ``FOR SHARE`` on ``fiscal_period``;
+    closing takes an EXCLUSIVE lock on that table, so it waits for in-flight
+    postings to commit and blocks new ones until the snapshot is written.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def closed_years(self, years: Iterable[int]) -> set[int]:
+        years = sorted(set(years))
+        if not years:
+            return set()
+        result = await self.db.execute(
+            select(FiscalPeriod.fiscal_year)
+            .where(FiscalPeriod.fiscal_year.in_(years))
+            .where(FiscalPeriod.status == "CLOSED")
+            .with_for_update(read=True)
+        )
+        return set(result.scalars().all())
+
+    async def ensure_open(self, tx_dates: Iterable[date]) -> None:
+        closed = await self.closed_years(d.year for d in tx_dates)
+        if closed:
+            raise PeriodClosedException(min(closed))
+
+    async def list_periods(self) -> list[FiscalPeriod]:
+        result = await self.db.execute(select(FiscalPeriod).order_by(FiscalPeriod.fiscal_year))
+        return list(result.scalars().all())
+
+    async def close(
+        self,
+        fiscal_year: int,
+        closed_by: uuid.UUID,
+        net_assets_account_id: uuid.UUID | None = None,
+    ) -> dict:
+        await self.db.execute(text("LOCK TABLE fiscal_period IN EXCLUSIVE MODE"))
+        period = await self.db.get(FiscalPeriod, fiscal_year)
+        if period is not None and period.status == "CLOSED":
+            raise ValueError(f"Fiscal year {fiscal_year} is already closed")
+        latest = await self._latest_closed_year()
+        if latest is not None and fiscal_year != latest + 1:
+            raise ValueError(f"Fiscal years close in order; the next one to close is {latest + 1}")
+        net_assets_account_id = await self._net_assets_account(net_assets_account_id)
+
+        if period is None:
+            period = FiscalPeriod(fiscal_year=fiscal_year)
+            self.db.add(period)
+        period.status = "CLOSED"
+        period.closed_at = datetime.utcnow()
+        period.closed_by = closed_by
+        period.net_assets_account_id = net_assets_account_id
+        await self.db.flush()
+
+        opening_sql = CARRIED_OPENING_SQL if latest is not None else HISTORY_OPENING_SQL
+        result = await self.db.execute(
+            text(CLOSE_SQL.format(opening_sql=opening_sql)).bindparams(
+                bindparam("closed_level1", type_=ARRAY(String)),
+                bindparam("net_assets_account_id", type_=UUID(as_uuid=True)),
+            ),
+            {
+                "fiscal_year": fiscal_year,
+                "first_month": fiscal_year * 100 + 1,
+                "last_month": fiscal_year * 100 + 12,
+                "closed_level1": CLOSED_LEVEL1,
+                "net_assets_account_id": net_assets_account_id,
+            },
+        )
+        # Closing entries change every later opening balance
+        mark_ledger_changed(self.db.sync_session, [fiscal_year * 100 + month for month in range(1, 13)])
+
+        net_result = (
+            await self.db.execute(
+                select(func.sum(ClosingBalance.closing_credit - ClosingBalance.closing_debit))
+                .where(ClosingBalance.fiscal_year == fiscal_year)
+                .where(ClosingBalance.account_code_id == net_assets_account_id)
+            )
+        ).scalar()
+        return {
+            "fiscal_year": fiscal_year,
+            "status": period.status,
+            "closed_at": period.closed_at,
+            "net_assets_account_id": str(net_assets_account_id),
+            "balances": result.rowcount,
+            "net_result": float(net_result or 0),
+        }
+
+    async def reopen(self, fiscal_year: int) -> dict:
+        await self.db.execute(text("LOCK TABLE fiscal_period IN EXCLUSIVE MODE"))
+        period = await self.db.get(FiscalPeriod, fiscal_year)
+        if period is None or period.status != "CLOSED":
+            raise ValueError(f"Fiscal year {fiscal_year} is not closed")
+        if period.archived_at is not None:
+            raise ValueError(f"Fiscal year {fiscal_year} is archived; restore its ledger partitions first")
+        if fiscal_year != await self._latest_closed_year():
+            raise ValueError("Only the most recently closed fiscal year can be reopened")
+        await self.db.execute(delete(ClosingBalance).where(ClosingBalance.fiscal_year == fiscal_year))
+        period.status = "OPEN"
+        period.closed_at = None
+        period.closed_by = None
+        await self.db.flush()
+        mark_ledger_changed(self.db.sync_session, [fiscal_year * 100 + month for month in range(1, 13)])
+        return {"fiscal_year": fiscal_year, "status": period.status}
+
+    async def _latest_closed_year(self) -> int | None:
+        return (
+            await self.db.execute(select(func.max(FiscalPeriod.fiscal_year)).where(FiscalPeriod.status == "CLOSED"))
+        ).scalar()
+
+    async def _net_assets_account(self, account_id: uuid.UUID | None) -> uuid.UUID:
+        stmt = select(AccountCode.id).where(AccountCode.level1 == NET_ASSETS_LEVEL1)
+        if account_id is not None:
+            stmt = stmt.where(AccountCode.id == account_id)
+        elif settings.closing_net_assets_account_code:
+            stmt = stmt.where(AccountCode.code == settings.closing_net_assets_account_code)
+        else:
+            stmt = stmt.where(AccountCode.level2 == DEFAULT_NET_ASSETS_LEVEL2).order_by(AccountCode.code).limit(1)
+        found = (await self.db.execute(stmt)).scalar()
+        if found is None:
+            raise ValueError(f"No {NET_ASSETS_LEVEL1} account found to close the year into")
+        return found
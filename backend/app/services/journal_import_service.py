@@ -0,0 +1,542 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import AsyncIterator, Iterable, Iterator
+
+from sqlalchemy import ARRAY, Integer, String, bindparam, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import BudgetExceededException
+from app.models.project import Project
+from app.services.allocation_engine import AllocationEngine
+from app.services.fiscal_period_service import FiscalPeriodService
+from app.services.ledger_partition_service import ledger_partition_maintainer
+from app.services.period_balance_service import PeriodBalanceService
+from app.services.reference_catalog import reference_catalog
+
+
+IMPORT_FORMATS = {"csv", "ndjson"}
+
+STAGING_DDL = (
+    """
+    CREATE TEMP TABLE journal_import_head (
+      entry_ref TEXT PRIMARY KEY,
+      head_id UUID NOT NULL,
+      tx_date DATE NOT NULL,
+      description VARCHAR(500),
+      first_row INT NOT NULL
+    ) ON COMMIT DROP
+    """,
+    """
+    CREATE TEMP TABLE journal_import_line (
+      row_no INT NOT NULL,
+      entry_ref TEXT NOT NULL,
+      line_id UUID NOT NULL,
+      project_id UUID NOT NULL,
+      account_code_id UUID NOT NULL,
+      debit_amount NUMERIC(18,2) NOT NULL,
+      credit_amount NUMERIC(18,2) NOT NULL,
+      evidence_url TEXT,
+      allocation_id UUID,
+      source_line_id UUID,
+      rule_id UUID,
+      counts_budget BOOLEAN NOT NULL
+    ) ON COMMIT DROP
+    """,
+)
+
+HEAD_COLUMNS = ["entry_ref", "head_id", "tx_date", "description", "first_row"]
+LINE_COLUMNS = [
+    "row_no",
+    "entry_ref",
+    "line_id",
+    "project_id",
+    "account_code_id",
+    "debit_amount",
+    "credit_amount",
+    "evidence_url",
+    "allocation_id",
+    "source_line_id",
+    "rule_id",
+    "counts_budget",
+]
+
+# Debit totals of the staged batch per (project, fiscal year)
+BATCH_SPEND_SQL = """
+    SELECT l.project_id, EXTRACT(YEAR FROM h.tx_date)::int AS fiscal_year, SUM(l.debit_amount) AS amount
+    FROM journal_import_line l
+    JOIN journal_import_head h ON h.entry_ref = l.entry_ref
+    WHERE l.counts_budget
+    GROUP BY l.project_id, EXTRACT(YEAR FROM h.tx_date)
+    HAVING SUM(l.debit_amount) > 0
+"""
+
+
+# A quoted field still open after this many lines is taken as an unterminated quote
+MAX_CSV_RECORD_LINES = 1000
+
+
+def _csv_records(
+    pending: list[tuple[int, str]], lines: Iterable[tuple[int, str]], final: bool = False
+) -> Iterator[tuple[int, list[str] | None, str | None]]:
+    """Add ``(line_no, line)`` pairs to the open record in ``pending``; yield ``(row_no, fields, error)``.
+
+    The lines of the open record are re-parsed with a strict ``csv.reader`` as
+    each one arrives, and the record is complete once the reader returns it
+    without running out of data. A strict parse error rejects the record. A
+    quoted field still open at ``MAX_CSV_RECORD_LINES`` or at the end of input
+    rejects only its first line, and parsing resumes on the line after it.
+    """
+    lines = deque(lines)
+    while lines or (final and pending):
+        if lines:
+            pending.append(lines.popleft())
+            try:
+                fields = next(csv.reader([text for _, text in pending], strict=True), [])
+            except csv.Error as exc:
+                if str(exc) != "unexpected end of data":
+                    yield pending[0][0], None, f"Malformed CSV record: {exc}"
+                    pending.clear()
+                    continue
+                if len(pending) < MAX_CSV_RECORD_LINES:
+                    continue
+            else:
+                yield pending[0][0], fields, None
+                pending.clear()
+                continue
+        yield pending[0][0], None, "Unterminated quoted field"
+        lines.extendleft(reversed(pending[1:]))
+        pending.clear()
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+@dataclass
+class JournalImportReport:
+    imported_heads: int = 0
+    imported_lines: int = 0
+    rejected_rows: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def add_error(self, row_no: int, entry_ref: str | None, message: str) -> None:
+        if len(self.errors) < settings.journal_import_max_errors:
+            self.errors.append({"row": row_no, "entry_ref": entry_ref, "message": message})
+
+
+@dataclass
+class _EntryState:
+    head_id: uuid.UUID
+    tx_date: date
+
+
+class JournalImportService:
+    """Bulk journal import: chunked validation, COPY into staging, single merge."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.chunk_size = settings.journal_import_chunk_size
+
+    async def import_stream(
+        self,
+        stream: AsyncIterator[bytes],
+        fmt: str,
+        created_by: uuid.UUID,
+        status: str,
+        user_role: str,
+        force_on_budget_exceed: bool = False,
+    ) -> JournalImportReport:
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported import format: {fmt}")
+
+        report = JournalImportReport()
+        await reference_catalog.ensure_loaded(self.db)
+        project_ids = set((await self.db.execute(select(Project.id))).scalars().all())
+
+        conn = await self._driver_connection()
+        for ddl in STAGING_DDL:
+            await self.db.execute(text(ddl))
+
+        entries: dict[str, _EntryState] = {}
+        failed_entries: set[str] = set()
+        chunk: list[tuple[int, dict]] = []
+        async for row_no, record in self._iter_records(stream, fmt):
+            chunk.append((row_no, record))
+            if len(chunk) >= self.chunk_size:
+                await self._stage_chunk(conn, chunk, entries, failed_entries, project_ids, report)
+                chunk = []
+        if chunk:
+            await self._stage_chunk(conn, chunk, entries, failed_entries, project_ids, report)
+
+        await self._merge(failed_entries, created_by, status, user_role, force_on_budget_exceed, report)
+        report.errors.sort(key=lambda e: e["row"])
+        return report
+
+    async def _driver_connection(self):
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
+
+    async def _iter_records(self, stream: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple[int, dict]]:
+        if fmt == "csv":
+            async for row in self._iter_csv_records(stream):
+                yield row
+            return
+        row_no = 0
+        async for line in self._iter_lines(stream):
+            if not line.strip():
+                continue
+            row_no += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                record = {"__error__": f"Invalid JSON: {exc.msg}"}
+            yield row_no, record if isinstance(record, dict) else {"__error__": "Row must be a JSON object"}
+
+    async def _iter_csv_records(self, stream: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, dict]]:
+        """CSV records keyed by the header; the row number is the physical line the record starts on.
+
+        The csv module decides where each record ends (see ``_csv_records``),
+        so a quoted field may span lines and a quote inside an unquoted field
+        stays a literal. Malformed records come back as row errors.
+        """
+        header: list[str] | None = None
+        pending: list[tuple[int, str]] = []
+        lines = self._iter_lines(stream)
+        line_no = 0
+        while True:
+            line = await anext(lines, None)
+            if line is None:
+                parsed = _csv_records(pending, [], final=True)
+            else:
+                line_no += 1
+                parsed = _csv_records(pending, [(line_no, line + "\n")])
+            for row_no, values, error in parsed:
+                if error is not None:
+                    yield row_no, {"__error__": error}
+                    continue
+                if not values or not "".join(values).strip():
+                    continue
+                if header is None:
+                    header = [name.strip() for name in values]
+                    continue
+                yield row_no, dict(zip(header, values))
+            if line is None:
+                return
+
+    async def _iter_lines(self, stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        buffer = ""
+        async for data in stream:
+            buffer += decoder.decode(data)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+        buffer += decoder.decode(b"", final=True)
+        if buffer:
+            yield buffer.rstrip("\r")
+
+    async def _stage_chunk(
+        self,
+        conn,
+        chunk: list[tuple[int, dict]],
+        entries: dict[str, _EntryState],
+        failed_entries: set[str],
+        project_ids: set[uuid.UUID],
+        report: JournalImportReport,
+    ) -> None:
+        head_records: list[tuple] = []
+        line_records: list[tuple] = []
+        pending: list[tuple] = []
+        for row_no, record in chunk:
+            entry_ref = str(record.get("entry_ref") or "").strip() or None
+            try:
+                if "__error__" in record:
+                    raise ImportRowError(record["__error__"])
+                if entry_ref is None:
+                    raise ImportRowError("entry_ref is required")
+                parsed = self._parse_row(record, project_ids)
+            except ImportRowError as exc:
+                report.add_error(row_no, entry_ref, str(exc))
+                report.rejected_rows += 1
+                if entry_ref is not None:
+                    failed_entries.add(entry_ref)
+                continue
+
+            tx_date, project_id, account_code, debit, credit, evidence_url, description = parsed
+            entry = entries.get(entry_ref)
+            if entry is None:
+                entry = _EntryState(head_id=uuid.uuid4(), tx_date=tx_date)
+                entries[entry_ref] = entry
+                head_records.append((entry_ref, entry.head_id, tx_date, description, row_no))
+            elif entry.tx_date != tx_date:
+                report.add_error(row_no, entry_ref, f"tx_date differs from entry date {entry.tx_date}")
+                report.rejected_rows += 1
+                failed_entries.add(entry_ref)
+                continue
+            if entry_ref in failed_entries:
+                report.rejected_rows += 1
+                continue
+
+            rule = None
+            if account_code.is_common_expense:
+                rule = reference_catalog.find_allocation_rule(project_id, tx_date)
+            if rule and reference_catalog.get_allocation_items(rule.id):
+                pending.append((row_no, entry_ref, project_id, account_code.id, debit, credit, evidence_url, rule.id))
+            else:
+                line_records.append(
+                    (row_no, entry_ref, uuid.uuid4(), project_id, account_code.id, debit, credit, evidence_url, None, None, None, True)
+                )
+
+        line_records.extend(self._expand_allocations(pending))
+        if head_records:
+            await conn.copy_records_to_table("journal_import_head", records=head_records, columns=HEAD_COLUMNS)
+        if line_records:
+            await conn.copy_records_to_table("journal_import_line", records=line_records, columns=LINE_COLUMNS)
+
+    def _parse_row(self, record: dict, project_ids: set[uuid.UUID]):
+        try:
+            tx_date = date.fromisoformat(str(record.get("tx_date") or "").strip())
+        except ValueError:
+            raise ImportRowError("tx_date must be an ISO date (YYYY-MM-DD)")
+        try:
+            project_id = uuid.UUID(str(record.get("project_id") or "").strip())
+            account_code_id = uuid.UUID(str(record.get("account_code_id") or "").strip())
+        except ValueError:
+            raise ImportRowError("project_id and account_code_id must be UUIDs")
+        if project_id not in project_ids:
+            raise ImportRowError(f"Unknown project_id {project_id}")
+        account_code = reference_catalog.get_account_code(account_code_id)
+        if account_code is None:
+            raise ImportRowError(f"Unknown account_code_id {account_code_id}")
+        debit = self._parse_amount(record.get("debit_amount"), "debit_amount")
+        credit = self._parse_amount(record.get("credit_amount"), "credit_amount")
+        if (debit > 0) == (credit > 0):
+            raise ImportRowError("Exactly one of debit_amount or credit_amount must be positive")
+        description = (record.get("description") or None)
+        if description is not None and len(description) > 500:
+            raise ImportRowError("description exceeds 500 characters")
+        evidence_url = record.get("evidence_url") or None
+        return tx_date, project_id, account_code, debit, credit, evidence_url, description
+
+    @staticmethod
+    def _parse_amount(value, name: str) -> Decimal:
+        if value in (None, ""):
+            return Decimal("0.00")
+        try:
+            amount = Decimal(str(value).strip().replace(",", ""))
+        except InvalidOperation:
+            raise ImportRowError(f"{name} is not a number")
+        if amount < 0:
+            raise ImportRowError(f"{name} must not be negative")
+        if amount != amount.quantize(Decimal("0.01")):
+            raise ImportRowError(f"{name} has more than 2 decimal places")
+        return amount.quantize(Decimal("0.01"))
+
+    def _expand_allocations(self, pending: list[tuple]) -> list[tuple]:
+        """Allocate the chunk's common-expense rows in one engine call.
+
+        Mirrors TransactionService: the source row and an offsetting clearing
+        row stay on the source project, allocated rows carry the trace back to
+        the source line and are the only ones counted against budgets.
+        """
+        if not pending:
+            return []
+        rule_ids = [item[-1] for item in pending]
+        engine = AllocationEngine({rule_id: reference_catalog.get_allocation_items(rule_id) for rule_id in set(rule_ids)})
+        shares = engine.allocate([debit or credit for _, _, _, _, debit, credit, _, _ in pending], rule_ids)
+
+        records: list[tuple] = []
+        for (row_no, entry_ref, project_id, account_code_id, debit, credit, evidence_url, rule_id), row_shares in zip(
+            pending, shares
+        ):
+            is_debit = debit > 0
+            source_id = uuid.uuid4()
+            records.append(
+                (row_no, entry_ref, source_id, project_id, account_code_id, debit, credit, evidence_url, None, None, None, False)
+            )
+            records.append(
+                (row_no, entry_ref, uuid.uuid4(), project_id, account_code_id, credit, debit, evidence_url, None, None, None, False)
+            )
+            for share in row_shares:
+                if share.amount == 0:
+                    continue
+                records.append(
+                    (
+                        row_no,
+                        entry_ref,
+                        uuid.uuid4(),
+                        share.target_project_id,
+                        account_code_id,
+                        share.amount if is_debit else Decimal("0.00"),
+                        share.amount if not is_debit else Decimal("0.00"),
+                        evidence_url,
+                        uuid.uuid4(),
+                        source_id,
+                        rule_id,
+                        True,
+                    )
+                )
+        return records
+
+    async def _merge(
+        self,
+        failed_entries: set[str],
+        created_by: uuid.UUID,
+        status: str,
+        user_role: str,
+        force_on_budget_exceed: bool,
+        report: JournalImportReport,
+    ) -> None:
+        if failed_entries:
+            result = await self.db.execute(
+                text(
+                    "DELETE FROM journal_import_line WHERE entry_ref = ANY(:refs) RETURNING row_no"
+                ).bindparams(bindparam("refs", type_=ARRAY(String))),
+                {"refs": list(failed_entries)},
+            )
+            report.rejected_rows += len(set(result.scalars().all()))
+
+        unbalanced = (
+            await self.db.execute(
+                text(
+                    """
+                    DELETE FROM journal_import_line l
+                    USING (
+                      SELECT entry_ref, SUM(debit_amount) AS debit, SUM(credit_amount) AS credit
+                      FROM journal_import_line
+                      GROUP BY entry_ref
+                      HAVING SUM(debit_amount) <> SUM(credit_amount)
+                    ) u
+                    WHERE l.entry_ref = u.entry_ref
+                    RETURNING l.row_no, l.entry_ref, u.debit, u.credit
+                    """
+                )
+            )
+        ).all()
+        reported: set[str] = set()
+        rejected_rows: set[int] = set()
+        for row_no, entry_ref, debit, credit in sorted(unbalanced):
+            rejected_rows.add(row_no)
+            if entry_ref not in reported:
+                reported.add(entry_ref)
+                report.add_error(row_no, entry_ref, f"Entry not balanced: debit={debit}, credit={credit}")
+        report.rejected_rows += len(rejected_rows)
+
+        # Entries dated in closed fiscal years are rejected as a whole
+        years = (
+            await self.db.execute(
+                text("SELECT DISTINCT EXTRACT(YEAR FROM tx_date)::int FROM journal_import_head")
+            )
+        ).scalars().all()
+        closed = await FiscalPeriodService(self.db).closed_years(years)
+        if closed:
+            in_closed = (
+                await self.db.execute(
+                    text(
+                        """
+                        DELETE FROM journal_import_line l
+                        USING journal_import_head h
+                        WHERE h.entry_ref = l.entry_ref
+                          AND EXTRACT(YEAR FROM h.tx_date)::int = ANY(:years)
+                        RETURNING l.row_no, l.entry_ref, EXTRACT(YEAR FROM h.tx_date)::int
+                        """
+                    ).bindparams(bindparam("years", type_=ARRAY(Integer))),
+                    {"years": sorted(closed)},
+                )
+            ).all()
+            reported = set()
+            for row_no, entry_ref, fiscal_year in sorted(in_closed):
+                if entry_ref not in reported:
+                    reported.add(entry_ref)
+                    report.add_error(row_no, entry_ref, f"Fiscal year {fiscal_year} is closed")
+            report.rejected_rows += len({row_no for row_no, _, _ in in_closed})
+        await ledger_partition_maintainer.ensure_for_postings(set(years) - closed)
+
+        # Budget control once per (project, fiscal year) for the whole batch
+        budget_rows = (
+            await self.db.execute(
+                text(
+                    f"""
+                    SELECT b.project_id, b.fiscal_year, b.total_budget, b.total_spent, s.amount
+                    FROM budget b
+                    JOIN ({BATCH_SPEND_SQL}) s
+                      ON s.project_id = b.project_id AND s.fiscal_year = b.fiscal_year
+                    ORDER BY b.project_id, b.fiscal_year
+                    FOR UPDATE OF b
+                    """
+                )
+            )
+        ).all()
+        for project_id, _fiscal_year, total_budget, total_spent, amount in budget_rows:
+            remaining = Decimal(str(total_budget)) - Decimal(str(total_spent))
+            if remaining < Decimal(str(amount)):
+                if user_role.lower() == "admin" and force_on_budget_exceed:
+                    continue
+                raise BudgetExceededException(str(project_id), float(remaining), float(amount))
+
+        heads = await self.db.execute(
+            text(
+                """
+                INSERT INTO transaction_head (id, tx_date, description, status, created_by)
+                SELECT h.head_id, h.tx_date, h.description, :status, :created_by
+                FROM journal_import_head h
+                WHERE EXISTS (SELECT 1 FROM journal_import_line l WHERE l.entry_ref = h.entry_ref)
+                RETURNING id
+                """
+            ),
+            {"status": status, "created_by": created_by},
+        )
+        head_ids = list(heads.scalars().all())
+        report.imported_heads = len(head_ids)
+
+        lines = await self.db.execute(
+            text(
+                """
+                INSERT INTO transaction_line
+                  (id, head_id, tx_date, project_id, account_code_id, debit_amount, credit_amount, evidence_url)
+                SELECT l.line_id, h.head_id, h.tx_date, l.project_id, l.account_code_id,
+                       l.debit_amount, l.credit_amount, l.evidence_url
+                FROM journal_import_line l
+                JOIN journal_import_head h ON h.entry_ref = l.entry_ref
+                """
+            )
+        )
+        report.imported_lines = lines.rowcount
+
+        await self.db.execute(
+            text(
+                """
+                INSERT INTO allocation_result
+                  (id, tx_date, source_line_id, allocated_line_id, rule_id, allocated_amount)
+                SELECT l.allocation_id, h.tx_date, l.source_line_id, l.line_id, l.rule_id,
+                       l.debit_amount + l.credit_amount
+                FROM journal_import_line l
+                JOIN journal_import_head h ON h.entry_ref = l.entry_ref
+                WHERE l.allocation_id IS NOT NULL
+                """
+            )
+        )
+
+        if status == "APPROVED":
+            await PeriodBalanceService(self.db).apply_heads(head_ids)
+
+        await self.db.execute(
+            text(
+                f"""
+                UPDATE budget b
+                SET total_spent = b.total_spent + s.amount
+                FROM ({BATCH_SPEND_SQL}) s
+                WHERE s.project_id = b.project_id AND s.fiscal_year = b.fiscal_year
+                """
+            )
+        )
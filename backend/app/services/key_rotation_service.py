@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import LargeBinary, Select, String, case, column, exists, func, select, text, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, aliased
+
+from app.core.config import settings
+from app.core.crypto import RRNBlindIndex, RRNKeyring, get_rrn_blind_index, get_rrn_keyring
+from app.db.session import engine as primary_engine
+from app.models.board_member import BoardMember
+from app.models.donor import DonorSensitive
+from app.models.key_rotation import KeyRotationCheckpoint
+
+
+logger = logging.getLogger(__name__)
+
+LOCK_NOT_AVAILABLE = "55P03"
+UNIQUE_VIOLATION = "23505"
+# lock_timeout, or a user write claiming a blind index between a chunk's check and its write
+RETRYABLE_SQLSTATES = {LOCK_NOT_AVAILABLE, UNIQUE_VIOLATION}
+MAX_LOCK_RETRIES = 5
+# Five bind parameters per row in the VALUES list; Postgres allows 32767 per statement
+MAX_CHUNK_SIZE = 32767 // 5
+
+
+@dataclass(frozen=True)
+class EncryptedColumn:
+    model: type
+    pk: InstrumentedAttribute
+    payload: InstrumentedAttribute
+    key_id: InstrumentedAttribute
+    blind_index: InstrumentedAttribute
+    # Only one row may hold a given blind index (migration 0007)
+    unique_blind_index: bool = False
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+
+ENCRYPTED_RRN_COLUMNS = {
+    "donor_sensitive": EncryptedColumn(
+        DonorSensitive,
+        DonorSensitive.donor_id,
+        DonorSensitive.rrn_encrypted,
+        DonorSensitive.encryption_key_id,
+        DonorSensitive.rrn_blind_index,
+        unique_blind_index=True,
+    ),
+    "board_member": EncryptedColumn(
+        BoardMember, BoardMember.id, BoardMember.rrn_encrypted, BoardMember.rrn_key_id, BoardMember.rrn_blind_index
+    ),
+}
+
+
+def unclaimed_blind_index(col: EncryptedColumn, new_index):
+    """SQL for ``new_index``, or NULL when the index is unique and another row already holds it.
+
+    Two rows sharing an RRN predate the unique blind index and need an operator,
+    not a failed chunk: the row is left unindexed (``BlindIndexBackfillJob.duplicates``
+    lists them). Repeats within one chunk are invisible to this check; blank
+    them first with ``first_occurrences``.
+    """
+    if not col.unique_blind_index:
+        return new_index
+    other = aliased(col.model)
+    claimed = exists().where(
+        getattr(other, col.blind_index.key) == new_index, getattr(other, col.pk.key) != col.pk
+    )
+    return case((~claimed, new_index))
+
+
+def first_occurrences(col: EncryptedColumn, indexes: list[bytes]) -> list[bytes | None]:
+    if not col.unique_blind_index:
+        return list(indexes)
+    seen: set[bytes] = set()
+    kept = []
+    for index in indexes:
+        kept.append(None if index in seen else index)
+        seen.add(index)
+    return kept
+
+
+_worker_keyring: RRNKeyring | None = None
+_worker_blind_index: RRNBlindIndex | None = None
+
+
+def _init_worker(target_key_id: str | None = None) -> None:
+    global _worker_keyring, _worker_blind_index
+    _worker_keyring = RRNKeyring.from_settings(target_key_id)
+    _worker_blind_index = get_rrn_blind_index()
+
+
+def reencrypt(payloads: list[bytes], key_ids: list[str]) -> list[tuple[bytes, bytes]]:
+    """Decrypt under each row's key; return (payload under the target key, blind index) per row.
+
+    Runs in a pool worker. The blind index does not depend on the encryption
+    key, but the plaintext is at hand, so rotation also fills rows that were
+    never backfilled.
+    """
+    plain_texts = _worker_keyring.decrypt_many(payloads, key_ids)
+    return list(zip(_worker_keyring.encrypt_many(plain_texts), _worker_blind_index.compute_many(plain_texts)))
+
+
+def blind_index(payloads: list[bytes], key_ids: list[str]) -> list[bytes]:
+    """Decrypt under each row's key and return the blind indexes (runs in a pool worker)."""
+    return _worker_blind_index.compute_many(_worker_keyring.decrypt_many(payloads, key_ids))
+
+
+def open_worker_pool(workers: int, target_key_id: str | None = None) -> ProcessPoolExecutor | None:
+    """Process pool for the per-row crypto; ``None`` (work in-process) when ``workers`` is 0."""
+    if workers <= 0:
+        _init_worker(target_key_id)
+        return None
+    # Spawned, not forked: children must not inherit the event loop or DB connections
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(target_key_id,),
+    )
+
+
+async def map_in_pool(pool: ProcessPoolExecutor | None, workers: int, fn, payloads: list, key_ids: list) -> list:
+    """Run ``fn(payloads, key_ids)`` split evenly across the pool, results in input order."""
+    if pool is None:
+        return fn(payloads, key_ids)
+    loop = asyncio.get_running_loop()
+    step = math.ceil(len(payloads) / workers)
+    parts = await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, fn, payloads[i : i + step], key_ids[i : i + step])
+            for i in range(0, len(payloads), step)
+        )
+    )
+    return [item for part in parts for item in part]
+
+
+@dataclass
+class JobProgress:
+    table: str
+    rows_written: int = 0
+    rows_skipped: int = 0
+    chunks: int = 0
+
+
+class ChunkedRRNJob:
+    """Walks one encrypted RRN table in primary-key order, ``chunk_size`` rows per transaction.
+
+    Subclasses choose the rows (``_select``), the crypto run on them in the
+    worker pool (``worker_fn``) and the compare-and-set write (``_write``,
+    returning the rows written; the rest count as skipped). One job per table
+    runs at a time, held by a session-level advisory lock. Each chunk runs with
+    a short ``lock_timeout`` and backs off instead of queueing behind user
+    transactions, and ``max_rows_per_second`` caps the write rate. Each job
+    opens its own worker pool for its run.
+    """
+
+    description: str
+    lock_prefix: str
+    written_verb: str
+    max_chunk_size: int
+
+    def __init__(
+        self,
+        table: str,
+        chunk_size: int | None = None,
+        workers: int | None = None,
+        max_rows_per_second: float | None = None,
+        engine: AsyncEngine = primary_engine,
+    ):
+        if table not in ENCRYPTED_RRN_COLUMNS:
+            raise ValueError(f"Unknown encrypted table {table}; expected one of {sorted(ENCRYPTED_RRN_COLUMNS)}")
+        self.column = ENCRYPTED_RRN_COLUMNS[table]
+        self.chunk_size = chunk_size or settings.rrn_rotation_chunk_size
+        if not 0 < self.chunk_size <= self.max_chunk_size:
+            raise ValueError(f"chunk_size must be between 1 and {self.max_chunk_size}")
+        self.workers = settings.rrn_rotation_workers if workers is None else workers
+        self.max_rows_per_second = (
+            settings.rrn_rotation_max_rows_per_second if max_rows_per_second is None else max_rows_per_second
+        )
+        self.engine = engine
+
+    @staticmethod
+    def worker_fn(payloads: list[bytes], key_ids: list[str]) -> list:
+        raise NotImplementedError
+
+    def _select(self, after: uuid.UUID | None) -> Select:
+        raise NotImplementedError
+
+    async def _write(self, session: AsyncSession, rows, results: list) -> int:
+        raise NotImplementedError
+
+    def _open_pool(self) -> ProcessPoolExecutor | None:
+        return open_worker_pool(self.workers)
+
+    async def _start(self, restart: bool) -> uuid.UUID | None:
+        """Keyset position to resume after; ``None`` starts from the first row."""
+        return None
+
+    async def _chunk_written(self, session: AsyncSession, last_pk: uuid.UUID, written: int, skipped: int) -> None:
+        """Runs in the chunk's transaction, after ``_write``."""
+
+    async def _finish(self) -> None:
+        pass
+
+    async def run(self, restart: bool = False) -> JobProgress:
+        progress = JobProgress(self.column.table)
+        # Session-level advisory lock on an autocommit connection: one job per table
+        async with self.engine.connect() as lock_conn:
+            lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+            lock_name = f"{self.lock_prefix}:{self.column.table}"
+            locked = (
+                await lock_conn.execute(text("SELECT pg_try_advisory_lock(hashtext(:name))"), {"name": lock_name})
+            ).scalar()
+            if not locked:
+                raise ValueError(f"A {self.description} for {self.column.table} is already running")
+            try:
+                after = await self._start(restart)
+                pool = self._open_pool()
+                try:
+                    started = time.monotonic()
+                    while True:
+                        chunk = await self._process_chunk(pool, after)
+                        if chunk is None:
+                            break
+                        after, written, skipped = chunk
+                        progress.rows_written += written
+                        progress.rows_skipped += skipped
+                        progress.chunks += 1
+                        if progress.chunks % 100 == 0:
+                            logger.info(
+                                "%s: %s rows %s, %s skipped",
+                                self.column.table,
+                                progress.rows_written,
+                                self.written_verb,
+                                progress.rows_skipped,
+                            )
+                        await self._throttle(started, progress.rows_written + progress.rows_skipped)
+                finally:
+                    if pool is not None:
+                        pool.shutdown()
+                await self._finish()
+            finally:
+                await lock_conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": lock_name})
+        return progress
+
+    async def _process_chunk(
+        self, pool: ProcessPoolExecutor | None, after: uuid.UUID | None
+    ) -> tuple[uuid.UUID, int, int] | None:
+        for attempt in range(MAX_LOCK_RETRIES):
+            try:
+                async with AsyncSession(self.engine) as session:
+                    async with session.begin():
+                        await session.execute(
+                            text(f"SET LOCAL lock_timeout = '{int(settings.rrn_rotation_lock_timeout_ms)}ms'")
+                        )
+                        rows = (await session.execute(self._select(after))).all()
+                        if not rows:
+                            return None
+                        results = await map_in_pool(
+                            pool, self.workers, self.worker_fn, [row[1] for row in rows], [row[2] for row in rows]
+                        )
+                        written = await self._write(session, rows, results)
+                        last_pk = rows[-1][0]
+                        await self._chunk_written(session, last_pk, written, len(rows) - written)
+                        return last_pk, written, len(rows) - written
+            except DBAPIError as exc:
+                sqlstate = getattr(exc.orig, "sqlstate", None)
+                if sqlstate not in RETRYABLE_SQLSTATES or attempt == MAX_LOCK_RETRIES - 1:
+                    raise
+                logger.info("%s: chunk after %s failed with %s; retrying", self.column.table, after, sqlstate)
+                await asyncio.sleep(0.5 * 2**attempt)
+
+    async def _throttle(self, started: float, rows: int) -> None:
+        if not self.max_rows_per_second:
+            return
+        ahead = rows / self.max_rows_per_second - (time.monotonic() - started)
+        if ahead > 0:
+            await asyncio.sleep(ahead)
+
+
+class KeyRotationJob(ChunkedRRNJob):
+    """Re-encrypts one table's RRN column under the target key, online and resumable.
+
+    Each chunk is re-encrypted in the worker pool and written back with one
+    ``UPDATE ... FROM (VALUES ...)`` that only matches rows whose ciphertext is
+    unchanged since the read, so no row lock is held during the crypto work and
+    a concurrent edit wins (the row is counted as skipped and picked up by the
+    next pass). The keyset position commits with the chunk, so an interrupted
+    job resumes after the last committed chunk.
+    """
+
+    description = "key rotation"
+    lock_prefix = "rrn-rotation"
+    written_verb = "rotated"
+    max_chunk_size = MAX_CHUNK_SIZE
+    worker_fn = staticmethod(reencrypt)
+
+    def __init__(
+        self,
+        table: str,
+        target_key_id: str | None = None,
+        chunk_size: int | None = None,
+        workers: int | None = None,
+        max_rows_per_second: float | None = None,
+        engine: AsyncEngine = primary_engine,
+    ):
+        super().__init__(table, chunk_size, workers, max_rows_per_second, engine)
+        keyring = get_rrn_keyring()
+        self.target_key_id = target_key_id or keyring.active_key_id
+        keyring.cipher(self.target_key_id)  # must be configured
+        self.source_key_ids = [key_id for key_id in keyring.key_ids if key_id != self.target_key_id]
+
+    async def run(self, restart: bool = False) -> JobProgress:
+        if not self.source_key_ids:
+            return JobProgress(self.column.table)
+        return await super().run(restart)
+
+    def _open_pool(self) -> ProcessPoolExecutor | None:
+        return open_worker_pool(self.workers, self.target_key_id)
+
+    async def _start(self, restart: bool) -> uuid.UUID | None:
+        async with AsyncSession(self.engine) as session:
+            async with session.begin():
+                checkpoint = await session.get(
+                    KeyRotationCheckpoint, (self.column.table, self.target_key_id), with_for_update=True
+                )
+                if checkpoint is None:
+                    session.add(KeyRotationCheckpoint(table_name=self.column.table, target_key_id=self.target_key_id))
+                    return None
+                if restart or checkpoint.finished_at is not None:
+                    # A finished pass is re-run from the start to pick up skipped rows
+                    checkpoint.last_pk = None
+                    checkpoint.rows_rotated = 0
+                    checkpoint.rows_skipped = 0
+                    checkpoint.started_at = datetime.utcnow()
+                    checkpoint.finished_at = None
+                return uuid.UUID(checkpoint.last_pk) if checkpoint.last_pk else None
+
+    async def _chunk_written(self, session: AsyncSession, last_pk: uuid.UUID, written: int, skipped: int) -> None:
+        checkpoint = await session.get(
+            KeyRotationCheckpoint, (self.column.table, self.target_key_id), with_for_update=True
+        )
+        checkpoint.last_pk = str(last_pk)
+        checkpoint.rows_rotated += written
+        checkpoint.rows_skipped += skipped
+        checkpoint.updated_at = datetime.utcnow()
+
+    async def _finish(self) -> None:
+        async with AsyncSession(self.engine) as session:
+            async with session.begin():
+                checkpoint = await session.get(KeyRotationCheckpoint, (self.column.table, self.target_key_id))
+                checkpoint.finished_at = checkpoint.updated_at = datetime.utcnow()
+
+    def _select(self, after: uuid.UUID | None) -> Select:
+        col = self.column
+        stmt = (
+            select(col.pk, col.payload, col.key_id)
+            .where(col.key_id.in_(self.source_key_ids))
+            .order_by(col.pk)
+            .limit(self.chunk_size)
+        )
+        return stmt if after is None else stmt.where(col.pk > after)
+
+    async def _write(self, session: AsyncSession, rows, rotated_rows: list[tuple[bytes, bytes]]) -> int:
+        col = self.column
+        new_payloads = [new_payload for new_payload, _ in rotated_rows]
+        indexes = first_occurrences(col, [index for _, index in rotated_rows])
+        rotated = values(
+            column("pk", PG_UUID(as_uuid=True)),
+            column("old_payload", LargeBinary),
+            column("old_key_id", String),
+            column("new_payload", LargeBinary),
+            column("blind_index", LargeBinary),
+            name="rotated",
+        ).data(
+            [
+                (pk, payload, key_id, new_payload, index)
+                for (pk, payload, key_id), new_payload, index in zip(rows, new_payloads, indexes)
+            ]
+        )
+        result = await session.execute(
+            update(col.model)
+            .where(col.pk == rotated.c.pk)
+            # Compare-and-set: rows edited since the read keep the edit
+            .where(col.key_id == rotated.c.old_key_id)
+            .where(col.payload == rotated.c.old_payload)
+            .values(
+                {
+                    col.payload: rotated.c.new_payload,
+                    col.key_id: self.target_key_id,
+                    # Fills rows never backfilled; an existing index is already correct
+                    col.blind_index: func.coalesce(col.blind_index, unclaimed_blind_index(col, rotated.c.blind_index)),
+                }
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+class KeyRotationService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def status(self) -> dict:
+        """Rows per key id in each encrypted table, and the rotation checkpoints."""
+        keys: dict[str, dict[str, int]] = {}
+        for table, col in ENCRYPTED_RRN_COLUMNS.items():
+            rows = (await self.db.execute(select(col.key_id, func.count()).group_by(col.key_id))).all()
+            keys[table] = {key_id: count for key_id, count in rows}
+        checkpoints = (await self.db.execute(select(KeyRotationCheckpoint))).scalars().all()
+        return {
+            "active_key_id": get_rrn_keyring().active_key_id,
+            "configured_key_ids": get_rrn_keyring().key_ids,
+            "rows_by_key_id": keys,
+            "checkpoints": [
+                {
+                    "table": c.table_name,
+                    "target_key_id": c.target_key_id,
+                    "last_pk": c.last_pk,
+                    "rows_rotated": c.rows_rotated,
+                    "rows_skipped": c.rows_skipped,
+                    "started_at": c.started_at,
+                    "updated_at": c.updated_at,
+                    "finished_at": c.finished_at,
+                }
+                for c in checkpoints
+            ],
+        }
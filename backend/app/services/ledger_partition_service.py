@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Iterable
+
+from sqlalchemy import ARRAY, Integer, String, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import PeriodArchivedException
+from app.db.session import AsyncSessionLocal
+from app.models.fiscal_period import FiscalPeriod
+from app.services.report_cache import mark_ledger_changed
+
+
+logger = logging.getLogger(__name__)
+
+# Parents first; detaching goes the other way round
+LEDGER_TABLES = ["transaction_head", "transaction_line", "transaction_approval", "allocation_result"]
+
+PARTITIONS_SQL = """
+    SELECT parent.relname, child.relname, child.reltuples::bigint
+    FROM pg_inherits i
+    JOIN pg_class parent ON parent.oid = i.inhparent
+    JOIN pg_class child ON child.oid = i.inhrelid
+    WHERE i.inhparent = ANY(CAST(:tables AS regclass[]))
+    ORDER BY parent.relname, child.relname
+"""
+
+# Foreign keys a detached partition still holds into the live ledger
+LEDGER_FKS_SQL = """
+    SELECT conname
+    FROM pg_constraint
+    WHERE conrelid = CAST(:partition AS regclass)
+      AND contype = 'f'
+      AND confrelid = ANY(CAST(:tables AS regclass[]))
+"""
+
+
+def partition_name(table: str, fiscal_year: int) -> str:
+    return f"{table}_y{fiscal_year}"
+
+
+def _year_months(fiscal_year: int) -> list[int]:
+    return [fiscal_year * 100 + month for month in range(1, 13)]
+
+
+class LedgerPartitionService:
+    """Yearly partitions of the ledger tables (tx_date ranges).
+
+    Partitions are created ahead of time by ``ensure_ledger_partitions`` so
+    postings never run DDL; closed years can be detached into the archive
+    schema, where reports over them keep working from ``closing_balance`` and
+    the ``period_balance`` rollup.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def ensure_years(self, years: list[int]) -> int:
+        archived = set(
+            (
+                await self.db.execute(
+                    text("SELECT fiscal_year FROM fiscal_period WHERE archived_at IS NOT NULL")
+                )
+            ).scalars().all()
+        )
+        created = 0
+        for year in sorted(set(years) - archived):
+            created += (
+                await self.db.execute(text("SELECT ensure_ledger_partitions(:year)"), {"year": year})
+            ).scalar()
+        return created
+
+    async def ensure_ahead(self, years_ahead: int | None = None) -> int:
+        years_ahead = settings.ledger_partition_years_ahead if years_ahead is None else years_ahead
+        this_year = date.today().year
+        return await self.ensure_years(list(range(this_year, this_year + years_ahead + 1)))
+
+    async def list_partitions(self) -> list[dict]:
+        rows = (
+            await self.db.execute(
+                text(PARTITIONS_SQL).bindparams(bindparam("tables", type_=ARRAY(String))),
+                {"tables": LEDGER_TABLES},
+            )
+        ).all()
+        archived = (
+            await self.db.execute(
+                text("SELECT tablename FROM pg_tables WHERE schemaname = :schema ORDER BY tablename"),
+                {"schema": settings.ledger_archive_schema},
+            )
+        ).scalars().all()
+        return [
+            {"table": table, "partition": partition, "schema": "public", "estimated_rows": max(rows_estimate, 0)}
+            for table, partition, rows_estimate in rows
+        ] + [
+            {"table": name.rsplit("_y", 1)[0], "partition": name, "schema": settings.ledger_archive_schema}
+            for name in archived
+        ]
+
+    async def archive(self, fiscal_year: int) -> dict:
+        """Detach a closed year's partitions and move them to the archive schema."""
+        period = await self._lock_period(fiscal_year)
+        if period is None or period.status != "CLOSED":
+            raise ValueError(f"Fiscal year {fiscal_year} must be closed before it is archived")
+        if period.archived_at is not None:
+            raise ValueError(f"Fiscal year {fiscal_year} is already archived")
+
+        schema = settings.ledger_archive_schema
+        await self.db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
+        for table in reversed(LEDGER_TABLES):
+            partition = partition_name(table, fiscal_year)
+            await self.db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+            # Archived rows are frozen; their references were checked while attached
+            constraints = (
+                await self.db.execute(
+                    text(LEDGER_FKS_SQL).bindparams(bindparam("tables", type_=ARRAY(String))),
+                    {"partition": partition, "tables": LEDGER_TABLES},
+                )
+            ).scalars().all()
+            for name in constraints:
+                await self.db.execute(text(f'ALTER TABLE {partition} DROP CONSTRAINT "{name}"'))
+            await self.db.execute(text(f'ALTER TABLE {partition} SET SCHEMA "{schema}"'))
+
+        period.archived_at = datetime.utcnow()
+        await self.db.flush()
+        ledger_partition_maintainer.forget_year(fiscal_year)
+        mark_ledger_changed(self.db.sync_session, _year_months(fiscal_year))
+        return {"fiscal_year": fiscal_year, "schema": schema, "archived_at": period.archived_at}
+
+    async def restore(self, fiscal_year: int) -> dict:
+        """Re-attach an archived year; foreign keys are re-validated on attach."""
+        period = await self._lock_period(fiscal_year)
+        if period is None or period.archived_at is None:
+            raise ValueError(f"Fiscal year {fiscal_year} is not archived")
+
+        schema = settings.ledger_archive_schema
+        for table in LEDGER_TABLES:
+            partition = partition_name(table, fiscal_year)
+            await self.db.execute(text(f'ALTER TABLE "{schema}".{partition} SET SCHEMA public'))
+            await self.db.execute(
+                text(
+                    f"ALTER TABLE {table} ATTACH PARTITION {partition} "
+                    f"FOR VALUES FROM ('{date(fiscal_year, 1, 1)}') TO ('{date(fiscal_year + 1, 1, 1)}')"
+                )
+            )
+
+        period.archived_at = None
+        await self.db.flush()
+        mark_ledger_changed(self.db.sync_session, _year_months(fiscal_year))
+        return {"fiscal_year": fiscal_year, "schema": "public"}
+
+    async def _lock_period(self, fiscal_year: int) -> FiscalPeriod | None:
+        await self.db.execute(text("LOCK TABLE fiscal_period IN EXCLUSIVE MODE"))
+        return await self.db.get(FiscalPeriod, fiscal_year)
+
+
+class LedgerPartitionMaintainer:
+    """Background task keeping next years' ledger partitions in place.
+
+    Creating a partition briefly locks the parent table, so each attempt runs
+    with a short ``lock_timeout`` and simply retries on the next tick rather
+    than queueing behind long reports.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, interval_seconds: float = 3600):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+        # Years whose partitions this process has seen in place
+        self._known_years: set[int] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._loop(), name="ledger-partition-maintainer")
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self) -> int:
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(text("SET LOCAL lock_timeout = '2s'"))
+                return await LedgerPartitionService(session).ensure_ahead()
+
+    async def ensure_for_postings(self, years: Iterable[int]) -> None:
+        """Create the partitions for ``years`` before a posting or import inserts into them.
+
+        Back-dated entries can fall before the years created ahead of time. The
+        DDL runs in its own short transaction, so the parent-table lock is not
+        held until the posting commits. Years already seen in place are skipped
+        without a query. Raises PeriodArchivedException for archived years.
+        """
+        missing = sorted(set(years) - self._known_years)
+        if not missing:
+            return
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(text("SET LOCAL lock_timeout = '2s'"))
+                archived = (
+                    await session.execute(
+                        text(
+                            "SELECT fiscal_year FROM fiscal_period "
+                            "WHERE archived_at IS NOT NULL AND fiscal_year = ANY(:years)"
+                        ).bindparams(bindparam("years", type_=ARRAY(Integer))),
+                        {"years": missing},
+                    )
+                ).scalars().all()
+                if archived:
+                    raise PeriodArchivedException(min(archived))
+                created = await LedgerPartitionService(session).ensure_years(missing)
+        if created:
+            logger.info("created ledger partitions for %s on demand", missing)
+        self._known_years.update(missing)
+
+    def forget_year(self, fiscal_year: int) -> None:
+        self._known_years.discard(fiscal_year)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                created = await self.run_once()
+                if created:
+                    logger.info("created %s ledger partitions", created)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("ledger partition maintenance failed; retrying next interval")
+            await asyncio.sleep(self.interval_seconds)
+
+
+ledger_partition_maintainer = LedgerPartitionMaintainer(interval_seconds=settings.ledger_partition_check_seconds)
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import io
+import os
+import tempfile
+from dataclasses import dataclass
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from sqlalchemy import select
@@ -9,9 +13,112 @@ from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 
 from app.core.config import settings
+from app.core.executors import run_document_render
 from app.models.board_meeting import BoardMeeting, BoardAgenda, BoardAttendance, NotaryPackage
 
 
+@dataclass(frozen=True)
+class NotaryPackageInput:
+    """Plain copy of what the package prints, so it can be pickled to a render worker."""
+
+    meeting_title: str
+    meeting_date: date
+    minutes_text: str | None
+    agendas: list[tuple[str, str]]  # (title, agenda_type)
+    attendance: list[tuple[str, str, str | None]]  # (member_id, attendance_type, proxy_name)
+
+
+def render_notary_package(data: NotaryPackageInput, output_path: str) -> int:
+    """Render the three documents in memory, merge them and write the package atomically.
+
+    Runs in a document-render worker process. The package is written to a
+    temporary file in the target directory and renamed over ``output_path``,
+    so readers never see a partial PDF. Returns the package size in bytes.
+    """
+    writer = PdfWriter()
+    for render in (_render_minutes, _render_proxy, _render_statement):
+        buffer = io.BytesIO()
+        render(canvas.Canvas(buffer, pagesize=A4), data)
+        buffer.seek(0)
+        for page in PdfReader(buffer).pages:
+            writer.add_page(page)
+    merged = io.BytesIO()
+    writer.write(merged)
+
+    target = Path(output_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(merged.getbuffer())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, target)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return merged.getbuffer().nbytes
+
+
+def _render_minutes(c: canvas.Canvas, data: NotaryPackageInput) -> None:
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(40, 800, "이사회 의사록")
+    c.setFont("Helvetica", 11)
+    c.drawString(40, 780, f"회의명: {data.meeting_title}")
+    c.drawString(40, 765, f"일시: {data.meeting_date}")
+    c.drawString(40, 750, f"안건 수: {len(data.agendas)}")
+    c.drawString(40, 735, f"참석자 수: {len(data.attendance)}")
+    y = 710
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(40, y, "안건")
+    c.setFont("Helvetica", 10)
+    for title, agenda_type in data.agendas:
+        y -= 16
+        c.drawString(40, y, f"- {title} ({agenda_type})")
+    y -= 24
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(40, y, "회의록")
+    y -= 16
+    c.setFont("Helvetica", 10)
+    minutes = data.minutes_text or "회의록 내용이 입력되지 않았습니다."
+    for line in minutes.splitlines()[:20]:
+        c.drawString(40, y, line)
+        y -= 14
+    c.showPage()
+    c.save()
+
+
+def _render_proxy(c: canvas.Canvas, data: NotaryPackageInput) -> None:
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(40, 800, "위임장")
+    c.setFont("Helvetica", 11)
+    c.drawString(40, 780, f"회의명: {data.meeting_title}")
+    c.drawString(40, 765, f"일시: {data.meeting_date}")
+    y = 740
+    c.setFont("Helvetica", 10)
+    for member_id, attendance_type, proxy_name in data.attendance:
+        if attendance_type == "위임":
+            c.drawString(40, y, f"- 위임자: {member_id} / 대리인: {proxy_name or '-'}")
+            y -= 14
+    c.showPage()
+    c.save()
+
+
+def _render_statement(c: canvas.Canvas, data: NotaryPackageInput) -> None:
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(40, 800, "진술서")
+    c.setFont("Helvetica", 11)
+    c.drawString(40, 780, f"회의명: {data.meeting_title}")
+    c.drawString(40, 765, f"일시: {data.meeting_date}")
+    y = 740
+    c.setFont("Helvetica", 10)
+    for title, agenda_type in data.agendas:
+        c.drawString(40, y, f"- 안건: {title} / 유형: {agenda_type}")
+        y -= 14
+    c.showPage()
+    c.save()
+
+
 class NotaryService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -66,18 +173,15 @@ class NotaryService:
             if seal_valid is False:
                 warnings.append("인감증명서 유효기간(3개월)을 초과했습니다. 재발급이 필요합니다.")
 
-        storage_dir = Path(settings.document_storage_dir)
-        storage_dir.mkdir(parents=True, exist_ok=True)
-
-        minutes_path = storage_dir / f"minutes-{meeting.id}.pdf"
-        proxy_path = storage_dir / f"proxy-{meeting.id}.pdf"
-        statement_path = storage_dir / f"statement-{meeting.id}.pdf"
-        merged_path = storage_dir / f"notary-package-{meeting.id}.pdf"
-
-        self._generate_minutes_pdf(minutes_path, meeting, agendas, attendance)
-        self._generate_proxy_pdf(proxy_path, meeting, attendance)
-        self._generate_statement_pdf(statement_path, meeting, agendas)
-        self._merge_pdfs([minutes_path, proxy_path, statement_path], merged_path)
+        merged_path = Path(settings.document_storage_dir) / f"notary-package-{meeting.id}.pdf"
+        data = NotaryPackageInput(
+            meeting_title=meeting.title,
+            meeting_date=meeting.meeting_date,
+            minutes_text=meeting.minutes_text,
+            agendas=[(agenda.title, agenda.agenda_type) for agenda in agendas],
+            attendance=[(str(item.member_id), item.attendance_type, item.proxy_name) for item in attendance],
+        )
+        await run_document_render(render_notary_package, data, str(merged_path))
 
         package = NotaryPackage(
             meeting_id=meeting.id,
@@ -119,87 +223,3 @@ class NotaryService:
         if not issued_at:
             return False
         return issued_at >= date.today() - timedelta(days=90)
-
-    def _generate_minutes_pdf(
-        self,
-        path: Path,
-        meeting: BoardMeeting,
-        agendas: list[BoardAgenda],
-        attendance: list[BoardAttendance],
-    ) -> None:
-        c = canvas.Canvas(str(path), pagesize=A4)
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(40, 800, "이사회 의사록")
-        c.setFont("Helvetica", 11)
-        c.drawString(40, 780, f"회의명: {meeting.title}")
-        c.drawString(40, 765, f"일시: {meeting.meeting_date}")
-        c.drawString(40, 750, f"안건 수: {len(agendas)}")
-        c.drawString(40, 735, f"참석자 수: {len(attendance)}")
-        y = 710
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(40, y, "안건")
-        c.setFont("Helvetica", 10)
-        for agenda in agendas:
-            y -= 16
-            c.drawString(40, y, f"- {agenda.title} ({agenda.agenda_type})")
-        y -= 24
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(40, y, "회의록")
-        y -= 16
-        c.setFont("Helvetica", 10)
-        minutes = meeting.minutes_text or "회의록 내용이 입력되지 않았습니다."
-        for line in minutes.splitlines()[:20]:
-            c.drawString(40, y, line)
-            y -= 14
-        c.showPage()
-        c.save()
-
-    def _generate_proxy_pdf(
-        self,
-        path: Path,
-        meeting: BoardMeeting,
-        attendance: list[BoardAttendance],
-    ) -> None:
-        c = canvas.Canvas(str(path), pagesize=A4)
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(40, 800, "위임장")
-        c.setFont("Helvetica", 11)
-        c.drawString(40, 780, f"회의명: {meeting.title}")
-        c.drawString(40, 765, f"일시: {meeting.meeting_date}")
-        y = 740
-        c.setFont("Helvetica", 10)
-        for item in attendance:
-            if item.attendance_type == "위임":
-                c.drawString(40, y, f"- 위임자: {item.member_id} / 대리인: {item.proxy_name or '-'}")
-                y -= 14
-        c.showPage()
-        c.save()
-
-    def _generate_statement_pdf(
-        self,
-        path: Path,
-        meeting: BoardMeeting,
-        agendas: list[BoardAgenda],
-    ) -> None:
-        c = canvas.Canvas(str(path), pagesize=A4)
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(40, 800, "진술서")
-        c.setFont("Helvetica", 11)
-        c.drawString(40, 780, f"회의명: {meeting.title}")
-        c.drawString(40, 765, f"일시: {meeting.meeting_date}")
-        y = 740
-        c.setFont("Helvetica", 10)
-        for agenda in agendas:
-            c.drawString(40, y, f"- 안건: {agenda.title} / 유형: {agenda.agenda_type}")
-            y -= 14
-        c.showPage()
-        c.save()
-
-    def _merge_pdfs(self, input_paths: list[Path], output_path: Path) -> None:
-        writer = PdfWriter()
-        for path in input_paths:
-            reader = PdfReader(str(path))
-            for page in reader.pages:
-                writer.add_page(page)
-        with output_path.open("wb") as f:
-            writer.write(f)
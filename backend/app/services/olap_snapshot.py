@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Callable
+
+import numpy as np
+from sqlalchemy import ARRAY, bindparam, event, select, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.periods import split_full_months
+from app.models.account_code import AccountCode
+from app.models.project import Project
+
+
+EPOCH = date(1970, 1, 1)
+DIMENSIONS = ("project", "project_type", "account", "level1", "level2", "level3", "month")
+# Everything a query reads; swapped as a whole when a full reload finishes
+STATE_FIELDS = (
+    "size", "sorted_size", "project_idx", "account_idx", "day", "cents",
+    "cell_month", "cell_project", "cell_account", "cell_cents", "cell_lines",
+    "projects", "accounts", "labels", "project_type_code", "level_codes",
+)
+
+LINES_SQL = """
+    SELECT l.project_id, l.account_code_id, h.tx_date, l.debit_amount - l.credit_amount
+    FROM transaction_line l
+    JOIN transaction_head h ON h.id = l.head_id AND h.tx_date = l.tx_date
+"""
+
+
+class _Dictionary:
+    """Maps values to dense int codes (dictionary encoding)."""
+
+    def __init__(self):
+        self.values: list = []
+        self.codes: dict = {}
+
+    def encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class LedgerSnapshot:
+    """Columnar in-memory copy of approved lines for dashboard slicing.
+
+    One line costs 20 bytes: int32 project code, int32 account code, int32 day
+    number and int64 signed cents (debit - credit). On load the lines are
+    sorted by day and pre-aggregated into sparse (month, project, account)
+    cells, so a query reads the cells of its whole months plus the day-sorted
+    lines of its partial-month edges, and groups them with ``np.bincount`` over
+    per-project/per-account key tables. Approvals committed in this process are
+    appended to an unsorted tail (reversals as negated rows) that is folded in
+    once it grows; a periodic full reload picks up other workers' changes.
+    The reload builds a fresh snapshot without holding the lock and swaps it
+    in at the end, so requests keep answering from the current state meanwhile.
+    """
+
+    def __init__(self, full_reload_seconds: float, compact_threshold: int = 100_000):
+        self.full_reload_seconds = full_reload_seconds
+        self.compact_threshold = compact_threshold
+        self._lock = asyncio.Lock()
+        self._reload_lock = asyncio.Lock()
+        self._pending: list[tuple[list[uuid.UUID], int]] = []
+        self._loaded_at = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        self.size = 0
+        self.sorted_size = 0
+        self.project_idx = np.empty(0, dtype=np.int32)
+        self.account_idx = np.empty(0, dtype=np.int32)
+        self.day = np.empty(0, dtype=np.int32)
+        self.cents = np.empty(0, dtype=np.int64)
+        self.cell_month = np.empty(0, dtype=np.int32)
+        self.cell_project = np.empty(0, dtype=np.int32)
+        self.cell_account = np.empty(0, dtype=np.int32)
+        self.cell_cents = np.empty(0, dtype=np.int64)
+        self.cell_lines = np.empty(0, dtype=np.int64)
+        self.projects = _Dictionary()
+        self.accounts = _Dictionary()
+        self.labels = _Dictionary()
+        self.project_type_code = np.empty(0, dtype=np.int32)
+        self.level_codes = np.empty((0, 3), dtype=np.int32)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at > 0
+
+    def enqueue(self, head_ids: list[uuid.UUID], sign: int) -> None:
+        self._pending.append((list(head_ids), sign))
+
+    def _reload_due(self) -> bool:
+        return not self.loaded or time.monotonic() - self._loaded_at >= self.full_reload_seconds
+
+    async def refresh(self, db: AsyncSession) -> None:
+        if self.loaded and not self._pending and not self._reload_due():
+            return
+        if self._reload_lock.locked() and self.loaded:
+            # Another request is rebuilding; pending batches wait for the new state
+            return
+        if self._reload_due():
+            await self._full_load(db)
+            return
+        if not await self._apply_pending(db):
+            # A project or account created after the last full load
+            await self._full_load(db, force=True)
+
+    async def _apply_pending(self, db: AsyncSession) -> bool:
+        async with self._lock:
+            pending, self._pending = self._pending, []
+            size = self.size
+            try:
+                for head_ids, sign in pending:
+                    await self._load_lines(
+                        db,
+                        text(LINES_SQL + " WHERE h.id = ANY(:head_ids)").bindparams(
+                            bindparam("head_ids", type_=ARRAY(UUID(as_uuid=True)))
+                        ),
+                        {"head_ids": head_ids},
+                        sign,
+                    )
+            except KeyError:
+                self.size = size
+                return False
+            if self.size - self.sorted_size > max(self.compact_threshold, self.sorted_size // 20):
+                self._compact()
+            return True
+
+    async def _full_load(self, db: AsyncSession, force: bool = False) -> None:
+        async with self._reload_lock:
+            if not force and not self._reload_due():
+                return
+            # Batches committed before the scan starts are part of it
+            self._pending = []
+            fresh = LedgerSnapshot(self.full_reload_seconds, self.compact_threshold)
+            await fresh._load_dimensions(db)
+            await fresh._load_lines(db, text(LINES_SQL + " WHERE h.status = 'APPROVED'"), {}, 1)
+            fresh._compact()
+            async with self._lock:
+                for name in STATE_FIELDS:
+                    setattr(self, name, getattr(fresh, name))
+                self._loaded_at = time.monotonic()
+
+    async def _load_dimensions(self, db: AsyncSession) -> None:
+        projects = (await db.execute(select(Project.id, Project.type))).all()
+        accounts = (await db.execute(select(AccountCode.id, AccountCode.level1, AccountCode.level2, AccountCode.level3))).all()
+        project_types = []
+        for project_id, project_type in projects:
+            self.projects.encode(project_id)
+            project_types.append(self.labels.encode(project_type))
+        levels = []
+        for account_id, l1, l2, l3 in accounts:
+            self.accounts.encode(account_id)
+            levels.append([self.labels.encode(l1), self.labels.encode(l2), self.labels.encode(l3)])
+        self.project_type_code = np.asarray(project_types, dtype=np.int32)
+        self.level_codes = np.asarray(levels, dtype=np.int32).reshape(-1, 3)
+
+    async def _load_lines(self, db: AsyncSession, stmt, params: dict, sign: int) -> None:
+        result = await db.stream(stmt.execution_options(yield_per=settings.olap_snapshot_load_batch), params)
+        async for partition in result.partitions():
+            n = len(partition)
+            project_idx = np.empty(n, dtype=np.int32)
+            account_idx = np.empty(n, dtype=np.int32)
+            day = np.empty(n, dtype=np.int32)
+            cents = np.empty(n, dtype=np.int64)
+            for i, (project_id, account_code_id, tx_date, amount) in enumerate(partition):
+                project_idx[i] = self.projects.codes[project_id]
+                account_idx[i] = self.accounts.codes[account_code_id]
+                day[i] = (tx_date - EPOCH).days
+                cents[i] = int(amount * 100) * sign
+            self._append(project_idx, account_idx, day, cents)
+
+    def _append(self, project_idx, account_idx, day, cents) -> None:
+        needed = self.size + len(cents)
+        if needed > len(self.cents):
+            capacity = max(needed, len(self.cents) + len(self.cents) // 8, 1024)
+            self.project_idx = np.resize(self.project_idx, capacity)
+            self.account_idx = np.resize(self.account_idx, capacity)
+            self.day = np.resize(self.day, capacity)
+            self.cents = np.resize(self.cents, capacity)
+        sl = slice(self.size, needed)
+        self.project_idx[sl] = project_idx
+        self.account_idx[sl] = account_idx
+        self.day[sl] = day
+        self.cents[sl] = cents
+        self.size = needed
+
+    def _compact(self) -> None:
+        """Sort all lines by day and rebuild the (month, project, account) cells."""
+        n = self.size
+        order = np.argsort(self.day[:n], kind="stable")
+        self.project_idx = self.project_idx[:n][order]
+        self.account_idx = self.account_idx[:n][order]
+        self.day = self.day[:n][order]
+        self.cents = self.cents[:n][order]
+        self.sorted_size = n
+        if not n:
+            return
+        month = _months(self.day[:n])
+        first = int(month[0])
+        n_projects, n_accounts = max(len(self.projects.values), 1), max(len(self.accounts.values), 1)
+        key = ((month - first).astype(np.int64) * n_projects + self.project_idx[:n]) * n_accounts + self.account_idx[:n]
+        cells, inverse = np.unique(key, return_inverse=True)
+        self.cell_month = (cells // (n_projects * n_accounts) + first).astype(np.int32)
+        self.cell_project = (cells // n_accounts % n_projects).astype(np.int32)
+        self.cell_account = (cells % n_accounts).astype(np.int32)
+        self.cell_cents = np.bincount(inverse, weights=self.cents[:n]).round().astype(np.int64)
+        self.cell_lines = np.bincount(inverse).astype(np.int64)
+
+    def _entity_key(self, dims: list[tuple[str, np.ndarray, Callable]], allowed: np.ndarray | None):
+        """Combine per-entity dimension codes into one key table.
+
+        Returns (key per entity or None, cardinality, decoders). Entities
+        rejected by a filter map to the extra slot ``cardinality - 1``.
+        """
+        if not dims and allowed is None:
+            return None, 1, None
+        count = len(allowed) if allowed is not None else len(dims[0][1])
+        codes, shape, decoders = [], [], []
+        for name, table, decode in dims:
+            values, inverse = np.unique(table, return_inverse=True)
+            codes.append(inverse.reshape(-1))
+            shape.append(len(values))
+            decoders.append((name, values, decode))
+        key = np.ravel_multi_index(codes, shape) if codes else np.zeros(count, dtype=np.int64)
+        cardinality = int(np.prod(shape)) if shape else 1
+        if allowed is not None:
+            key[~allowed] = cardinality
+            cardinality += 1
+        return key, cardinality, (tuple(shape), decoders, allowed is not None)
+
+    def _project_dimension(self, name: str):
+        if name == "project":
+            return np.arange(len(self.projects.values)), lambda c: str(self.projects.values[c])
+        return self.project_type_code, lambda c: self.labels.values[c]
+
+    def _account_dimension(self, name: str):
+        if name == "account":
+            return np.arange(len(self.accounts.values)), lambda c: str(self.accounts.values[c])
+        return self.level_codes[:, int(name[-1]) - 1], lambda c: self.labels.values[c]
+
+    def query(
+        self,
+        group_by: list[str],
+        start: date | None = None,
+        end: date | None = None,
+        filters: dict[str, list[str]] | None = None,
+    ) -> list[dict]:
+        for name in [*group_by, *(filters or {})]:
+            if name not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension: {name}")
+        if "month" in (filters or {}):
+            raise ValueError("Filter months with start/end")
+        if not self.size:
+            return [] if group_by else [{"amount": 0.0}]
+
+        n, s = self.size, self.sorted_size
+        first_day = int(min(self.day[0], self.day[s:n].min(initial=self.day[0]))) if s else int(self.day[:n].min())
+        last_day = int(max(self.day[s - 1], self.day[s:n].max(initial=self.day[s - 1]))) if s else int(self.day[:n].max())
+        start = max(start, EPOCH + timedelta(days=first_day)) if start else EPOCH + timedelta(days=first_day)
+        end = min(end, EPOCH + timedelta(days=last_day)) if end else EPOCH + timedelta(days=last_day)
+        if start > end:
+            return [] if group_by else [{"amount": 0.0}]
+
+        sides = []
+        for side_dims, dimension, entities in (
+            (("project", "project_type"), self._project_dimension, self.projects.values),
+            (("account", "level1", "level2", "level3"), self._account_dimension, self.accounts.values),
+        ):
+            allowed = None
+            for name, wanted in (filters or {}).items():
+                if name in side_dims:
+                    table, _ = dimension(name)
+                    allowed = np.ones(len(entities), dtype=bool) if allowed is None else allowed
+                    allowed &= np.isin(table, self._codes_for(name, wanted))
+            dims = [(name, *dimension(name)) for name in group_by if name in side_dims]
+            sides.append(self._entity_key(dims, allowed))
+        (project_key, n_project, project_spec), (account_key, n_account, account_spec) = sides
+        first_month = _month_of(start)
+        n_month = _month_of(end) - first_month + 1 if "month" in group_by else 1
+        size = n_project * n_account * n_month
+        totals = np.zeros(size, dtype=np.float64)
+        counts = np.zeros(size, dtype=np.float64)
+
+        def accumulate(project_idx, account_idx, month, cents, lines=None):
+            if not len(cents):
+                return
+            key = project_key[project_idx] if project_key is not None else np.zeros(len(cents), dtype=np.int64)
+            if account_key is not None:
+                key = key + n_project * account_key[account_idx]
+            if n_month > 1:
+                key = key + (n_project * n_account) * (month - first_month)
+            totals[:] += np.bincount(key, weights=cents, minlength=size)
+            counts[:] += np.bincount(key, weights=lines, minlength=size)
+
+        full, edges = split_full_months(start, end)
+        if full:
+            bounds = np.array([_month_of(full[0]), _month_of(full[1]) + 1], dtype=np.int32)
+            lo, hi = np.searchsorted(self.cell_month, bounds)
+            accumulate(
+                self.cell_project[lo:hi], self.cell_account[lo:hi], self.cell_month[lo:hi],
+                self.cell_cents[lo:hi], self.cell_lines[lo:hi],
+            )
+        for edge_start, edge_end in edges:
+            bounds = np.array([(edge_start - EPOCH).days, (edge_end - EPOCH).days + 1], dtype=np.int32)
+            lo, hi = np.searchsorted(self.day[:s], bounds)
+            accumulate(self.project_idx[lo:hi], self.account_idx[lo:hi], _month_of(edge_start), self.cents[lo:hi])
+        if n > s:
+            tail_day = self.day[s:n]
+            keep = (tail_day >= (start - EPOCH).days) & (tail_day <= (end - EPOCH).days)
+            accumulate(
+                self.project_idx[s:n][keep], self.account_idx[s:n][keep], _months(tail_day[keep]), self.cents[s:n][keep]
+            )
+
+        shape = (n_month, n_account, n_project)
+        if not group_by:
+            # Only the first cell of each side is inside the filters
+            return [{"amount": round(float(totals[0]) / 100, 2)}]
+        flats = np.flatnonzero(counts)
+        month_codes, account_codes, project_codes = np.unravel_index(flats, shape)
+        keep = np.ones(len(flats), dtype=bool)
+        columns: dict[str, list] = {}
+        for spec, codes in ((project_spec, project_codes), (account_spec, account_codes)):
+            keep &= _decode_side(spec, codes, columns)
+        if "month" in group_by:
+            columns["month"] = (first_month + month_codes).astype("datetime64[M]").astype(str).tolist()
+        amounts, lines = totals[flats].tolist(), counts[flats].tolist()
+        rows = []
+        for i in np.flatnonzero(keep).tolist():
+            row = {name: columns[name][i] for name in group_by}
+            row["amount"] = round(amounts[i] / 100, 2)
+            row["lines"] = int(lines[i])
+            rows.append(row)
+        return rows
+
+    def _codes_for(self, name: str, wanted: list[str]) -> list[int]:
+        if name == "project":
+            return [self.projects.codes[uuid.UUID(v)] for v in wanted if uuid.UUID(v) in self.projects.codes]
+        if name == "account":
+            return [self.accounts.codes[uuid.UUID(v)] for v in wanted if uuid.UUID(v) in self.accounts.codes]
+        return [self.labels.codes[v] for v in wanted if v in self.labels.codes]
+
+    def stats(self) -> dict:
+        line_bytes = self.project_idx.nbytes + self.account_idx.nbytes + self.day.nbytes + self.cents.nbytes
+        cell_bytes = (
+            self.cell_month.nbytes + self.cell_project.nbytes + self.cell_account.nbytes
+            + self.cell_cents.nbytes + self.cell_lines.nbytes
+        )
+        return {
+            "enabled": settings.olap_snapshot_enabled,
+            "lines": self.size,
+            "unsorted_tail": self.size - self.sorted_size,
+            "cells": len(self.cell_cents),
+            "bytes": line_bytes + cell_bytes,
+            "bytes_per_line": (line_bytes / self.size) if self.size else None,
+            "projects": len(self.projects.values),
+            "accounts": len(self.accounts.values),
+            "pending_batches": len(self._pending),
+            "age_seconds": (time.monotonic() - self._loaded_at) if self.loaded else None,
+        }
+
+
+def _months(days: np.ndarray) -> np.ndarray:
+    """Day numbers since 1970-01-01 to month numbers since 1970-01."""
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int32)
+
+
+def _month_of(d: date) -> int:
+    return (d.year - EPOCH.year) * 12 + d.month - 1
+
+
+def _decode_side(spec: tuple | None, codes: np.ndarray, columns: dict[str, list]) -> np.ndarray:
+    """Decode one side's keys into per-dimension value columns.
+
+    Returns the mask of keys that are not the slot of filtered-out entities.
+    """
+    if spec is None:
+        return np.ones(len(codes), dtype=bool)
+    shape, decoders, filtered = spec
+    cardinality = int(np.prod(shape)) if shape else 1
+    keep = codes < cardinality if filtered else np.ones(len(codes), dtype=bool)
+    if decoders:
+        parts = np.unravel_index(np.minimum(codes, cardinality - 1), shape)
+        for (name, values, decode), part in zip(decoders, parts):
+            columns[name] = [decode(v) for v in values[part].tolist()]
+    return keep
+
+
+ledger_snapshot = LedgerSnapshot(full_reload_seconds=settings.olap_snapshot_full_reload_seconds)
+
+
+def mark_heads_changed(session: Session, head_ids: list[uuid.UUID], sign: int) -> None:
+    """Queue approved/reversed heads for the snapshot; applied after commit."""
+    if settings.olap_snapshot_enabled:
+        session.info.setdefault("olap_pending_heads", []).append((list(head_ids), sign))
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_on_commit(session: Session) -> None:
+    for head_ids, sign in session.info.pop("olap_pending_heads", []):
+        ledger_snapshot.enqueue(head_ids, sign)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("olap_pending_heads", None)
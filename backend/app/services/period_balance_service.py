@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import ARRAY, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.olap_snapshot import mark_heads_changed
+from app.services.report_cache import mark_ledger_changed
+
+
+YEAR_MONTH_SQL = "(EXTRACT(YEAR FROM h.tx_date) * 100 + EXTRACT(MONTH FROM h.tx_date))::int"
+
+APPLY_HEADS_SQL = f"""
+    INSERT INTO period_balance (project_id, account_code_id, year_month, debit_total, credit_total)
+    SELECT l.project_id, l.account_code_id, {YEAR_MONTH_SQL},
+           :sign * SUM(l.debit_amount), :sign * SUM(l.credit_amount)
+    FROM transaction_line l
+    JOIN transaction_head h ON h.id = l.head_id AND h.tx_date = l.tx_date
+    WHERE h.id = ANY(:head_ids)
+    GROUP BY l.project_id, l.account_code_id, {YEAR_MONTH_SQL}
+    ON CONFLICT (project_id, account_code_id, year_month) DO UPDATE
+    SET debit_total = period_balance.debit_total + EXCLUDED.debit_total,
+        credit_total = period_balance.credit_total + EXCLUDED.credit_total
+    RETURNING year_month
+"""
+
+RAW_MONTHLY_SQL = f"""
+    SELECT l.project_id, l.account_code_id, {YEAR_MONTH_SQL} AS year_month,
+           SUM(l.debit_amount) AS debit_total, SUM(l.credit_amount) AS credit_total
+    FROM transaction_line l
+    JOIN transaction_head h ON h.id = l.head_id AND h.tx_date = l.tx_date
+    WHERE h.status = 'APPROVED'
+    GROUP BY l.project_id, l.account_code_id, {YEAR_MONTH_SQL}
+"""
+
+
+class PeriodBalanceService:
+    """Maintains the monthly ``period_balance`` rollup of approved lines."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply_heads(self, head_ids: list[uuid.UUID], sign: int = 1) -> set[int]:
+        """Add (sign=1) or remove (sign=-1) the lines of the given heads.
+
+        Returns the affected months and marks them changed for the report cache
+        and the OLAP snapshot.
+        """
+        if not head_ids:
+            return set()
+        result = await self.db.execute(
+            text(APPLY_HEADS_SQL).bindparams(bindparam("head_ids", type_=ARRAY(UUID(as_uuid=True)))),
+            {"head_ids": list(head_ids), "sign": sign},
+        )
+        months = set(result.scalars().all())
+        mark_ledger_changed(self.db.sync_session, months)
+        mark_heads_changed(self.db.sync_session, head_ids, sign)
+        return months
+
+    async def rebuild(self) -> int:
+        await self.db.execute(text("LOCK TABLE period_balance IN EXCLUSIVE MODE"))
+        await self.db.execute(text("DELETE FROM period_balance"))
+        result = await self.db.execute(
+            text(
+                f"""
+                INSERT INTO period_balance (project_id, account_code_id, year_month, debit_total, credit_total)
+                {RAW_MONTHLY_SQL}
+                """
+            )
+        )
+        return result.rowcount
+
+    async def check(self) -> list[dict]:
+        rows = (
+            await self.db.execute(
+                text(
+                    f"""
+                    SELECT COALESCE(r.project_id, p.project_id),
+                           COALESCE(r.account_code_id, p.account_code_id),
+                           COALESCE(r.year_month, p.year_month),
+                           COALESCE(r.debit_total, 0), COALESCE(p.debit_total, 0),
+                           COALESCE(r.credit_total, 0), COALESCE(p.credit_total, 0)
+                    FROM ({RAW_MONTHLY_SQL}) r
+                    FULL OUTER JOIN period_balance p
+                      ON p.project_id = r.project_id
+                     AND p.account_code_id = r.account_code_id
+                     AND p.year_month = r.year_month
+                    WHERE COALESCE(r.debit_total, 0) <> COALESCE(p.debit_total, 0)
+                       OR COALESCE(r.credit_total, 0) <> COALESCE(p.credit_total, 0)
+                    ORDER BY 3, 1, 2
+                    """
+                )
+            )
+        ).all()
+        return [
+            {
+                "project_id": str(project_id),
+                "account_code_id": str(account_code_id),
+                "year_month": ym,
+                "ledger_debit": float(raw_debit),
+                "rollup_debit": float(rollup_debit),
+                "ledger_credit": float(raw_credit),
+                "rollup_credit": float(rollup_credit),
+            }
+            for project_id, account_code_id, ym, raw_debit, rollup_debit, raw_credit, rollup_credit in rows
+        ]
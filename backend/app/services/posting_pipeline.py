@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.transaction import TransactionHead
+from app.services.transaction_service import TransactionLineInput, TransactionService
+
+
+@dataclass
+class _PostingRequest:
+    head: TransactionHead
+    lines: list[TransactionLineInput]
+    user_role: str
+    force_on_budget_exceed: bool
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class GroupCommitPipeline:
+    """Batches concurrent postings into a single database transaction.
+
+    A single writer coroutine drains the queue, waiting at most
+    ``max_wait_ms`` (or until ``max_batch_size`` entries) before committing.
+    Every entry runs inside its own SAVEPOINT so one failure does not abort the
+    batch; failed entries are retried alone in a fresh transaction.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: asyncio.Queue[_PostingRequest] = asyncio.Queue()
+        self._writer_task: asyncio.Task | None = None
+        self._latencies: deque[float] = deque(maxlen=10_000)
+        self._batch_sizes: deque[int] = deque(maxlen=1_000)
+        self._committed = 0
+        self._failed = 0
+        self._retried = 0
+        self._batches = 0
+        self._started_at: float | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._writer_task is not None and not self._writer_task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._started_at = time.perf_counter()
+        self._writer_task = asyncio.create_task(self._writer(), name="posting-group-commit")
+
+    async def stop(self) -> None:
+        if not self._writer_task:
+            return
+        await self._queue.join()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
+
+    async def submit(
+        self,
+        head: TransactionHead,
+        lines: Iterable[TransactionLineInput],
+        user_role: str,
+        force_on_budget_exceed: bool = False,
+    ) -> TransactionHead:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PostingRequest(head, list(lines), user_role, force_on_budget_exceed, future))
+        return await future
+
+    async def _writer(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._commit_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _commit_batch(self, batch: list[_PostingRequest]) -> None:
+        self._batches += 1
+        self._batch_sizes.append(len(batch))
+        posted: list[_PostingRequest] = []
+        retry: list[_PostingRequest] = []
+        try:
+            async with self.session_factory() as session:
+                async with session.begin():
+                    for request in batch:
+                        savepoint = await session.begin_nested()
+                        try:
+                            await self._post(session, request)
+                            await savepoint.commit()
+                            posted.append(request)
+                        except Exception:
+                            await savepoint.rollback()
+                            retry.append(request)
+        except Exception:
+            # The batch commit itself failed: nothing was persisted, retry everyone alone
+            retry = batch
+            posted = []
+
+        for request in posted:
+            self._resolve(request, request.head)
+        for request in retry:
+            await self._post_alone(request)
+
+    async def _post_alone(self, request: _PostingRequest) -> None:
+        self._retried += 1
+        try:
+            async with self.session_factory() as session:
+                async with session.begin():
+                    await self._post(session, request)
+        except Exception as exc:
+            self._failed += 1
+            if not request.future.done():
+                request.future.set_exception(exc)
+            return
+        self._resolve(request, request.head)
+
+    async def _post(self, session: AsyncSession, request: _PostingRequest) -> None:
+        await TransactionService(session).create_transaction(
+            request.head, request.lines, request.user_role, request.force_on_budget_exceed
+        )
+
+    def _resolve(self, request: _PostingRequest, head: TransactionHead) -> None:
+        self._committed += 1
+        self._latencies.append(time.perf_counter() - request.enqueued_at)
+        if not request.future.done():
+            request.future.set_result(head)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self._queue.qsize(),
+            "batches": self._batches,
+            "committed": self._committed,
+            "failed": self._failed,
+            "retried_alone": self._retried,
+            "avg_batch_size": (sum(self._batch_sizes) / len(self._batch_sizes)) if self._batch_sizes else None,
+            "throughput_per_sec": (self._committed / elapsed) if elapsed else None,
+            "latency_p50_ms": percentile(0.50),
+            "latency_p99_ms": percentile(0.99),
+        }
+
+
+posting_pipeline = GroupCommitPipeline(
+    max_batch_size=settings.posting_batch_max_size,
+    max_wait_ms=settings.posting_batch_max_wait_ms,
+)
+
+
+async def post_transaction(
+    db: AsyncSession,
+    head: TransactionHead,
+    lines: Iterable[TransactionLineInput],
+    user_role: str,
+    force_on_budget_exceed: bool = False,
+) -> TransactionHead:
+    if settings.posting_group_commit_enabled and posting_pipeline.running:
+        return await posting_pipeline.submit(head, lines, user_role, force_on_budget_exceed)
+    return await TransactionService(db).create_transaction(head, lines, user_role, force_on_budget_exceed)
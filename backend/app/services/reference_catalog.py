@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.account_code import AccountCode
+from app.models.allocation import AllocationRule, AllocationRuleItem
+
+
+REFERENCE_MODELS = (AccountCode, AllocationRule, AllocationRuleItem)
+
+
+@dataclass(frozen=True)
+class AccountCodeEntry:
+    id: uuid.UUID
+    code: str
+    level1: str
+    level2: str
+    level3: str
+    is_common_expense: bool
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class AllocationRuleEntry:
+    id: uuid.UUID
+    project_id: uuid.UUID
+    effective_from: date
+    effective_to: date | None
+
+    def covers(self, tx_date: date) -> bool:
+        return self.effective_from <= tx_date and (self.effective_to is None or self.effective_to >= tx_date)
+
+
+@dataclass(frozen=True)
+class AllocationRuleItemEntry:
+    id: uuid.UUID
+    rule_id: uuid.UUID
+    target_project_id: uuid.UUID
+    ratio: Decimal
+
+
+def _as_uuid(value: uuid.UUID | str) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+class ReferenceCatalog:
+    """Process-local, versioned snapshot of account codes and allocation rules.
+
+    The snapshot is loaded in bulk (one query per table) and rebuilt lazily
+    whenever the version is bumped, either by a committed write to one of
+    the reference tables or by the TTL expiring (other workers' writes).
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._version = 0
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._account_codes: dict[uuid.UUID, AccountCodeEntry] = {}
+        self._rules: dict[uuid.UUID, AllocationRuleEntry] = {}
+        self._rules_by_project: dict[uuid.UUID, list[AllocationRuleEntry]] = {}
+        self._items_by_rule: dict[uuid.UUID, list[AllocationRuleItemEntry]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        self._version += 1
+
+    def _is_stale(self) -> bool:
+        if self._loaded_version != self._version:
+            return True
+        return self.ttl_seconds > 0 and time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if not self._is_stale():
+            return
+        async with self._lock:
+            if not self._is_stale():
+                return
+            version = self._version
+            account_rows = (await db.execute(select(AccountCode))).scalars().all()
+            rule_rows = (await db.execute(select(AllocationRule))).scalars().all()
+            item_rows = (await db.execute(select(AllocationRuleItem))).scalars().all()
+
+            account_codes = {
+                row.id: AccountCodeEntry(
+                    id=row.id,
+                    code=row.code,
+                    level1=row.level1,
+                    level2=row.level2,
+                    level3=row.level3,
+                    is_common_expense=row.is_common_expense,
+                    is_active=row.is_active,
+                )
+                for row in account_rows
+            }
+            rules = {
+                row.id: AllocationRuleEntry(
+                    id=row.id,
+                    project_id=row.project_id,
+                    effective_from=row.effective_from,
+                    effective_to=row.effective_to,
+                )
+                for row in rule_rows
+            }
+            rules_by_project: dict[uuid.UUID, list[AllocationRuleEntry]] = {}
+            for rule in rules.values():
+                rules_by_project.setdefault(rule.project_id, []).append(rule)
+            for project_rules in rules_by_project.values():
+                project_rules.sort(key=lambda r: r.effective_from, reverse=True)
+            items_by_rule: dict[uuid.UUID, list[AllocationRuleItemEntry]] = {}
+            for row in item_rows:
+                items_by_rule.setdefault(row.rule_id, []).append(
+                    AllocationRuleItemEntry(
+                        id=row.id,
+                        rule_id=row.rule_id,
+                        target_project_id=row.target_project_id,
+                        ratio=Decimal(str(row.ratio)),
+                    )
+                )
+
+            self._account_codes = account_codes
+            self._rules = rules
+            self._rules_by_project = rules_by_project
+            self._items_by_rule = items_by_rule
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+            self._reloads += 1
+            self._misses += 1
+
+    def get_account_code(self, account_code_id: uuid.UUID | str) -> AccountCodeEntry | None:
+        """``None`` is not counted; a caller that reads through to the database calls ``record_miss``."""
+        entry = self._account_codes.get(_as_uuid(account_code_id))
+        if entry is not None:
+            self._hits += 1
+        return entry
+
+    def find_allocation_rule(self, project_id: uuid.UUID | str, tx_date: date) -> AllocationRuleEntry | None:
+        # Rules are pre-sorted by effective_from desc, so the first match is the latest.
+        self._hits += 1
+        for rule in self._rules_by_project.get(_as_uuid(project_id), []):
+            if rule.covers(tx_date):
+                return rule
+        return None
+
+    def get_allocation_items(self, rule_id: uuid.UUID | str) -> list[AllocationRuleItemEntry]:
+        self._hits += 1
+        return list(self._items_by_rule.get(_as_uuid(rule_id), []))
+
+    def record_miss(self) -> None:
+        self._misses += 1
+
+    def stats(self) -> dict:
+        # Misses are snapshot reloads (version bump or TTL) and database read-throughs
+        lookups = self._hits + self._misses
+        return {
+            "version": self._version,
+            "loaded_version": self._loaded_version,
+            "reloads": self._reloads,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": (self._hits / lookups) if lookups else None,
+            "account_codes": len(self._account_codes),
+            "allocation_rules": len(self._rules),
+            "allocation_rule_items": sum(len(items) for items in self._items_by_rule.values()),
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+reference_catalog = ReferenceCatalog(ttl_seconds=settings.reference_catalog_ttl_seconds)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_reference_write(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, REFERENCE_MODELS):
+            session.info["reference_catalog_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop("reference_catalog_dirty", False):
+        reference_catalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("reference_catalog_dirty", None)
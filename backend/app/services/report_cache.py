@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date
+from typing import Awaitable, Callable, Iterable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import PrimaryReadSessionLocal
+
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_VERSION = "ledger"
+
+
+def month_version_name(year_month: int) -> str:
+    return f"ledger:{year_month}"
+
+
+def months_between(start: date, end: date) -> list[int]:
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(year * 100 + month)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+class ReportCacheBackend(ABC):
+    """Storage for cached report bodies and ledger version counters."""
+
+    def __init__(self):
+        self._pending_bumps: set[asyncio.Task] = set()
+        self.failed_bumps = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None: ...
+
+    @abstractmethod
+    async def get_versions(self, names: list[str]) -> list[int]: ...
+
+    @abstractmethod
+    async def bump_versions(self, names: list[str]) -> int:
+        """Advance the global counter and stamp it on every given name."""
+
+    def bump_versions_nowait(self, names: list[str]) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.bump_versions(names))
+            return
+        # The loop only keeps a weak reference to tasks; hold it until done
+        task = loop.create_task(self.bump_versions(names))
+        self._pending_bumps.add(task)
+        task.add_done_callback(self._bump_done)
+
+    def _bump_done(self, task: asyncio.Task) -> None:
+        self._pending_bumps.discard(task)
+        if task.cancelled() or task.exception() is not None:
+            self.failed_bumps += 1
+            logger.error(
+                "Report cache version bump failed; cached reports for those months may be stale until TTL",
+                exc_info=None if task.cancelled() else task.exception(),
+            )
+
+    def stats(self) -> dict:
+        return {}
+
+
+class InMemoryReportCacheBackend(ReportCacheBackend):
+    """Process-local LRU bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._bytes = 0
+        self._versions: dict[str, int] = {}
+        self._counter = 0
+        self._evictions = 0
+
+    async def get(self, key: str) -> bytes | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = value
+        self._bytes += len(value)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._evictions += 1
+
+    async def get_versions(self, names: list[str]) -> list[int]:
+        return [self._versions.get(name, 0) for name in names]
+
+    async def bump_versions(self, names: list[str]) -> int:
+        return self._bump(names)
+
+    def bump_versions_nowait(self, names: list[str]) -> None:
+        self._bump(names)
+
+    def _bump(self, names: list[str]) -> int:
+        self._counter += 1
+        for name in names:
+            self._versions[name] = self._counter
+        return self._counter
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self._evictions,
+            "ledger_version": self._counter,
+        }
+
+
+class RedisReportCacheBackend(ReportCacheBackend):
+    """Shared store for multi-worker deployments (requires the ``redis`` package)."""
+
+    def __init__(self, url: str, ttl_seconds: int, prefix: str = "npo:report-cache:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("report_cache_backend=redis requires the 'redis' package.") from exc
+        super().__init__()
+        self._redis = redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self._redis.set(self.prefix + key, value, ex=self.ttl_seconds)
+
+    async def get_versions(self, names: list[str]) -> list[int]:
+        values = await self._redis.mget([self.prefix + "v:" + name for name in names])
+        return [int(value or 0) for value in values]
+
+    async def bump_versions(self, names: list[str]) -> int:
+        counter = await self._redis.incr(self.prefix + "counter")
+        if names:
+            await self._redis.mset({self.prefix + "v:" + name: counter for name in names})
+        return counter
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "ttl_seconds": self.ttl_seconds,
+            "pending_bumps": len(self._pending_bumps),
+            "failed_bumps": self.failed_bumps,
+        }
+
+
+class ReportCache:
+    """Report results keyed by endpoint, parameters and ledger version.
+
+    The version of a dated report is the newest change stamp among the months
+    it covers, so approvals outside the range leave its cache entries valid.
+    Versions are bumped on the primary after commit, so a body stored under a
+    version must not come from a replica that may not have replayed that
+    commit yet: misses are computed on a read-only primary session, from a
+    pool of its own so report computations never take posting connections.
+    Uncached requests (cache disabled) use the caller's session, since their
+    staleness ends with the replica lag instead of being stored.
+    """
+
+    def __init__(self, backend: ReportCacheBackend, enabled: bool = True, session_factory=PrimaryReadSessionLocal):
+        self.backend = backend
+        self.enabled = enabled
+        self.session_factory = session_factory
+        self._hits = 0
+        self._misses = 0
+
+    async def version_for(self, start: date | None, end: date | None) -> int:
+        if start is None or end is None:
+            names = [GLOBAL_VERSION]
+        else:
+            names = [month_version_name(ym) for ym in months_between(start, end)]
+        return max(await self.backend.get_versions(names), default=0)
+
+    def invalidate_months(self, year_months: Iterable[int]) -> None:
+        names = [GLOBAL_VERSION, *(month_version_name(ym) for ym in set(year_months))]
+        self.backend.bump_versions_nowait(names)
+
+    async def get_or_compute(
+        self,
+        db: AsyncSession,
+        endpoint: str,
+        params: dict,
+        compute: Callable[[AsyncSession], Awaitable[dict]],
+        start: date | None = None,
+        end: date | None = None,
+    ) -> Response:
+        if not self.enabled:
+            return self._response(await compute(db))
+        version = await self.version_for(start, end)
+        digest = hashlib.sha1(json.dumps(jsonable_encoder(params), sort_keys=True).encode()).hexdigest()
+        key = f"{endpoint}:{digest}:{version}"
+        body = await self.backend.get(key)
+        if body is not None:
+            self._hits += 1
+            return Response(content=body, media_type="application/json", headers={"X-Report-Cache": "hit"})
+        self._misses += 1
+        async with self.session_factory() as session:
+            body = self._encode(await compute(session))
+        await self.backend.set(key, body)
+        return Response(content=body, media_type="application/json", headers={"X-Report-Cache": "miss"})
+
+    def _encode(self, result: dict) -> bytes:
+        return json.dumps(jsonable_encoder(result), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _response(self, result: dict) -> Response:
+        return Response(content=self._encode(result), media_type="application/json")
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": (self._hits / lookups) if lookups else None,
+            **self.backend.stats(),
+        }
+
+
+def _build_backend() -> ReportCacheBackend:
+    if settings.report_cache_backend == "redis":
+        return RedisReportCacheBackend(settings.report_cache_redis_url, settings.report_cache_ttl_seconds)
+    return InMemoryReportCacheBackend(settings.report_cache_max_entries, settings.report_cache_max_bytes)
+
+
+report_cache = ReportCache(_build_backend(), enabled=settings.report_cache_enabled)
+
+
+def mark_ledger_changed(session: Session, year_months: Iterable[int]) -> None:
+    """Record months whose approved figures changed; versions bump on commit."""
+    session.info.setdefault("ledger_changed_months", set()).update(year_months)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session: Session) -> None:
+    months = session.info.pop("ledger_changed_months", None)
+    if months:
+        report_cache.invalidate_months(months)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("ledger_changed_months", None)
@@ -1,75 +1,343 @@
 from __future__ import annotations
 
-from datetime import date
+import uuid
+from datetime import date, timedelta
 from decimal import Decimal
-from sqlalchemy import select, func
+
+import numpy as np
+from sqlalchemy import Integer, Numeric, case, cast, literal, literal_column, or_, select, func, tuple_, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.account_code import AccountCode
+from app.models.fiscal_period import ClosingBalance, FiscalPeriod
+from app.models.period_balance import PeriodBalance
 from app.models.project import Project
-from app.models.transaction import TransactionHead, TransactionLine
+from app.models.transaction import LINE_HEAD_JOIN, TransactionHead, TransactionLine, tx_date_between
+from app.core.keyset import decode_cursor, encode_cursor
+from app.core.periods import split_full_months, year_month
+
+
+BALANCE_SHEET_LEVEL1 = ["자산", "부채", "순자산"]
+OPERATING_LEVEL1 = ["수익", "비용"]
+
+# GROUPING(project_type, level1, level2, level3) bitmasks of the ROLLUP rows
+GROUPING_DETAIL = 0b0000
+GROUPING_LEVEL2 = 0b0001
+GROUPING_LEVEL1 = 0b0011
+GROUPING_PROJECT_TYPE = 0b0111
+GROUPING_GRAND_TOTAL = 0b1111
+
+# Lower bound for opening balances ("everything before start")
+LEDGER_EPOCH = date(1900, 1, 1)
+ZERO = literal(Decimal("0.00"), Numeric(18, 2))
+# Inlined (not bound) so "year_month // 100" is textually identical in SELECT and GROUP BY
+YEAR_DIVISOR = literal_column("100", Integer)
+
+PERIOD_GRANULARITIES = ("month", "quarter", "year")
+MONTHS_PER_PERIOD = {"month": 1, "quarter": 3, "year": 12}
+
+
+def _shift_year(d: date, years: int) -> date:
+    try:
+        return d.replace(year=d.year + years)
+    except ValueError:  # 29 February
+        return d.replace(year=d.year + years, day=28)
+
+
+def period_start(d: date, granularity: str) -> date:
+    step = MONTHS_PER_PERIOD[granularity]
+    return date(d.year, (d.month - 1) // step * step + 1, 1)
+
+
+def next_period_start(d: date, granularity: str) -> date:
+    months = d.year * 12 + d.month - 1 + MONTHS_PER_PERIOD[granularity]
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def period_key(d: date, granularity: str) -> int:
+    """YYYYMM for months, YYYYQ for quarters, YYYY for years."""
+    if granularity == "month":
+        return d.year * 100 + d.month
+    if granularity == "quarter":
+        return d.year * 10 + (d.month - 1) // 3 + 1
+    return d.year
+
+
+def period_label(d: date, granularity: str) -> str:
+    if granularity == "month":
+        return f"{d.year}-{d.month:02d}"
+    if granularity == "quarter":
+        return f"{d.year}-Q{(d.month - 1) // 3 + 1}"
+    return str(d.year)
+
+
+def prior_period_start(d: date, granularity: str, compare: str) -> date:
+    """Start of the period compared against the period starting at ``d``."""
+    if compare == "prior_year":
+        return _shift_year(d, -1)
+    return period_start(d - timedelta(days=1), granularity)
+
+
+def comparative_range(
+    start: date, end: date, granularity: str | None, compare: str | None
+) -> tuple[date, date]:
+    """Dates a statement request aggregates.
+
+    Time series are widened to whole periods; comparisons reach back to the
+    first comparison period.
+    """
+    if not granularity:
+        return start, end
+    start = period_start(start, granularity)
+    end = next_period_start(period_start(end, granularity), granularity) - timedelta(days=1)
+    if compare:
+        start = prior_period_start(start, granularity, compare)
+    return start, end
 
 
 class ReportingService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def financial_statements(self, start: date, end: date) -> dict:
-        # Balance sheet by project type
-        bs_stmt = (
+    def _ledger_amounts(self, start: date, end: date, by_month: bool = False):
+        """Approved debit/credit amounts in [start, end] per project, account and month.
+
+        Whole months come from the ``period_balance`` rollup; only the
+        partial-month edges of the range are read from raw lines. Whole fiscal
+        years that are closed come from their frozen ``closing_balance``
+        snapshot instead, as one row per account dated December, unless
+        ``by_month`` needs the real months.
+        """
+        full, edges = split_full_months(start, end)
+        parts = []
+        if full:
+            rollup = select(
+                PeriodBalance.project_id,
+                PeriodBalance.account_code_id,
+                PeriodBalance.debit_total.label("debit_amount"),
+                PeriodBalance.credit_total.label("credit_amount"),
+                PeriodBalance.year_month,
+            ).where(PeriodBalance.year_month.between(year_month(full[0]), year_month(full[1])))
+            first_year = full[0].year if full[0].month == 1 else full[0].year + 1
+            last_year = full[1].year if full[1].month == 12 else full[1].year - 1
+            if not by_month and first_year <= last_year:
+                closed_years = (
+                    select(FiscalPeriod.fiscal_year)
+                    .where(FiscalPeriod.status == "CLOSED")
+                    .where(FiscalPeriod.fiscal_year.between(first_year, last_year))
+                )
+                rollup = rollup.where((PeriodBalance.year_month // YEAR_DIVISOR).not_in(closed_years))
+                parts.append(
+                    select(
+                        ClosingBalance.project_id,
+                        ClosingBalance.account_code_id,
+                        ClosingBalance.debit_total.label("debit_amount"),
+                        ClosingBalance.credit_total.label("credit_amount"),
+                        (ClosingBalance.fiscal_year * 100 + 12).label("year_month"),
+                    )
+                    .where(ClosingBalance.fiscal_year.between(first_year, last_year))
+                    .where(or_(ClosingBalance.debit_total != 0, ClosingBalance.credit_total != 0))
+                )
+            parts.append(rollup)
+        if edges:
+            parts.append(
+                select(
+                    TransactionLine.project_id,
+                    TransactionLine.account_code_id,
+                    TransactionLine.debit_amount,
+                    TransactionLine.credit_amount,
+                    cast(
+                        func.extract("year", TransactionHead.tx_date) * 100
+                        + func.extract("month", TransactionHead.tx_date),
+                        Integer,
+                    ).label("year_month"),
+                )
+                .join(TransactionHead, LINE_HEAD_JOIN)
+                .where(TransactionHead.status == "APPROVED")
+                .where(or_(*(tx_date_between(lo, hi) for lo, hi in edges)))
+            )
+        return (parts[0] if len(parts) == 1 else union_all(*parts)).subquery("ledger")
+
+    async def financial_statements(
+        self,
+        start: date,
+        end: date,
+        granularity: str | None = None,
+        compare: str | None = None,
+    ) -> dict:
+        """Statements for [start, end], or a time series of them per period.
+
+        With ``granularity`` (month/quarter/year) the range is widened to whole
+        periods and every period's amounts come from one bucketed aggregation;
+        ``compare`` (previous or prior_year) adds the amounts of each period's
+        comparison period alongside.
+        """
+        if granularity:
+            return await self._comparative_statements(start, end, granularity, compare)
+        ledger = self._ledger_amounts(start, end)
+        is_bs = AccountCode.level1.in_(BALANCE_SHEET_LEVEL1)
+        is_os = AccountCode.level1.in_(OPERATING_LEVEL1)
+
+        # One scan: balance sheet (debit - credit) and operating statement (credit - debit)
+        # side by side, with ROLLUP producing level2/level1/project-type/grand subtotals.
+        stmt = (
             select(
+                func.grouping(Project.type, AccountCode.level1, AccountCode.level2, AccountCode.level3).label("gid"),
                 Project.type.label("project_type"),
                 AccountCode.level1,
                 AccountCode.level2,
                 AccountCode.level3,
-                func.sum(TransactionLine.debit_amount - TransactionLine.credit_amount).label("amount"),
+                func.sum(case((is_bs, ledger.c.debit_amount - ledger.c.credit_amount))).label("bs_amount"),
+                func.sum(case((is_os, ledger.c.credit_amount - ledger.c.debit_amount))).label("os_amount"),
             )
-            .select_from(TransactionLine)
-            .join(TransactionHead, TransactionHead.id == TransactionLine.head_id)
-            .join(Project, Project.id == TransactionLine.project_id)
-            .join(AccountCode, AccountCode.id == TransactionLine.account_code_id)
-            .where(TransactionHead.status == "APPROVED")
-            .where(TransactionHead.tx_date.between(start, end))
-            .where(AccountCode.level1.in_(["자산", "부채", "순자산"]))
-            .group_by(Project.type, AccountCode.level1, AccountCode.level2, AccountCode.level3)
+            .select_from(ledger)
+            .join(Project, Project.id == ledger.c.project_id)
+            .join(AccountCode, AccountCode.id == ledger.c.account_code_id)
+            .where(AccountCode.level1.in_(BALANCE_SHEET_LEVEL1 + OPERATING_LEVEL1))
+            .group_by(func.rollup(Project.type, AccountCode.level1, AccountCode.level2, AccountCode.level3))
         )
+        rows = (await self.db.execute(stmt)).all()
+
+        balance_sheet: dict[str, list] = {}
+        operating_statement: dict[str, list] = {}
+        subtotals: dict[str, dict] = {"balance_sheet": {}, "operating_statement": {}}
+        totals = {"balance_sheet": 0.0, "operating_statement": 0.0}
+        for gid, project_type, l1, l2, l3, bs_amount, os_amount in rows:
+            if gid == GROUPING_GRAND_TOTAL:
+                totals = {
+                    "balance_sheet": float(bs_amount or 0),
+                    "operating_statement": float(os_amount or 0),
+                }
+                continue
+            for side, amount in (("balance_sheet", bs_amount), ("operating_statement", os_amount)):
+                if amount is None:
+                    continue
+                bucket = subtotals[side].setdefault(project_type, {"total": 0.0, "level1": [], "level2": []})
+                if gid == GROUPING_PROJECT_TYPE:
+                    bucket["total"] = float(amount)
+                elif gid == GROUPING_LEVEL1:
+                    bucket["level1"].append({"level1": l1, "amount": float(amount)})
+                elif gid == GROUPING_LEVEL2:
+                    bucket["level2"].append({"level1": l1, "level2": l2, "amount": float(amount)})
+            # Detail rows: balance sheet down to level3, operating statement down to level2
+            if gid == GROUPING_DETAIL and bs_amount is not None:
+                balance_sheet.setdefault(project_type, []).append(
+                    {"level1": l1, "level2": l2, "level3": l3, "amount": float(bs_amount)}
+                )
+            if gid == GROUPING_LEVEL2 and os_amount is not None:
+                operating_statement.setdefault(project_type, []).append(
+                    {"level1": l1, "level2": l2, "amount": float(os_amount)}
+                )
 
-        # Operating statement by project type
-        os_stmt = (
+        return {
+            "balance_sheet": balance_sheet,
+            "operating_statement": operating_statement,
+            "subtotals": subtotals,
+            "totals": totals,
+        }
+
+    async def _comparative_statements(self, start: date, end: date, granularity: str, compare: str | None) -> dict:
+        ledger = self._ledger_amounts(*comparative_range(start, end, granularity, compare), by_month=granularity != "year")
+        year = ledger.c.year_month // YEAR_DIVISOR
+        if granularity == "month":
+            bucket = ledger.c.year_month
+        elif granularity == "quarter":
+            bucket = year * 10 + (ledger.c.year_month % YEAR_DIVISOR - 1) // 3 + 1
+        else:
+            bucket = year
+        # Bucket in a subquery so GROUP BY can reference the plain column
+        bucketed = select(
+            ledger.c.project_id,
+            ledger.c.account_code_id,
+            ledger.c.debit_amount,
+            ledger.c.credit_amount,
+            bucket.label("period"),
+        ).subquery("bucketed")
+        is_bs = AccountCode.level1.in_(BALANCE_SHEET_LEVEL1)
+        is_os = AccountCode.level1.in_(OPERATING_LEVEL1)
+        stmt = (
             select(
-                Project.type.label("project_type"),
+                bucketed.c.period,
+                Project.type,
                 AccountCode.level1,
                 AccountCode.level2,
-                func.sum(TransactionLine.credit_amount - TransactionLine.debit_amount).label("amount"),
+                AccountCode.level3,
+                func.sum(case((is_bs, bucketed.c.debit_amount - bucketed.c.credit_amount))),
+                func.sum(case((is_os, bucketed.c.credit_amount - bucketed.c.debit_amount))),
             )
-            .select_from(TransactionLine)
-            .join(TransactionHead, TransactionHead.id == TransactionLine.head_id)
-            .join(Project, Project.id == TransactionLine.project_id)
-            .join(AccountCode, AccountCode.id == TransactionLine.account_code_id)
-            .where(TransactionHead.status == "APPROVED")
-            .where(TransactionHead.tx_date.between(start, end))
-            .where(AccountCode.level1.in_(["수익", "비용"]))
-            .group_by(Project.type, AccountCode.level1, AccountCode.level2)
+            .select_from(bucketed)
+            .join(Project, Project.id == bucketed.c.project_id)
+            .join(AccountCode, AccountCode.id == bucketed.c.account_code_id)
+            .where(AccountCode.level1.in_(BALANCE_SHEET_LEVEL1 + OPERATING_LEVEL1))
+            .group_by(bucketed.c.period, Project.type, AccountCode.level1, AccountCode.level2, AccountCode.level3)
         )
+        rows = (await self.db.execute(stmt)).all()
 
-        bs_rows = (await self.db.execute(bs_stmt)).all()
-        os_rows = (await self.db.execute(os_stmt)).all()
+        periods, keys, prior_keys = [], [], []
+        current = period_start(start, granularity)
+        while current <= end:
+            following = next_period_start(current, granularity)
+            period = {
+                "period": period_label(current, granularity),
+                "start": current,
+                "end": following - timedelta(days=1),
+            }
+            keys.append(period_key(current, granularity))
+            if compare:
+                prior = prior_period_start(current, granularity, compare)
+                period["prior_period"] = period_label(prior, granularity)
+                prior_keys.append(period_key(prior, granularity))
+            periods.append(period)
+            current = following
 
-        balance_sheet = {}
-        for project_type, l1, l2, l3, amount in bs_rows:
-            balance_sheet.setdefault(project_type, []).append(
-                {"level1": l1, "level2": l2, "level3": l3, "amount": float(amount or 0)}
-            )
+        # (side, project_type, account path) -> {period key: amount}
+        amounts: dict[tuple, dict[int, Decimal]] = {}
+        for period, project_type, l1, l2, l3, bs_amount, os_amount in rows:
+            if bs_amount is not None:
+                series = amounts.setdefault(("balance_sheet", project_type, (l1, l2, l3)), {})
+                series[period] = series.get(period, Decimal("0")) + bs_amount
+            if os_amount is not None:
+                # Operating statement detail stops at level2
+                series = amounts.setdefault(("operating_statement", project_type, (l1, l2)), {})
+                series[period] = series.get(period, Decimal("0")) + os_amount
 
-        operating_statement = {}
-        for project_type, l1, l2, amount in os_rows:
-            operating_statement.setdefault(project_type, []).append(
-                {"level1": l1, "level2": l2, "amount": float(amount or 0)}
-            )
+        def column(series: dict[int, Decimal], period_keys: list[int]) -> list[float]:
+            return [float(series.get(key, 0)) for key in period_keys]
+
+        statements: dict[str, dict[str, list]] = {"balance_sheet": {}, "operating_statement": {}}
+        subtotals: dict[str, dict[str, dict]] = {"balance_sheet": {}, "operating_statement": {}}
+        totals: dict[str, dict] = {}
+        for side in statements:
+            side_total: dict[int, Decimal] = {}
+            for (row_side, project_type, path), series in sorted(amounts.items(), key=lambda item: str(item[0][1:])):
+                if row_side != side or not any(series.get(key) for key in keys + prior_keys):
+                    continue
+                names = ("level1", "level2", "level3")[: len(path)]
+                line = {**dict(zip(names, path)), "amounts": column(series, keys)}
+                if compare:
+                    line["prior_amounts"] = column(series, prior_keys)
+                statements[side].setdefault(project_type, []).append(line)
+                subtotal = subtotals[side].setdefault(project_type, {})
+                for key, amount in series.items():
+                    subtotal[key] = subtotal.get(key, Decimal("0")) + amount
+                    side_total[key] = side_total.get(key, Decimal("0")) + amount
+            for project_type, series in subtotals[side].items():
+                subtotals[side][project_type] = {"amounts": column(series, keys)}
+                if compare:
+                    subtotals[side][project_type]["prior_amounts"] = column(series, prior_keys)
+            totals[side] = {"amounts": column(side_total, keys)}
+            if compare:
+                totals[side]["prior_amounts"] = column(side_total, prior_keys)
 
         return {
-            "balance_sheet": balance_sheet,
-            "operating_statement": operating_statement,
+            "granularity": granularity,
+            "compare": compare,
+            "periods": periods,
+            "balance_sheet": statements["balance_sheet"],
+            "operating_statement": statements["operating_statement"],
+            "subtotals": subtotals,
+            "totals": totals,
         }
 
     async def reserve_simulation(
@@ -81,18 +349,16 @@ class ReportingService:
         unused_amount: float,
     ) -> dict:
         # Profit = sum(revenue - expense) for Profit projects
+        ledger = self._ledger_amounts(start, end)
         stmt = (
             select(
-                func.sum(TransactionLine.credit_amount - TransactionLine.debit_amount).label("amount")
+                func.sum(ledger.c.credit_amount - ledger.c.debit_amount).label("amount")
             )
-            .select_from(TransactionLine)
-            .join(TransactionHead, TransactionHead.id == TransactionLine.head_id)
-            .join(Project, Project.id == TransactionLine.project_id)
-            .join(AccountCode, AccountCode.id == TransactionLine.account_code_id)
-            .where(TransactionHead.status == "APPROVED")
-            .where(TransactionHead.tx_date.between(start, end))
+            .select_from(ledger)
+            .join(Project, Project.id == ledger.c.project_id)
+            .join(AccountCode, AccountCode.id == ledger.c.account_code_id)
             .where(Project.type == "Profit")
-            .where(AccountCode.level1.in_(["수익", "비용"]))
+            .where(AccountCode.level1.in_(OPERATING_LEVEL1))
         )
         amount = (await self.db.execute(stmt)).scalar() or 0
         profit = Decimal(str(amount))
@@ -109,6 +375,263 @@ class ReportingService:
             "expected_penalty": float(penalty),
         }
 
+    async def reserve_scenario_grid(
+        self,
+        start: date,
+        end: date,
+        limit_rates: list[float],
+        penalty_rates: list[float],
+        unused_amounts: list[float],
+        by_year: bool = False,
+    ) -> dict:
+        """Evaluate every (limit_rate, penalty_rate, unused_amount) combination at once.
+
+        Profit is queried once (grouped by year when ``by_year``). The grid is
+        returned factorized: ``max_reserve[i]`` depends only on limit_rates[i]
+        and ``expected_penalty[j][k]`` on (penalty_rates[j], unused_amounts[k]),
+        so scenario (i, j, k) is the pair ``max_reserve[i], expected_penalty[j][k]``.
+        """
+        scenarios = len(limit_rates) * len(penalty_rates) * len(unused_amounts)
+        if scenarios > settings.reserve_grid_max_scenarios:
+            raise ValueError(f"Grid too large: {scenarios} > {settings.reserve_grid_max_scenarios} scenarios")
+
+        ledger = self._ledger_amounts(start, end)
+        year = (ledger.c.year_month // YEAR_DIVISOR).label("year")
+        stmt = (
+            select(year, func.sum(ledger.c.credit_amount - ledger.c.debit_amount))
+            .select_from(ledger)
+            .join(Project, Project.id == ledger.c.project_id)
+            .join(AccountCode, AccountCode.id == ledger.c.account_code_id)
+            .where(Project.type == "Profit")
+            .where(AccountCode.level1.in_(OPERATING_LEVEL1))
+            .group_by(year)
+            .order_by(year)
+        )
+        rows = (await self.db.execute(stmt)).all()
+        years = [int(y) for y, _ in rows]
+        yearly_profit = np.array([float(amount or 0) for _, amount in rows], dtype=np.float64)
+        profit = float(yearly_profit.sum())
+
+        limits = np.asarray(limit_rates, dtype=np.float64)
+        penalties = np.asarray(penalty_rates, dtype=np.float64)
+        unused = np.asarray(unused_amounts, dtype=np.float64)
+
+        result = {
+            "profit": round(profit, 2),
+            "axes": {
+                "limit_rate": limit_rates,
+                "penalty_rate": penalty_rates,
+                "unused_amount": unused_amounts,
+            },
+            "scenario_count": scenarios,
+            "max_reserve": np.round(profit * limits, 2).tolist(),
+            "expected_penalty": np.round(np.outer(penalties, unused), 2).tolist(),
+        }
+        if by_year:
+            result["by_year"] = {
+                "years": years,
+                "profit": np.round(yearly_profit, 2).tolist(),
+                # [year][limit_rate]
+                "max_reserve": np.round(np.outer(yearly_profit, limits), 2).tolist(),
+            }
+        return result
+
+    async def trial_balance(self, start: date, end: date, project_id: uuid.UUID | None = None) -> dict:
+        period = self._ledger_amounts(start, end)
+        parts = [
+            select(
+                period.c.project_id,
+                period.c.account_code_id,
+                ZERO.label("opening"),
+                period.c.debit_amount.label("debit"),
+                period.c.credit_amount.label("credit"),
+            )
+        ]
+        opening = await self._opening_amounts(start)
+        if opening is not None:
+            parts.append(
+                select(
+                    opening.c.project_id,
+                    opening.c.account_code_id,
+                    opening.c.amount.label("opening"),
+                    ZERO.label("debit"),
+                    ZERO.label("credit"),
+                )
+            )
+        movements = union_all(*parts).subquery("movements")
+
+        opening_sum = func.sum(movements.c.opening)
+        debit_sum = func.sum(movements.c.debit)
+        credit_sum = func.sum(movements.c.credit)
+        stmt = (
+            select(
+                AccountCode.id,
+                AccountCode.code,
+                AccountCode.level1,
+                AccountCode.level2,
+                AccountCode.level3,
+                opening_sum,
+                debit_sum,
+                credit_sum,
+            )
+            .select_from(movements)
+            .join(AccountCode, AccountCode.id == movements.c.account_code_id)
+            .group_by(AccountCode.id)
+            .order_by(AccountCode.code)
+        )
+        if project_id:
+            stmt = stmt.where(movements.c.project_id == project_id)
+        rows = (await self.db.execute(stmt)).all()
+
+        accounts = []
+        for account_id, code, l1, l2, l3, opening_amount, debit, credit in rows:
+            opening_amount = Decimal(str(opening_amount or 0))
+            debit = Decimal(str(debit or 0))
+            credit = Decimal(str(credit or 0))
+            accounts.append(
+                {
+                    "account_code_id": str(account_id),
+                    "code": code,
+                    "level1": l1,
+                    "level2": l2,
+                    "level3": l3,
+                    "opening_balance": float(opening_amount),
+                    "debit": float(debit),
+                    "credit": float(credit),
+                    "closing_balance": float(opening_amount + debit - credit),
+                }
+            )
+        return {"start": start, "end": end, "accounts": accounts}
+
+    async def account_ledger(
+        self,
+        account_code_id: uuid.UUID,
+        start: date,
+        end: date,
+        project_id: uuid.UUID | None = None,
+        after: str | None = None,
+        limit: int = 100,
+    ) -> dict:
+        """One page of an account's approved lines with a running balance.
+
+        Pages are keyset-ordered by (tx_date, head_id, line_id); the running
+        balance at the end of a page travels inside ``next_cursor`` so later
+        pages never re-sum earlier lines. The cursor is signed over the balance
+        and the query parameters, so a modified cursor or one reused with other
+        filters is rejected (ValueError) instead of yielding wrong balances.
+        """
+        scope = f"account_ledger|{account_code_id}|{start}|{end}|{project_id or ''}"
+        cursor = decode_cursor(after, scope=scope) if after else None
+        if cursor is not None:
+            balance = cursor.balance
+        else:
+            balance = await self._opening_balance(account_code_id, start, project_id)
+        page_opening = balance
+
+        stmt = (
+            select(
+                TransactionHead.tx_date,
+                TransactionLine.head_id,
+                TransactionLine.id,
+                TransactionHead.description,
+                Project.code,
+                TransactionLine.debit_amount,
+                TransactionLine.credit_amount,
+                TransactionLine.evidence_url,
+            )
+            .select_from(TransactionLine)
+            .join(TransactionHead, LINE_HEAD_JOIN)
+            .join(Project, Project.id == TransactionLine.project_id)
+            .where(TransactionLine.account_code_id == account_code_id)
+            .where(TransactionHead.status == "APPROVED")
+            .where(tx_date_between(start, end))
+            .order_by(TransactionHead.tx_date, TransactionLine.head_id, TransactionLine.id)
+            .limit(limit + 1)
+        )
+        if project_id:
+            stmt = stmt.where(TransactionLine.project_id == project_id)
+        if cursor is not None:
+            stmt = stmt.where(
+                tuple_(TransactionHead.tx_date, TransactionLine.head_id, TransactionLine.id) > tuple_(*cursor.key)
+            )
+        rows = (await self.db.execute(stmt)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        lines = []
+        for tx_date, head_id, line_id, description, project_code, debit, credit, evidence_url in rows:
+            balance += Decimal(str(debit)) - Decimal(str(credit))
+            lines.append(
+                {
+                    "tx_date": tx_date,
+                    "head_id": str(head_id),
+                    "line_id": str(line_id),
+                    "description": description,
+                    "project_code": project_code,
+                    "debit": float(debit),
+                    "credit": float(credit),
+                    "balance": float(balance),
+                    "evidence_url": evidence_url,
+                }
+            )
+        next_cursor = None
+        if has_more and rows:
+            tx_date, head_id, line_id = rows[-1][:3]
+            next_cursor = encode_cursor(tx_date, head_id, line_id, balance, scope=scope)
+        return {
+            "account_code_id": str(account_code_id),
+            "opening_balance": float(page_opening),
+            "lines": lines,
+            "next_cursor": next_cursor,
+        }
+
+    async def _opening_balance(self, account_code_id: uuid.UUID, start: date, project_id: uuid.UUID | None) -> Decimal:
+        opening = await self._opening_amounts(start)
+        if opening is None:
+            return Decimal("0.00")
+        stmt = select(func.sum(opening.c.amount)).where(opening.c.account_code_id == account_code_id)
+        if project_id:
+            stmt = stmt.where(opening.c.project_id == project_id)
+        return Decimal(str((await self.db.execute(stmt)).scalar() or 0))
+
+    async def _opening_amounts(self, start: date):
+        """Balance (debit - credit) per project and account before ``start``.
+
+        Starts from the carried balances of the last fiscal year closed before
+        ``start`` (closing entries included) and adds the live ledger after it.
+        Returns None when there is nothing before ``start``.
+        """
+        last_closed = (
+            await self.db.execute(
+                select(func.max(FiscalPeriod.fiscal_year))
+                .where(FiscalPeriod.status == "CLOSED")
+                .where(FiscalPeriod.fiscal_year < start.year)
+            )
+        ).scalar()
+        parts = []
+        live_from = LEDGER_EPOCH
+        if last_closed is not None:
+            parts.append(
+                select(
+                    ClosingBalance.project_id,
+                    ClosingBalance.account_code_id,
+                    ClosingBalance.balance.label("amount"),
+                ).where(ClosingBalance.fiscal_year == last_closed)
+            )
+            live_from = date(last_closed + 1, 1, 1)
+        if start > live_from:
+            ledger = self._ledger_amounts(live_from, start - timedelta(days=1))
+            parts.append(
+                select(
+                    ledger.c.project_id,
+                    ledger.c.account_code_id,
+                    (ledger.c.debit_amount - ledger.c.credit_amount).label("amount"),
+                )
+            )
+        if not parts:
+            return None
+        return (parts[0] if len(parts) == 1 else union_all(*parts)).subquery("opening")
+
     async def public_spending_compliance(
         self,
         prev_year_revenue: float,
@@ -121,3 +644,63 @@ class ReportingService:
             "actual_amount": float(actual),
             "status": "PASS" if actual >= required else "FAIL",
         }
+
+    async def annual_type_totals(self, from_year: int, to_year: int) -> dict[int, dict[str, Decimal]]:
+        """Revenue of Profit projects and expense of Public projects per fiscal year.
+
+        Read from the monthly rollup (closed years from their snapshot) in one
+        grouped query over whole years.
+        """
+        ledger = self._ledger_amounts(date(from_year, 1, 1), date(to_year, 12, 31))
+        year = (ledger.c.year_month // YEAR_DIVISOR).label("year")
+        revenue = func.sum(
+            case(
+                (
+                    (Project.type == "Profit") & (AccountCode.level1 == "수익"),
+                    ledger.c.credit_amount - ledger.c.debit_amount,
+                ),
+                else_=0,
+            )
+        )
+        public_spend = func.sum(
+            case(
+                (
+                    (Project.type == "Public") & (AccountCode.level1 == "비용"),
+                    ledger.c.debit_amount - ledger.c.credit_amount,
+                ),
+                else_=0,
+            )
+        )
+        stmt = (
+            select(year, revenue, public_spend)
+            .select_from(ledger)
+            .join(Project, Project.id == ledger.c.project_id)
+            .join(AccountCode, AccountCode.id == ledger.c.account_code_id)
+            .where(AccountCode.level1.in_(OPERATING_LEVEL1))
+            .group_by(year)
+        )
+        rows = (await self.db.execute(stmt)).all()
+        totals = {y: {"profit_revenue": Decimal("0"), "public_spend": Decimal("0")} for y in range(from_year, to_year + 1)}
+        for y, revenue_amount, spend_amount in rows:
+            totals[int(y)] = {
+                "profit_revenue": Decimal(str(revenue_amount or 0)),
+                "public_spend": Decimal(str(spend_amount or 0)),
+            }
+        return totals
+
+    async def public_spending_compliance_trend(self, from_year: int, to_year: int) -> dict:
+        """Evaluate the 80% rule for every fiscal year in [from_year, to_year]."""
+        totals = await self.annual_type_totals(from_year - 1, to_year)
+        years = []
+        for fiscal_year in range(from_year, to_year + 1):
+            prev_year_revenue = totals[fiscal_year - 1]["profit_revenue"]
+            current_public_spend = totals[fiscal_year]["public_spend"]
+            result = await self.public_spending_compliance(float(prev_year_revenue), float(current_public_spend))
+            years.append(
+                {
+                    "fiscal_year": fiscal_year,
+                    "prev_year_revenue": float(prev_year_revenue),
+                    **result,
+                }
+            )
+        return {"from_year": from_year, "to_year": to_year, "years": years}
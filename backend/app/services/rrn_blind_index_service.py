@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import logging
+import uuid
+
+from sqlalchemy import LargeBinary, Select, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.db.session import engine as primary_engine
+from app.services.key_rotation_service import (
+    ChunkedRRNJob,
+    blind_index,
+    first_occurrences,
+    map_in_pool,
+    unclaimed_blind_index,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Three bind parameters per row in the VALUES list; Postgres allows 32767 per statement
+MAX_CHUNK_SIZE = 32767 // 3
+
+
+class BlindIndexBackfillJob(ChunkedRRNJob):
+    """Fills ``rrn_blind_index`` for rows written before the column existed.
+
+    Walks the rows whose index is NULL (every row with ``recompute_all``, after
+    the HMAC key changes), decrypts in the worker pool and writes each chunk
+    with one ``UPDATE ... FROM (VALUES ...)`` that only matches rows whose
+    ciphertext is unchanged since the read. The NULL filter makes a re-run
+    resume where an interrupted one stopped; rows edited concurrently already
+    carry an index from the write path. Where the blind index is unique
+    (donor_sensitive), rows whose RRN another row already holds are left NULL
+    and logged; ``duplicates`` lists them for an operator to resolve.
+    """
+
+    description = "blind-index backfill"
+    lock_prefix = "rrn-blind-index"
+    written_verb = "indexed"
+    max_chunk_size = MAX_CHUNK_SIZE
+    worker_fn = staticmethod(blind_index)
+
+    def __init__(
+        self,
+        table: str,
+        chunk_size: int | None = None,
+        workers: int | None = None,
+        max_rows_per_second: float | None = None,
+        recompute_all: bool = False,
+        engine: AsyncEngine = primary_engine,
+    ):
+        super().__init__(table, chunk_size, workers, max_rows_per_second, engine)
+        self.recompute_all = recompute_all
+
+    def _select(self, after: uuid.UUID | None) -> Select:
+        col = self.column
+        stmt = select(col.pk, col.payload, col.key_id).order_by(col.pk).limit(self.chunk_size)
+        if not self.recompute_all:
+            stmt = stmt.where(col.blind_index.is_(None))
+        return stmt if after is None else stmt.where(col.pk > after)
+
+    async def _write(self, session: AsyncSession, rows, indexes: list[bytes]) -> int:
+        col = self.column
+        indexed = values(
+            column("pk", PG_UUID(as_uuid=True)),
+            column("old_payload", LargeBinary),
+            column("blind_index", LargeBinary),
+            name="indexed",
+        ).data([(pk, payload, index) for (pk, payload, _), index in zip(rows, first_occurrences(col, indexes))])
+        result = await session.execute(
+            update(col.model)
+            .where(col.pk == indexed.c.pk)
+            # Compare-and-set: a row re-encrypted since the read was re-indexed by its writer
+            .where(col.payload == indexed.c.old_payload)
+            .values({col.blind_index: unclaimed_blind_index(col, indexed.c.blind_index)})
+            .returning(col.pk, col.blind_index)
+            .execution_options(synchronize_session=False)
+        )
+        written = result.all()
+        unindexed = [str(pk) for pk, index in written if index is None]
+        if unindexed:
+            logger.warning(
+                "%s: %s rows share an RRN with another row and were left unindexed: %s",
+                col.table,
+                len(unindexed),
+                ", ".join(unindexed),
+            )
+        return len(written) - len(unindexed)
+
+    async def duplicates(self) -> list[tuple[uuid.UUID, uuid.UUID]]:
+        """``(row, holder)`` pairs: unindexed rows whose RRN ``holder`` already carries.
+
+        These are the rows a backfill or rotation leaves NULL under the unique
+        index, so lookups by RRN cannot find them. Read-only; resolve each pair
+        (merge the donors or correct the RRN) and re-run the backfill.
+        """
+        col = self.column
+        if not col.unique_blind_index:
+            return []
+        pairs: list[tuple[uuid.UUID, uuid.UUID]] = []
+        pool = self._open_pool()
+        try:
+            after = None
+            while True:
+                async with AsyncSession(self.engine) as session:
+                    stmt = select(col.pk, col.payload, col.key_id).where(col.blind_index.is_(None))
+                    if after is not None:
+                        stmt = stmt.where(col.pk > after)
+                    rows = (await session.execute(stmt.order_by(col.pk).limit(self.chunk_size))).all()
+                    if not rows:
+                        return pairs
+                    indexes = await map_in_pool(
+                        pool, self.workers, blind_index, [row[1] for row in rows], [row[2] for row in rows]
+                    )
+                    held = await session.execute(select(col.blind_index, col.pk).where(col.blind_index.in_(indexes)))
+                    holders = dict(held.all())
+                pairs.extend((pk, holders[index]) for (pk, _, _), index in zip(rows, indexes) if index in holders)
+                after = rows[-1][0]
+        finally:
+            if pool is not None:
+                pool.shutdown()
@@ -1,18 +1,30 @@
 from __future__ import annotations
 
+import uuid
 from dataclasses import dataclass
 from datetime import date
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from typing import Iterable
 
-from sqlalchemy import select
+from sqlalchemy import Numeric, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import BudgetExceededException
 from app.models.account_code import AccountCode
-from app.models.allocation import AllocationRule, AllocationRuleItem
+from app.models.allocation import AllocationResult
 from app.models.budget import Budget
 from app.models.transaction import TransactionHead, TransactionLine
+from app.services.allocation_engine import AllocationEngine
+from app.services.fiscal_period_service import FiscalPeriodService
+from app.services.ledger_partition_service import ledger_partition_maintainer
+from app.services.period_balance_service import PeriodBalanceService
+from app.services.reference_catalog import (
+    AccountCodeEntry,
+    AllocationRuleEntry,
+    AllocationRuleItemEntry,
+    reference_catalog,
+)
 
 
 @dataclass
@@ -24,6 +36,13 @@ class TransactionLineInput:
     evidence_url: str | None = None
 
 
+@dataclass
+class _PendingAllocation:
+    line: TransactionLineInput
+    account_code: AccountCodeEntry
+    rule: AllocationRuleEntry
+
+
 class TransactionService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -35,108 +54,182 @@ class TransactionService:
         user_role: str,
         force_on_budget_exceed: bool = False,
     ) -> TransactionHead:
+        # 0) Make sure reference data (account codes / allocation rules) is cached,
+        #    and that the fiscal year is still open for postings
+        await reference_catalog.ensure_loaded(self.db)
+        await FiscalPeriodService(self.db).ensure_open([head.tx_date])
+        await ledger_partition_maintainer.ensure_for_postings([head.tx_date.year])
+
         # 1) Persist head
         self.db.add(head)
         await self.db.flush()
 
         # 2) Expand lines with auto-allocation
         expanded_lines: list[TransactionLine] = []
+        budget_lines: list[TransactionLine] = []
+        pending: list[_PendingAllocation] = []
         for line in lines:
             account_code = await self._get_account_code(line.account_code_id)
+            rule = None
             if account_code.is_common_expense:
-                allocated = await self._allocate_common_expense(
-                    head.tx_date, line, account_code
-                )
-                expanded_lines.extend(allocated)
+                rule = self._find_allocation_rule(line.project_id, head.tx_date)
+            if rule and self._get_allocation_items(rule.id):
+                pending.append(_PendingAllocation(line, account_code, rule))
             else:
-                expanded_lines.append(self._to_line(head.id, line))
+                # If no rule, fallback to original line
+                posted = self._to_line(head, line)
+                expanded_lines.append(posted)
+                budget_lines.append(posted)
+
+        allocation_lines, allocated_lines, allocation_results = self._allocate_common_expenses(head, pending)
+        expanded_lines.extend(allocation_lines)
+        budget_lines.extend(allocated_lines)
 
-        # 3) Budget control before insert
-        await self._check_budget(expanded_lines, user_role, force_on_budget_exceed)
+        # 3) Budget control before insert (one locked read for all affected projects)
+        fiscal_year = head.tx_date.year
+        debit_totals = self._aggregate_debits(budget_lines)
+        await self._check_budget(debit_totals, fiscal_year, user_role, force_on_budget_exceed)
 
-        # 4) Persist lines
-        for line in expanded_lines:
-            self.db.add(line)
+        # 4) Persist lines, then the allocation trace that references them
+        self.db.add_all(expanded_lines)
         await self.db.flush()
+        if allocation_results:
+            self.db.add_all(allocation_results)
+            await self.db.flush()
+
+        # 5) Update budgets (spent) in a single UPDATE ... FROM (VALUES ...)
+        await self._apply_budget_spent(debit_totals, fiscal_year)
 
-        # 5) Update budgets (spent)
-        await self._apply_budget_spent(expanded_lines)
+        # 6) Keep the monthly rollup in step with approved postings
+        if head.status == "APPROVED":
+            await PeriodBalanceService(self.db).apply_heads([head.id])
 
         return head
 
-    async def _get_account_code(self, account_code_id: str) -> AccountCode:
+    async def update_status(
+        self,
+        head_id: str,
+        status: str,
+        approved_by: str | None = None,
+    ) -> TransactionHead | None:
+        result = await self.db.execute(
+            select(TransactionHead).where(TransactionHead.id == head_id).with_for_update()
+        )
+        head = result.scalar_one_or_none()
+        if not head:
+            return None
+        await FiscalPeriodService(self.db).ensure_open([head.tx_date])
+        await ledger_partition_maintainer.ensure_for_postings([head.tx_date.year])
+        previous = head.status
+        head.status = status
+        if status == "APPROVED":
+            head.approved_by = approved_by
+        self.db.add(head)
+        await self.db.flush()
+
+        if previous != "APPROVED" and status == "APPROVED":
+            await PeriodBalanceService(self.db).apply_heads([head.id])
+        elif previous == "APPROVED" and status != "APPROVED":
+            await PeriodBalanceService(self.db).apply_heads([head.id], sign=-1)
+        return head
+
+    async def _get_account_code(self, account_code_id: str) -> AccountCodeEntry:
+        account_code = reference_catalog.get_account_code(account_code_id)
+        if account_code is not None:
+            return account_code
+        # Not in the snapshot (e.g. created by another worker): read through and reload lazily
+        reference_catalog.record_miss()
         result = await self.db.execute(
             select(AccountCode).where(AccountCode.id == account_code_id)
         )
-        account_code = result.scalar_one()
-        return account_code
+        row = result.scalar_one()
+        reference_catalog.invalidate()
+        return AccountCodeEntry(
+            id=row.id,
+            code=row.code,
+            level1=row.level1,
+            level2=row.level2,
+            level3=row.level3,
+            is_common_expense=row.is_common_expense,
+            is_active=row.is_active,
+        )
 
-    async def _allocate_common_expense(
+    def _allocate_common_expenses(
         self,
-        tx_date: date,
-        line: TransactionLineInput,
-        account_code: AccountCode,
-    ) -> list[TransactionLine]:
-        # Find active rule (by effective date)
-        rule = await self._find_allocation_rule(line.project_id, tx_date)
-        if not rule:
-            # If no rule, fallback to original line
-            return [self._to_line(None, line)]
-
-        items = await self._get_allocation_items(rule.id)
-        if not items:
-            return [self._to_line(None, line)]
-
-        amount = line.debit_amount or line.credit_amount
-        is_debit = line.debit_amount > 0
-        allocated_lines: list[TransactionLine] = []
-        allocated_sum = Decimal("0.00")
-
-        for item in items:
-            ratio = Decimal(str(item.ratio))
-            part = (amount * ratio).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            allocated_sum += part
-            allocated_lines.append(
-                TransactionLine(
-                    head_id=None,
-                    project_id=item.target_project_id,
-                    account_code_id=account_code.id,
-                    debit_amount=part if is_debit else Decimal("0.00"),
-                    credit_amount=part if not is_debit else Decimal("0.00"),
-                    evidence_url=line.evidence_url,
-                )
-            )
-
-        # Rounding adjustment: add remainder to last line
-        remainder = amount - allocated_sum
-        if allocated_lines and remainder != 0:
-            last = allocated_lines[-1]
-            if is_debit:
-                last.debit_amount += remainder
-            else:
-                last.credit_amount += remainder
+        head: TransactionHead,
+        pending: list[_PendingAllocation],
+    ) -> tuple[list[TransactionLine], list[TransactionLine], list[AllocationResult]]:
+        """Allocate all common-expense lines of a posting in one engine call.
 
-        return allocated_lines
+        Each source line is kept on its own project together with an offsetting
+        clearing line, and the amount is re-booked on the target projects. The
+        returned tuple is (all lines to persist, allocated lines only, results).
+        """
+        if not pending:
+            return [], [], []
 
-    async def _find_allocation_rule(self, project_id: str, tx_date: date) -> AllocationRule | None:
-        result = await self.db.execute(
-            select(AllocationRule)
-            .where(AllocationRule.project_id == project_id)
-            .where(AllocationRule.effective_from <= tx_date)
-            .where((AllocationRule.effective_to.is_(None)) | (AllocationRule.effective_to >= tx_date))
-            .order_by(AllocationRule.effective_from.desc())
+        engine = AllocationEngine(
+            {item.rule.id: self._get_allocation_items(item.rule.id) for item in pending}
         )
-        return result.scalar_one_or_none()
-
-    async def _get_allocation_items(self, rule_id: str) -> list[AllocationRuleItem]:
-        result = await self.db.execute(
-            select(AllocationRuleItem).where(AllocationRuleItem.rule_id == rule_id)
+        shares = engine.allocate(
+            [item.line.debit_amount or item.line.credit_amount for item in pending],
+            [item.rule.id for item in pending],
         )
-        return list(result.scalars().all())
 
-    def _to_line(self, head_id: str | None, line: TransactionLineInput) -> TransactionLine:
+        lines: list[TransactionLine] = []
+        allocated_lines: list[TransactionLine] = []
+        results: list[AllocationResult] = []
+        for item, item_shares in zip(pending, shares):
+            is_debit = item.line.debit_amount > 0
+            source = self._to_line(head, item.line)
+            source.id = uuid.uuid4()
+            clearing = TransactionLine(
+                id=uuid.uuid4(),
+                head_id=head.id,
+                tx_date=head.tx_date,
+                project_id=item.line.project_id,
+                account_code_id=item.account_code.id,
+                debit_amount=item.line.credit_amount,
+                credit_amount=item.line.debit_amount,
+                evidence_url=item.line.evidence_url,
+            )
+            lines.extend([source, clearing])
+            for share in item_shares:
+                if share.amount == 0:
+                    continue
+                allocated = TransactionLine(
+                    id=uuid.uuid4(),
+                    head_id=head.id,
+                    tx_date=head.tx_date,
+                    project_id=share.target_project_id,
+                    account_code_id=item.account_code.id,
+                    debit_amount=share.amount if is_debit else Decimal("0.00"),
+                    credit_amount=share.amount if not is_debit else Decimal("0.00"),
+                    evidence_url=item.line.evidence_url,
+                )
+                lines.append(allocated)
+                allocated_lines.append(allocated)
+                results.append(
+                    AllocationResult(
+                        tx_date=head.tx_date,
+                        source_line_id=source.id,
+                        allocated_line_id=allocated.id,
+                        rule_id=item.rule.id,
+                        allocated_amount=share.amount,
+                    )
+                )
+        return lines, allocated_lines, results
+
+    def _find_allocation_rule(self, project_id: str, tx_date: date) -> AllocationRuleEntry | None:
+        return reference_catalog.find_allocation_rule(project_id, tx_date)
+
+    def _get_allocation_items(self, rule_id: str) -> list[AllocationRuleItemEntry]:
+        return reference_catalog.get_allocation_items(rule_id)
+
+    def _to_line(self, head: TransactionHead, line: TransactionLineInput) -> TransactionLine:
         return TransactionLine(
-            head_id=head_id,
+            head_id=head.id,
+            tx_date=head.tx_date,
             project_id=line.project_id,
             account_code_id=line.account_code_id,
             debit_amount=line.debit_amount,
@@ -144,46 +237,61 @@ class TransactionService:
             evidence_url=line.evidence_url,
         )
 
+    @staticmethod
+    def _aggregate_debits(lines: list[TransactionLine]) -> dict[uuid.UUID, Decimal]:
+        totals: dict[uuid.UUID, Decimal] = {}
+        for line in lines:
+            amount = Decimal(str(line.debit_amount))
+            if amount <= 0:
+                continue
+            project_id = line.project_id if isinstance(line.project_id, uuid.UUID) else uuid.UUID(str(line.project_id))
+            totals[project_id] = totals.get(project_id, Decimal("0.00")) + amount
+        return totals
+
     async def _check_budget(
         self,
-        lines: list[TransactionLine],
+        debit_totals: dict[uuid.UUID, Decimal],
+        fiscal_year: int,
         user_role: str,
         force_on_budget_exceed: bool,
     ) -> None:
-        for line in lines:
-            amount = line.debit_amount
-            if amount <= 0:
-                continue
-            fiscal_year = date.today().year
-            result = await self.db.execute(
-                select(Budget).where(
-                    (Budget.project_id == line.project_id)
-                    & (Budget.fiscal_year == fiscal_year)
-                )
-            )
-            budget = result.scalar_one_or_none()
-            if not budget:
-                continue
-            remaining = Decimal(str(budget.total_budget)) - Decimal(str(budget.total_spent))
-            if remaining < Decimal(str(amount)):
+        if not debit_totals:
+            return
+        # Lock the affected budget rows (in a stable order to avoid deadlocks) so that
+        # concurrent postings to the same project serialize on check + update.
+        result = await self.db.execute(
+            select(Budget.project_id, Budget.total_budget, Budget.total_spent)
+            .where(Budget.project_id.in_(list(debit_totals)))
+            .where(Budget.fiscal_year == fiscal_year)
+            .order_by(Budget.project_id)
+            .with_for_update()
+        )
+        for project_id, total_budget, total_spent in result.all():
+            amount = debit_totals[project_id]
+            remaining = Decimal(str(total_budget)) - Decimal(str(total_spent))
+            if remaining < amount:
                 if user_role.lower() == "admin" and force_on_budget_exceed:
                     continue
-                raise BudgetExceededException(str(line.project_id), float(remaining), float(amount))
+                raise BudgetExceededException(str(project_id), float(remaining), float(amount))
 
-    async def _apply_budget_spent(self, lines: list[TransactionLine]) -> None:
-        for line in lines:
-            amount = line.debit_amount
-            if amount <= 0:
-                continue
-            fiscal_year = date.today().year
-            result = await self.db.execute(
-                select(Budget).where(
-                    (Budget.project_id == line.project_id)
-                    & (Budget.fiscal_year == fiscal_year)
-                )
-            )
-            budget = result.scalar_one_or_none()
-            if not budget:
-                continue
-            budget.total_spent = Decimal(str(budget.total_spent)) + Decimal(str(amount))
-            self.db.add(budget)
+    async def _apply_budget_spent(
+        self,
+        debit_totals: dict[uuid.UUID, Decimal],
+        fiscal_year: int,
+    ) -> dict[uuid.UUID, Decimal]:
+        if not debit_totals:
+            return {}
+        amounts = values(
+            column("project_id", PG_UUID(as_uuid=True)),
+            column("amount", Numeric(18, 2)),
+            name="amounts",
+        ).data(list(debit_totals.items()))
+        result = await self.db.execute(
+            update(Budget)
+            .where(Budget.project_id == amounts.c.project_id)
+            .where(Budget.fiscal_year == fiscal_year)
+            .values(total_spent=Budget.total_spent + amounts.c.amount)
+            .returning(Budget.project_id, Budget.total_spent)
+            .execution_options(synchronize_session=False)
+        )
+        return {project_id: Decimal(str(total_spent)) for project_id, total_spent in result.all()}
@@ -0,0 +1,8 @@
+"""Benchmarks for the ledger: synthetic data, micro-benchmarks and a load driver.
+
+Run everything from ``backend/`` so ``app`` is importable:
+
+    python -m benchmarks.generator --lines 1000000
+    python -m benchmarks.micro [--with-db] [--save-baseline NAME | --compare NAME]
+    python -m benchmarks.load --url http://localhost:8000 [--save-baseline NAME | --compare NAME]
+"""
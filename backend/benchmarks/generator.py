@@ -0,0 +1,466 @@
+"""Load a deterministic synthetic NPO ledger into an empty database.
+
+Usage:
+    python -m benchmarks.generator --lines 1000000
+    python -m benchmarks.generator --lines 50000000 --projects 120 --years 2021 2022 2023 2024 2025
+    python -m benchmarks.generator --lines 1000000 --reset   # wipe ledger/master data first
+
+The dataset has Public and Profit projects, a three-level account tree
+(자산/부채/순자산/수익/비용), allocation rules on common-expense accounts,
+budgets, donors with donations, and balanced journal entries over the given
+years. Common-expense lines are expanded with the production AllocationEngine
+into source, clearing and allocated lines plus their allocation trace, so the
+shape of the ledger matches what TransactionService posts. The same seed and
+options always produce the same rows, ids included.
+
+Rows are COPYed straight into the tables and committed per batch; budgets
+(with ``total_spent`` matching the generated postings) and the period_balance
+rollup are written at the end. Restart running API workers afterwards: their
+reference catalog and report cache do not see bulk-loaded rows.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.allocation_engine import AllocationEngine
+from app.services.ledger_partition_service import LedgerPartitionService
+from app.services.period_balance_service import PeriodBalanceService
+from app.services.reference_catalog import AllocationRuleItemEntry
+
+
+# level1 -> level2 -> [(level3, is_common_expense)]
+ACCOUNT_TREE: dict[str, dict[str, list[tuple[str, bool]]]] = {
+    "자산": {
+        "유동자산": [("현금", False), ("보통예금", False), ("미수금", False), ("선급금", False)],
+        "비유동자산": [("비품", False), ("차량운반구", False), ("임차보증금", False)],
+    },
+    "부채": {
+        "유동부채": [("미지급금", False), ("예수금", False), ("선수금", False)],
+        "비유동부채": [("퇴직급여충당부채", False)],
+    },
+    "순자산": {
+        "기본순자산": [("기본순자산", False)],
+        "보통순자산": [("보통순자산", False)],
+    },
+    "수익": {
+        "사업수익": [("기부금수익", False), ("보조금수익", False), ("회비수익", False), ("사업수입", False)],
+        "사업외수익": [("이자수익", False), ("잡이익", False)],
+    },
+    "비용": {
+        "사업수행비용": [("인건비", False), ("사업비", False), ("장학금", False), ("지원금", False)],
+        "일반관리비용": [
+            ("임차료", True),
+            ("공과금", True),
+            ("통신비", True),
+            ("사무용품비", True),
+            ("관리인건비", True),
+        ],
+        "모금비용": [("홍보비", False), ("모금행사비", False)],
+    },
+}
+
+PAYMENT_METHODS = ["BANK", "CARD", "CASH", "ONLINE", "OTHER"]
+DONATION_AMOUNTS = [10_000, 20_000, 30_000, 50_000, 100_000, 300_000, 1_000_000]
+
+HEAD_COLUMNS = ["id", "tx_date", "description", "status", "created_by", "approved_by"]
+LINE_COLUMNS = ["id", "head_id", "tx_date", "project_id", "account_code_id", "debit_amount", "credit_amount"]
+ALLOCATION_RESULT_COLUMNS = ["id", "tx_date", "source_line_id", "allocated_line_id", "rule_id", "allocated_amount"]
+
+# Reset order does not matter with CASCADE; these are the roots of everything generated
+RESET_TABLES = [
+    "transaction_head",
+    "allocation_rule",
+    "budget",
+    "donor",
+    "period_balance",
+    "fiscal_period",
+    "project",
+    "account_code",
+]
+
+ANALYZE_TABLES = [
+    "project",
+    "account_code",
+    "allocation_rule",
+    "allocation_rule_item",
+    "budget",
+    "donor",
+    "donation",
+    "transaction_head",
+    "transaction_line",
+    "allocation_result",
+    "period_balance",
+]
+
+ZERO = Decimal("0.00")
+
+
+@dataclass
+class DatasetSpec:
+    seed: int = 7
+    lines: int = 1_000_000
+    years: list[int] = field(default_factory=lambda: [date.today().year - 2, date.today().year - 1, date.today().year])
+    projects: int = 40
+    public_share: float = 0.7
+    rule_share: float = 0.3  # projects whose common expenses are allocated
+    donors: int = 20_000
+    donations_per_donor: float = 3.0
+    approved_share: float = 0.9
+    common_expense_share: float = 0.2
+    batch_lines: int = 100_000
+
+
+@dataclass
+class _Account:
+    id: uuid.UUID
+    code: str
+    level1: str
+    level2: str
+    level3: str
+    is_common_expense: bool
+
+
+@dataclass
+class _PendingAllocation:
+    head_id: uuid.UUID
+    tx_date: date
+    project_id: uuid.UUID
+    account_id: uuid.UUID
+    amount: Decimal
+    rule_id: uuid.UUID
+
+
+class SyntheticLedger:
+    """Generates the rows; all randomness comes from one seeded ``random.Random``."""
+
+    def __init__(self, spec: DatasetSpec):
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.accounts = self._accounts()
+        self.by_level3 = {account.level3: account for account in self.accounts}
+        self.expense_accounts = [a for a in self.accounts if a.level1 == "비용" and not a.is_common_expense]
+        self.common_accounts = [a for a in self.accounts if a.is_common_expense]
+        self.revenue_accounts = [a for a in self.accounts if a.level1 == "수익"]
+        self.projects = self._projects()
+        self.public_projects = [p for p in self.projects if p[3] == "Public"]
+        self.rules, self.rule_items = self._allocation_rules()
+        self.rules_by_project: dict[uuid.UUID, list[tuple]] = {}
+        for rule in self.rules:
+            self.rules_by_project.setdefault(rule[4], []).append(rule)
+        self.engine = AllocationEngine(self.items_by_rule())
+        self.created_by = self._uuid()
+        self.approved_by = self._uuid()
+        # (project_id, fiscal_year) -> budget-counted debits, as TransactionService books them
+        self.spent: dict[tuple[uuid.UUID, int], Decimal] = {}
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _accounts(self) -> list[_Account]:
+        accounts = []
+        for i, (level1, groups) in enumerate(ACCOUNT_TREE.items(), start=1):
+            for j, (level2, leaves) in enumerate(groups.items(), start=1):
+                for k, (level3, is_common) in enumerate(leaves, start=1):
+                    accounts.append(_Account(self._uuid(), f"{i}{j}{k:02d}", level1, level2, level3, is_common))
+        return accounts
+
+    def _projects(self) -> list[tuple]:
+        start = date(self.spec.years[0], 1, 1)
+        projects = []
+        for i in range(1, self.spec.projects + 1):
+            kind = "Public" if self.rng.random() < self.spec.public_share else "Profit"
+            projects.append((self._uuid(), f"P{i:04d}", f"합성 사업 {i:04d}", kind, start, None, True))
+        return projects
+
+    def _allocation_rules(self) -> tuple[list[tuple], list[tuple]]:
+        rules, items = [], []
+        project_ids = [p[0] for p in self.projects]
+        first_year, last_year = self.spec.years[0], self.spec.years[-1]
+        for project_id in project_ids:
+            if self.rng.random() >= self.spec.rule_share:
+                continue
+            # Half the rules get a newer version mid-way through the last year
+            versions = [(date(first_year, 1, 1), None)]
+            if self.rng.random() < 0.5:
+                switch = date(last_year, 7, 1)
+                versions = [(date(first_year, 1, 1), switch - timedelta(days=1)), (switch, None)]
+            for effective_from, effective_to in versions:
+                rule_id = self._uuid()
+                basis = self.rng.choice(["HEADCOUNT", "AREA", "REVENUE"])
+                basis_value = Decimal(self.rng.randint(1, 500))
+                rules.append(
+                    (rule_id, f"공통비 배부 {basis}", basis, basis_value, project_id, effective_from, effective_to)
+                )
+                targets = self.rng.sample(project_ids, k=min(len(project_ids), self.rng.randint(2, 6)))
+                cuts = sorted(self.rng.sample(range(1, 10_000), k=len(targets) - 1))
+                weights = [b - a for a, b in zip([0, *cuts], [*cuts, 10_000])]
+                for target, weight in zip(targets, weights):
+                    items.append((self._uuid(), rule_id, target, Decimal(weight) / 10_000))
+        return rules, items
+
+    def items_by_rule(self) -> dict[uuid.UUID, list[AllocationRuleItemEntry]]:
+        items_by_rule: dict[uuid.UUID, list[AllocationRuleItemEntry]] = {rule[0]: [] for rule in self.rules}
+        for item_id, rule_id, target, ratio in self.rule_items:
+            items_by_rule[rule_id].append(AllocationRuleItemEntry(item_id, rule_id, target, ratio))
+        return items_by_rule
+
+    def _rule_for(self, project_id: uuid.UUID, tx_date: date) -> uuid.UUID | None:
+        for rule_id, _, _, _, _, effective_from, effective_to in self.rules_by_project.get(project_id, []):
+            if effective_from <= tx_date and (effective_to is None or tx_date <= effective_to):
+                return rule_id
+        return None
+
+    def _amount(self) -> Decimal:
+        # Long-tailed KRW amounts, median around 160,000
+        return Decimal(max(1_000, round(self.rng.lognormvariate(12, 1.3), -2))).quantize(ZERO)
+
+    def _date(self) -> date:
+        year = self.rng.choice(self.spec.years)
+        start = date(year, 1, 1)
+        return start + timedelta(days=self.rng.randrange((date(year + 1, 1, 1) - start).days))
+
+    def _count_spent(self, project_id: uuid.UUID, tx_date: date, debit: Decimal) -> None:
+        if debit > 0:
+            key = (project_id, tx_date.year)
+            self.spent[key] = self.spent.get(key, ZERO) + debit
+
+    def batches(self):
+        """Yield (heads, lines, allocation_results) batches until ``spec.lines`` lines exist."""
+        generated = 0
+        while generated < self.spec.lines:
+            heads, lines, pending = [], [], []
+            remaining = min(self.spec.batch_lines, self.spec.lines - generated)
+            # A pending allocation becomes at least three lines (source, clearing, one share)
+            while len(lines) + 3 * len(pending) < remaining:
+                self._entry(heads, lines, pending)
+            results = self._allocate(lines, pending)
+            generated += len(lines)
+            yield heads, lines, results
+
+    def _entry(self, heads: list, lines: list, pending: list) -> None:
+        head_id, tx_date = self._uuid(), self._date()
+        approved = self.rng.random() < self.spec.approved_share
+        status = "APPROVED" if approved else self.rng.choice(["DRAFT", "REJECTED"])
+        project_id = self.rng.choice(self.projects)[0]
+        bank = self.by_level3["보통예금"].id
+        kind = self.rng.random()
+
+        def line(account_id, debit=ZERO, credit=ZERO, project=project_id):
+            lines.append((self._uuid(), head_id, tx_date, project, account_id, debit, credit))
+            self._count_spent(project, tx_date, debit)
+
+        if kind < 0.6:
+            description = "지출 결의"
+            total = ZERO
+            for _ in range(self.rng.randint(1, 4)):
+                amount = self._amount()
+                total += amount
+                rule_id = None
+                if self.rng.random() < self.spec.common_expense_share:
+                    account = self.rng.choice(self.common_accounts)
+                    rule_id = self._rule_for(project_id, tx_date)
+                else:
+                    account = self.rng.choice(self.expense_accounts)
+                if rule_id:
+                    pending.append(_PendingAllocation(head_id, tx_date, project_id, account.id, amount, rule_id))
+                else:
+                    line(account.id, debit=amount)
+            line(bank, credit=total)
+        elif kind < 0.9:
+            description = "수입 결의"
+            total = ZERO
+            for _ in range(self.rng.randint(1, 2)):
+                amount = self._amount()
+                total += amount
+                line(self.rng.choice(self.revenue_accounts).id, credit=amount)
+            line(bank, debit=total)
+        else:
+            description = "미지급금 지급"
+            amount = self._amount()
+            line(self.by_level3["미지급금"].id, debit=amount)
+            line(bank, credit=amount)
+
+        heads.append((head_id, tx_date, description, status, self.created_by, self.approved_by if approved else None))
+
+    def _allocate(self, lines: list, pending: list[_PendingAllocation]) -> list[tuple]:
+        """Expand common-expense debits like TransactionService._allocate_common_expenses."""
+        if not pending:
+            return []
+        shares = self.engine.allocate([item.amount for item in pending], [item.rule_id for item in pending])
+        results = []
+        for item, item_shares in zip(pending, shares):
+            source_id = self._uuid()
+            head_id, tx_date, account_id = item.head_id, item.tx_date, item.account_id
+            lines.append((source_id, head_id, tx_date, item.project_id, account_id, item.amount, ZERO))
+            lines.append((self._uuid(), head_id, tx_date, item.project_id, account_id, ZERO, item.amount))
+            for share in item_shares:
+                if share.amount == 0:
+                    continue
+                allocated_id = self._uuid()
+                lines.append((allocated_id, head_id, tx_date, share.target_project_id, account_id, share.amount, ZERO))
+                self._count_spent(share.target_project_id, tx_date, share.amount)
+                results.append((self._uuid(), tx_date, source_id, allocated_id, item.rule_id, share.amount))
+        return results
+
+    def donors(self):
+        for i in range(1, self.spec.donors + 1):
+            yield (self._uuid(), f"후원자 {i:06d}", f"donor{i:06d}@example.org", None)
+
+    def donations(self, donor_ids: list[uuid.UUID]):
+        targets = self.public_projects or self.projects
+        for _ in range(int(len(donor_ids) * self.spec.donations_per_donor)):
+            yield (
+                self._uuid(),
+                self.rng.choice(donor_ids),
+                self.rng.choice(targets)[0],
+                self._date(),
+                Decimal(self.rng.choice(DONATION_AMOUNTS)).quantize(ZERO),
+                None,
+                self.rng.choice(PAYMENT_METHODS),
+                self.rng.random() < 0.6,
+            )
+
+    def budgets(self) -> list[tuple]:
+        budgets = []
+        for project in self.projects:
+            for year in self.spec.years:
+                spent = self.spent.get((project[0], year), ZERO)
+                # Headroom so load-test postings mostly pass budget control
+                total = max(Decimal(10_000_000), (spent * Decimal("1.25")).quantize(Decimal(1)))
+                budgets.append((self._uuid(), project[0], year, total.quantize(ZERO), spent))
+        return budgets
+
+
+async def _copy(session: AsyncSession, table: str, columns: list[str], records) -> int:
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    records = list(records)
+    if records:
+        await raw.driver_connection.copy_records_to_table(table, records=records, columns=columns)
+    return len(records)
+
+
+async def _prepare(spec: DatasetSpec, reset: bool) -> None:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            if reset:
+                if settings.env == "prod":
+                    raise SystemExit("refusing to --reset with ENV=prod")
+                await session.execute(text(f"TRUNCATE {', '.join(RESET_TABLES)} CASCADE"))
+            elif (await session.execute(text("SELECT EXISTS (SELECT 1 FROM project)"))).scalar():
+                raise SystemExit("database already has projects; use --reset to replace them")
+            for year in spec.years:
+                await session.execute(
+                    text("INSERT INTO fiscal_period (fiscal_year, status) VALUES (:year, 'OPEN') ON CONFLICT DO NOTHING"),
+                    {"year": year},
+                )
+            await LedgerPartitionService(session).ensure_years(spec.years)
+
+
+async def generate(spec: DatasetSpec, reset: bool = False) -> dict:
+    await _prepare(spec, reset)
+    ledger = SyntheticLedger(spec)
+    counts: dict[str, int] = {}
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            counts["account_code"] = await _copy(
+                session,
+                "account_code",
+                ["id", "code", "level1", "level2", "level3", "is_common_expense", "is_active"],
+                [(a.id, a.code, a.level1, a.level2, a.level3, a.is_common_expense, True) for a in ledger.accounts],
+            )
+            counts["project"] = await _copy(
+                session,
+                "project",
+                ["id", "code", "name", "type", "start_date", "end_date", "is_active"],
+                ledger.projects,
+            )
+            counts["allocation_rule"] = await _copy(
+                session,
+                "allocation_rule",
+                ["id", "name", "basis_type", "basis_value", "project_id", "effective_from", "effective_to"],
+                ledger.rules,
+            )
+            counts["allocation_rule_item"] = await _copy(
+                session, "allocation_rule_item", ["id", "rule_id", "target_project_id", "ratio"], ledger.rule_items
+            )
+            donors = list(ledger.donors())
+            counts["donor"] = await _copy(session, "donor", ["id", "name", "email", "phone"], donors)
+            counts["donation"] = await _copy(
+                session,
+                "donation",
+                ["id", "donor_id", "project_id", "donated_at", "amount", "purpose", "payment_method", "receipt_issued"],
+                ledger.donations([donor[0] for donor in donors]),
+            )
+
+    started = time.perf_counter()
+    for key in ("transaction_head", "transaction_line", "allocation_result"):
+        counts[key] = 0
+    for heads, lines, results in ledger.batches():
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                counts["transaction_head"] += await _copy(session, "transaction_head", HEAD_COLUMNS, heads)
+                counts["transaction_line"] += await _copy(session, "transaction_line", LINE_COLUMNS, lines)
+                counts["allocation_result"] += await _copy(
+                    session, "allocation_result", ALLOCATION_RESULT_COLUMNS, results
+                )
+        elapsed = time.perf_counter() - started
+        print(
+            f"lines {counts['transaction_line']:,}/{spec.lines:,} "
+            f"({counts['transaction_line'] / elapsed:,.0f}/s)",
+            file=sys.stderr,
+        )
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            counts["budget"] = await _copy(
+                session, "budget", ["id", "project_id", "fiscal_year", "total_budget", "total_spent"], ledger.budgets()
+            )
+            counts["period_balance"] = await PeriodBalanceService(session).rebuild()
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            for table in ANALYZE_TABLES:
+                await session.execute(text(f"ANALYZE {table}"))
+    return counts
+
+
+def main() -> None:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=defaults.lines, help="transaction lines to generate")
+    parser.add_argument("--years", type=int, nargs="+", default=defaults.years)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--donors", type=int, default=defaults.donors)
+    parser.add_argument("--batch-lines", type=int, default=defaults.batch_lines, help="lines per COPY transaction")
+    parser.add_argument("--reset", action="store_true", help="truncate existing master and ledger data first")
+    args = parser.parse_args()
+    spec = DatasetSpec(
+        seed=args.seed,
+        lines=args.lines,
+        years=sorted(set(args.years)),
+        projects=args.projects,
+        donors=args.donors,
+        batch_lines=args.batch_lines,
+    )
+    counts = asyncio.run(generate(spec, reset=args.reset))
+    for table, count in counts.items():
+        print(f"{table}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
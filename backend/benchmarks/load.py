@@ -0,0 +1,317 @@
+"""Async load driver for the API, run against a database filled by benchmarks.generator.
+
+Usage:
+    python -m benchmarks.load --url http://localhost:8000 --duration 60 --concurrency 32
+    python -m benchmarks.load --asgi --duration 30                  # in-process app, no HTTP server
+    python -m benchmarks.load --rate 200 --mix post=5,ledger=3,trial_balance=1,financials=1
+    python -m benchmarks.load --url http://localhost:8000 --save-baseline main
+    python -m benchmarks.load --url http://localhost:8000 --compare main
+
+Scenarios post journal entries (with common expenses to allocate) and read
+reports over random ranges of the generated years. By default the driver is
+closed-loop: ``--concurrency`` workers each send the next request as soon as
+the previous one returns. With ``--rate`` it is open-loop: requests start on a
+fixed schedule and latency is measured from the scheduled start, so queueing
+behind a slow server shows up in p99 instead of lowering the offered load.
+
+Fixture ids (projects, accounts, open years) are read from DATABASE_URL, so
+point it at the database the server uses. Needs ``httpx``
+(``pip install -r benchmarks/requirements.txt``). Report caching stays as the
+server is configured; set REPORT_CACHE_ENABLED=false on the server to measure
+uncached report queries.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import text
+
+from app.core.periods import month_end
+from app.db.session import AsyncSessionLocal
+from benchmarks.stats import compare, load_baseline, print_comparison, print_table, save_baseline, summarize
+
+
+DEFAULT_MIX = "post=5,ledger=3,trial_balance=1,financials=1"
+
+
+@dataclass
+class Fixtures:
+    years: list[int]
+    projects: list[str]
+    expense_accounts: list[str]
+    common_accounts: list[str]
+    bank_account: str
+    created_by: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+    @classmethod
+    async def load(cls) -> "Fixtures":
+        async with AsyncSessionLocal() as session:
+            years = (
+                await session.execute(
+                    text("SELECT fiscal_year FROM fiscal_period WHERE status = 'OPEN' ORDER BY fiscal_year")
+                )
+            ).scalars().all()
+            if not years:
+                raise SystemExit("no open fiscal years; run python -m benchmarks.generator first")
+            projects = (
+                await session.execute(
+                    text(
+                        """
+                        SELECT p.id::text FROM project p
+                        JOIN budget b ON b.project_id = p.id AND b.fiscal_year = :year
+                        WHERE p.is_active ORDER BY p.code
+                        """
+                    ),
+                    {"year": years[-1]},
+                )
+            ).scalars().all()
+            accounts = (
+                await session.execute(
+                    text(
+                        "SELECT id::text, level1, level3, is_common_expense "
+                        "FROM account_code WHERE is_active ORDER BY code"
+                    )
+                )
+            ).all()
+        bank = [account_id for account_id, _, level3, _ in accounts if level3 == "보통예금"]
+        if not projects or not bank:
+            raise SystemExit("generated projects/accounts not found; run python -m benchmarks.generator first")
+        return cls(
+            years=list(years),
+            projects=list(projects),
+            expense_accounts=[a for a, level1, _, common in accounts if level1 == "비용" and not common],
+            common_accounts=[a for a, _, _, common in accounts if common],
+            bank_account=bank[0],
+        )
+
+    def date_range(self, rng: random.Random, max_months: int = 12) -> tuple[date, date]:
+        year = rng.choice(self.years)
+        first = rng.randint(1, 12)
+        last = min(12, first + rng.randint(0, max_months - 1))
+        return date(year, first, 1), month_end(date(year, last, 1))
+
+
+async def post(client: httpx.AsyncClient, fx: Fixtures, rng: random.Random) -> httpx.Response:
+    year = fx.years[-1]
+    tx_date = date(year, 1, 1) + timedelta(days=rng.randrange(365))
+    project_id = rng.choice(fx.projects)
+    lines, total = [], 0
+    for _ in range(rng.randint(1, 3)):
+        amount = rng.randrange(10_000, 200_000, 100)
+        total += amount
+        accounts = fx.common_accounts if fx.common_accounts and rng.random() < 0.3 else fx.expense_accounts
+        lines.append({"project_id": project_id, "account_code_id": rng.choice(accounts), "debit_amount": str(amount)})
+    lines.append({"project_id": project_id, "account_code_id": fx.bank_account, "credit_amount": str(total)})
+    return await client.post(
+        "/api/transactions",
+        json={
+            "tx_date": tx_date.isoformat(),
+            "description": "load test",
+            "status": "APPROVED" if rng.random() < 0.7 else "DRAFT",
+            "created_by": fx.created_by,
+            "lines": lines,
+        },
+    )
+
+
+async def ledger(client: httpx.AsyncClient, fx: Fixtures, rng: random.Random) -> httpx.Response:
+    start, end = fx.date_range(rng, max_months=3)
+    return await client.get(
+        f"/api/reports/ledger/{rng.choice(fx.expense_accounts + [fx.bank_account])}",
+        params={"start": start.isoformat(), "end": end.isoformat(), "limit": 100},
+    )
+
+
+async def trial_balance(client: httpx.AsyncClient, fx: Fixtures, rng: random.Random) -> httpx.Response:
+    start, end = fx.date_range(rng)
+    params = {"start": start.isoformat(), "end": end.isoformat()}
+    if rng.random() < 0.5:
+        params["project_id"] = rng.choice(fx.projects)
+    return await client.get("/api/reports/trial-balance", params=params)
+
+
+async def financials(client: httpx.AsyncClient, fx: Fixtures, rng: random.Random) -> httpx.Response:
+    start, end = fx.date_range(rng)
+    return await client.get(
+        "/api/reports/financials",
+        params={"start": start.isoformat(), "end": end.isoformat(), "granularity": "month"},
+    )
+
+
+async def compliance(client: httpx.AsyncClient, fx: Fixtures, rng: random.Random) -> httpx.Response:
+    return await client.get("/api/reports/compliance", params={"fiscal_year": rng.choice(fx.years)})
+
+
+async def export(client: httpx.AsyncClient, fx: Fixtures, rng: random.Random) -> httpx.Response:
+    start, end = fx.date_range(rng, max_months=1)
+    # Reads the whole streamed body, so latency covers the full export
+    return await client.get("/api/reports/ledger/export", params={"start": start.isoformat(), "end": end.isoformat()})
+
+
+SCENARIOS = {
+    "post": post,
+    "ledger": ledger,
+    "trial_balance": trial_balance,
+    "financials": financials,
+    "compliance": compliance,
+    "export": export,
+}
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        weights[name] = int(weight or 1)
+    return weights
+
+
+@dataclass
+class Recorder:
+    measure_from: float
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    statuses: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def record(self, scenario: str, scheduled: float, status: str) -> None:
+        if scheduled < self.measure_from:
+            return  # warm-up
+        self.latencies.setdefault(scenario, []).append(time.perf_counter() - scheduled)
+        counts = self.statuses.setdefault(scenario, {})
+        counts[status] = counts.get(status, 0) + 1
+
+
+async def _request(client, fx, rng, scenario: str, scheduled: float, recorder: Recorder) -> None:
+    try:
+        response = await SCENARIOS[scenario](client, fx, rng)
+        status = f"{response.status_code // 100}xx"
+    except httpx.HTTPError:
+        status = "failed"
+    recorder.record(scenario, scheduled, status)
+
+
+async def run_closed(client, fx, weights, concurrency: int, deadline: float, recorder: Recorder, seed: int) -> None:
+    names, counts = list(weights), list(weights.values())
+
+    async def worker(index: int) -> None:
+        rng = random.Random(seed * 1_000 + index)
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(names, counts)[0]
+            await _request(client, fx, rng, scenario, time.perf_counter(), recorder)
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+
+async def run_open(client, fx, weights, rate: float, concurrency: int, deadline: float, recorder, seed: int) -> None:
+    names, counts = list(weights), list(weights.values())
+    rng = random.Random(seed)
+    in_flight = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def one(scenario: str, scheduled: float) -> None:
+        async with in_flight:
+            await _request(client, fx, rng, scenario, scheduled, recorder)
+
+    scheduled = time.perf_counter()
+    while scheduled < deadline:
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        task = asyncio.create_task(one(rng.choices(names, counts)[0], scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        scheduled += 1 / rate
+    await asyncio.gather(*tasks)
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    weights = parse_mix(args.mix)
+    fx = await Fixtures.load()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+    app = None
+    if args.asgi:
+        from app.main import app
+
+        await app.router.startup()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=timeout)
+    else:
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout)
+
+    started = time.perf_counter()
+    recorder = Recorder(measure_from=started + args.warmup)
+    deadline = started + args.warmup + args.duration
+    try:
+        async with client:
+            if args.rate:
+                await run_open(client, fx, weights, args.rate, args.concurrency, deadline, recorder, args.seed)
+            else:
+                await run_closed(client, fx, weights, args.concurrency, deadline, recorder, args.seed)
+    finally:
+        if app is not None:
+            await app.router.shutdown()
+    elapsed = time.perf_counter() - recorder.measure_from
+
+    results = {}
+    for scenario in weights:
+        results[scenario] = {
+            **summarize(recorder.latencies.get(scenario, []), elapsed),
+            "statuses": recorder.statuses.get(scenario, {}),
+        }
+    results["all"] = summarize([value for values in recorder.latencies.values() for value in values], elapsed)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://localhost:8000", help="base URL of a running server")
+    target.add_argument("--asgi", action="store_true", help="drive app.main:app in-process instead")
+    parser.add_argument("--duration", type=float, default=60, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds run before measuring")
+    parser.add_argument("--concurrency", type=int, default=16, help="workers (closed loop) or in-flight cap (--rate)")
+    parser.add_argument("--rate", type=float, help="requests per second, open loop")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME", help="baseline to compare p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed p95 growth before a regression")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(
+        [
+            {
+                "scenario": name,
+                **summary,
+                "statuses": " ".join(f"{k}={v}" for k, v in sorted(summary.get("statuses", {}).items())),
+            }
+            for name, summary in results.items()
+        ],
+        ["scenario", "count", "throughput_per_s", "p50_ms", "p95_ms", "p99_ms", "max_ms", "statuses"],
+    )
+    if args.save_baseline:
+        params = {key: getattr(args, key) for key in ("url", "asgi", "duration", "concurrency", "rate", "mix", "seed")}
+        print(f"baseline written to {save_baseline(args.save_baseline, 'load', results, params)}")
+    if args.compare:
+        baseline = load_baseline(args.compare, "load")
+        if baseline["params"].get("mix") != args.mix or baseline["params"].get("rate") != args.rate:
+            print("warning: baseline was recorded with a different mix or rate", file=sys.stderr)
+        rows = compare(results, baseline["results"], "p95_ms", args.tolerance)
+        print()
+        print_comparison(rows, "p95_ms")
+        if any(row["regressed"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
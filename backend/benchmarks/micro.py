@@ -0,0 +1,257 @@
+"""Micro-benchmarks for allocation and posting.
+
+Usage:
+    python -m benchmarks.micro
+    python -m benchmarks.micro -k allocation --save-baseline before
+    python -m benchmarks.micro --with-db --compare before   # DB benchmarks need generated data
+
+Each ``bench_*`` function takes a ``benchmark`` callable shaped like the
+pytest-benchmark fixture (``benchmark(fn, *args)``); coroutine benchmarks use
+``await benchmark.run_async(fn, *args)``. Benchmarks marked ``needs_db`` run
+against DATABASE_URL inside transactions that are rolled back.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import sys
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from benchmarks.generator import DatasetSpec, SyntheticLedger
+from benchmarks.stats import compare, load_baseline, print_comparison, print_table, save_baseline, summarize
+
+
+SEED = 7
+
+
+class Benchmark:
+    """Times ``fn`` for at least ``min_rounds`` rounds and ``min_time`` seconds, after warm-up."""
+
+    def __init__(self, min_rounds: int = 20, min_time: float = 0.5, warmup_rounds: int = 3):
+        self.min_rounds = min_rounds
+        self.min_time = min_time
+        self.warmup_rounds = warmup_rounds
+        self.samples: list[float] = []
+
+    def _done(self, started: float) -> bool:
+        return len(self.samples) >= self.min_rounds and time.perf_counter() - started >= self.min_time
+
+    def __call__(self, fn, *args, **kwargs):
+        for _ in range(self.warmup_rounds):
+            result = fn(*args, **kwargs)
+        started = time.perf_counter()
+        while not self._done(started):
+            t0 = time.perf_counter()
+            result = fn(*args, **kwargs)
+            self.samples.append(time.perf_counter() - t0)
+        return result
+
+    async def run_async(self, fn, *args, **kwargs):
+        for _ in range(self.warmup_rounds):
+            result = await fn(*args, **kwargs)
+        started = time.perf_counter()
+        while not self._done(started):
+            t0 = time.perf_counter()
+            result = await fn(*args, **kwargs)
+            self.samples.append(time.perf_counter() - t0)
+        return result
+
+
+def needs_db(fn):
+    fn.needs_db = True
+    return fn
+
+
+_reference: SyntheticLedger | None = None
+
+
+def reference_data() -> SyntheticLedger:
+    """Master data of the default synthetic dataset (no ledger rows)."""
+    global _reference
+    if _reference is None:
+        _reference = SyntheticLedger(DatasetSpec(seed=SEED, lines=0))
+    return _reference
+
+
+def _engine_inputs(rows: int) -> tuple:
+    ledger = reference_data()
+    rng = np.random.default_rng(SEED)
+    rule_ids = [rule[0] for rule in ledger.rules]
+    amounts = [Decimal(int(cents)) / 100 for cents in rng.integers(100, 50_000_000, size=rows)]
+    rules = [rule_ids[i] for i in rng.integers(0, len(rule_ids), size=rows)]
+    return ledger.engine, amounts, rules
+
+
+def bench_largest_remainder_10k_rows(benchmark):
+    from app.services.allocation_engine import largest_remainder
+
+    rng = np.random.default_rng(SEED)
+    amounts = rng.integers(100, 50_000_000, size=10_000)
+    weights = rng.integers(0, 10_000, size=(10_000, 6))
+    weights[:, 0] += 1
+    benchmark(largest_remainder, amounts, weights)
+
+
+def bench_allocation_engine_1k_lines(benchmark):
+    engine, amounts, rules = _engine_inputs(1_000)
+    benchmark(engine.allocate, amounts, rules)
+
+
+def bench_allocation_engine_build(benchmark):
+    from app.services.allocation_engine import AllocationEngine
+
+    items_by_rule = reference_data().items_by_rule()
+    benchmark(AllocationEngine, items_by_rule)
+
+
+def bench_posting_expand_20_lines(benchmark):
+    """CPU side of one posting: allocation expansion and budget aggregation, no I/O."""
+    from app.models.transaction import TransactionHead
+    from app.services.reference_catalog import AllocationRuleEntry, AllocationRuleItemEntry
+    from app.services.transaction_service import TransactionLineInput, TransactionService, _PendingAllocation
+
+    ledger = reference_data()
+    items_by_rule = ledger.items_by_rule()
+
+    class InMemoryTransactionService(TransactionService):
+        def _get_allocation_items(self, rule_id) -> list[AllocationRuleItemEntry]:
+            return items_by_rule[rule_id]
+
+    rule = ledger.rules[0]
+    rule_entry = AllocationRuleEntry(id=rule[0], project_id=rule[4], effective_from=rule[5], effective_to=rule[6])
+    account = ledger.common_accounts[0]
+    head = TransactionHead(id=uuid.uuid4(), tx_date=date(ledger.spec.years[-1], 3, 15), status="APPROVED")
+    pending = [
+        _PendingAllocation(
+            TransactionLineInput(str(rule_entry.project_id), str(account.id), Decimal(100_000 + i * 1_234), Decimal(0)),
+            account,
+            rule_entry,
+        )
+        for i in range(20)
+    ]
+    service = InMemoryTransactionService(None)
+
+    def expand():
+        lines, allocated, _ = service._allocate_common_expenses(head, pending)
+        return service._aggregate_debits(allocated)
+
+    benchmark(expand)
+
+
+def bench_rrn_decrypt_many_500(benchmark):
+    from app.core.crypto import get_rrn_keyring
+
+    keyring = get_rrn_keyring()
+    payloads = keyring.encrypt_many([f"{800101 + i:06d}-1{i:06d}" for i in range(500)])
+    benchmark(keyring.decrypt_many, payloads, keyring.active_key_id)
+
+
+@needs_db
+async def bench_post_transaction_db(benchmark):
+    """Full TransactionService.create_transaction (rolled back) against generated data."""
+    from sqlalchemy import text
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.transaction import TransactionHead
+    from app.services.transaction_service import TransactionLineInput, TransactionService
+
+    async with AsyncSessionLocal() as session:
+        row = (
+            await session.execute(
+                text(
+                    """
+                    SELECT r.project_id, a.id, bank.id, MAX(b.fiscal_year)
+                    FROM allocation_rule r
+                    JOIN budget b ON b.project_id = r.project_id
+                    CROSS JOIN LATERAL (SELECT id FROM account_code WHERE is_common_expense ORDER BY code LIMIT 1) a
+                    CROSS JOIN LATERAL (SELECT id FROM account_code WHERE level3 = '보통예금' LIMIT 1) bank
+                    WHERE r.effective_to IS NULL
+                    GROUP BY r.project_id, a.id, bank.id
+                    ORDER BY r.project_id
+                    LIMIT 1
+                    """
+                )
+            )
+        ).first()
+    if row is None:
+        raise RuntimeError("no generated data; run python -m benchmarks.generator first")
+    project_id, common_account_id, bank_id, fiscal_year = row
+    lines = [
+        TransactionLineInput(str(project_id), str(common_account_id), Decimal("120000"), Decimal("0")),
+        TransactionLineInput(str(project_id), str(bank_id), Decimal("0"), Decimal("120000")),
+    ]
+
+    async def post_and_roll_back():
+        async with AsyncSessionLocal() as session:
+            head = TransactionHead(
+                tx_date=date(fiscal_year, 6, 30),
+                description="benchmark",
+                status="APPROVED",
+                created_by=uuid.uuid4(),
+            )
+            await TransactionService(session).create_transaction(head, lines, "admin", force_on_budget_exceed=True)
+            await session.rollback()
+
+    await benchmark.run_async(post_and_roll_back)
+
+
+def collect(pattern: str | None, with_db: bool) -> list:
+    benches = [fn for name, fn in sorted(globals().items()) if name.startswith("bench_") and callable(fn)]
+    if pattern:
+        benches = [fn for fn in benches if pattern in fn.__name__]
+    if not with_db:
+        benches = [fn for fn in benches if not getattr(fn, "needs_db", False)]
+    return benches
+
+
+async def run(benches: list, min_rounds: int, min_time: float) -> dict[str, dict]:
+    results = {}
+    for fn in benches:
+        benchmark = Benchmark(min_rounds=min_rounds, min_time=min_time)
+        started = time.perf_counter()
+        if inspect.iscoroutinefunction(fn):
+            await fn(benchmark)
+        else:
+            fn(benchmark)
+        name = fn.__name__.removeprefix("bench_")
+        results[name] = summarize(benchmark.samples, sum(benchmark.samples))
+        print(f"{name}: {len(benchmark.samples)} rounds in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", help="only benchmarks whose name contains this")
+    parser.add_argument("--with-db", action="store_true", help="include benchmarks that need the database")
+    parser.add_argument("--min-rounds", type=int, default=20)
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per benchmark")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME", help="baseline to compare p50 against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed p50 growth before a regression")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(collect(args.pattern, args.with_db), args.min_rounds, args.min_time))
+    print_table(
+        [{"name": name, **summary} for name, summary in results.items()],
+        ["name", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "throughput_per_s"],
+    )
+    if args.save_baseline:
+        params = {"min_rounds": args.min_rounds, "min_time": args.min_time}
+        path = save_baseline(args.save_baseline, "micro", results, params)
+        print(f"baseline written to {path}")
+    if args.compare:
+        rows = compare(results, load_baseline(args.compare, "micro")["results"], "p50_ms", args.tolerance)
+        print()
+        print_comparison(rows, "p50_ms")
+        if any(row["regressed"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+def summarize(latencies_seconds: Sequence[float], elapsed_seconds: float | None = None) -> dict:
+    """Count, throughput and latency percentiles (milliseconds) of one series."""
+    samples = np.asarray(latencies_seconds, dtype=np.float64) * 1000
+    if samples.size == 0:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    summary = {
+        "count": int(samples.size),
+        "mean_ms": round(float(samples.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "max_ms": round(float(samples.max()), 4),
+    }
+    if elapsed_seconds:
+        summary["throughput_per_s"] = round(samples.size / elapsed_seconds, 2)
+    return summary
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def baseline_path(name: str) -> Path:
+    path = Path(name)
+    return path if path.suffix == ".json" else BASELINE_DIR / f"{name}.json"
+
+
+def save_baseline(name: str, kind: str, results: dict[str, dict], params: dict | None = None) -> Path:
+    path = baseline_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "kind": kind,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": params or {},
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False, default=str) + "\n")
+    return path
+
+
+def load_baseline(name: str, kind: str) -> dict:
+    payload = json.loads(baseline_path(name).read_text())
+    if payload.get("kind") != kind:
+        raise ValueError(f"Baseline {name} holds {payload.get('kind')} results, not {kind}")
+    return payload
+
+
+def compare(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    metric: str,
+    tolerance: float,
+) -> list[dict]:
+    """Per-benchmark change of ``metric`` against the baseline.
+
+    A benchmark regresses when the metric grew by more than ``tolerance``
+    (a fraction, 0.1 = 10%). Benchmarks missing on either side are reported
+    with a null change and never count as regressions.
+    """
+    rows = []
+    for name in sorted(set(results) | set(baseline)):
+        current = results.get(name, {}).get(metric)
+        previous = baseline.get(name, {}).get(metric)
+        change = (current - previous) / previous if current is not None and previous else None
+        rows.append(
+            {
+                "name": name,
+                "baseline": previous,
+                "current": current,
+                "change": change,
+                "regressed": change is not None and change > tolerance,
+            }
+        )
+    return rows
+
+
+def print_table(rows: list[dict], columns: list[str]) -> None:
+    cells = [[_cell(row.get(col)) for col in columns] for row in rows]
+    widths = [max(len(col), *(len(line[i]) for line in cells)) if cells else len(col) for i, col in enumerate(columns)]
+    print("  ".join(col.ljust(width) for col, width in zip(columns, widths)))
+    for line in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)))
+
+
+def print_comparison(rows: list[dict], metric: str) -> None:
+    print_table(
+        [
+            {
+                "name": row["name"],
+                f"baseline {metric}": row["baseline"],
+                f"current {metric}": row["current"],
+                "change": None if row["change"] is None else f"{row['change']:+.1%}",
+                "": "REGRESSED" if row["regressed"] else "",
+            }
+            for row in rows
+        ],
+        ["name", f"baseline {metric}", f"current {metric}", "change", ""],
+    )
+
+
+def _cell(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
@@ -0,0 +1,327 @@
+"""Baseline schema: the tables and balance trigger from before the migrations
+
+Matches what docs/schema.sql and ``create_all`` produced before Alembic was
+introduced, so an existing database can be stamped at this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+CHECK_TRANSACTION_BALANCE = """
+CREATE OR REPLACE FUNCTION check_transaction_balance()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_head_id UUID;
+  v_debit NUMERIC(18,2);
+  v_credit NUMERIC(18,2);
+BEGIN
+  IF (TG_OP = 'DELETE') THEN
+    v_head_id := OLD.head_id;
+  ELSE
+    v_head_id := NEW.head_id;
+  END IF;
+
+  SELECT COALESCE(SUM(debit_amount), 0), COALESCE(SUM(credit_amount), 0)
+  INTO v_debit, v_credit
+  FROM transaction_line
+  WHERE head_id = v_head_id;
+
+  IF v_debit <> v_credit THEN
+    RAISE EXCEPTION 'Transaction not balanced. head_id=%, debit=%, credit=%',
+      v_head_id, v_debit, v_credit;
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+
+    op.create_table(
+        "account_code",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("level1", sa.String(length=100), nullable=False),
+        sa.Column("level2", sa.String(length=100), nullable=False),
+        sa.Column("level3", sa.String(length=100), nullable=False),
+        sa.Column("code", sa.String(length=30), nullable=False),
+        sa.Column("is_common_expense", sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), server_default=sa.true(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("code"),
+    )
+    op.create_table(
+        "approval_step",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("step_order", sa.Integer(), nullable=False),
+        sa.Column("required_role", sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("step_order"),
+    )
+    op.create_table(
+        "audit_log",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("table_name", sa.String(length=100), nullable=False),
+        sa.Column("record_id", sa.UUID(), nullable=False),
+        sa.Column("action", sa.String(length=10), nullable=False),
+        sa.Column("before_data", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("after_data", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("changed_by", sa.UUID(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "board_meeting",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("meeting_date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=30), nullable=False),
+        sa.Column("convene_notice_sent_at", sa.DateTime(), nullable=True),
+        sa.Column("minutes_text", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "board_member",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("rrn_encrypted", sa.LargeBinary(), nullable=False),
+        sa.Column("rrn_key_id", sa.String(length=100), nullable=False),
+        sa.Column("address", sa.String(length=300), nullable=False),
+        sa.Column("term_start", sa.Date(), nullable=False),
+        sa.Column("term_end", sa.Date(), nullable=False),
+        sa.Column("occupation", sa.String(length=200), nullable=False),
+        sa.Column("role", sa.String(length=50), nullable=False),
+        sa.Column("is_foreigner", sa.Boolean(), nullable=False),
+        sa.Column("special_relation_to_id", sa.UUID(), nullable=True),
+        sa.ForeignKeyConstraint(["special_relation_to_id"], ["board_member.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "donor",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("email", sa.String(length=200), nullable=True),
+        sa.Column("phone", sa.String(length=50), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "project",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("code", sa.String(length=30), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("type", sa.String(length=10), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=True),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), server_default=sa.true(), nullable=False),
+        sa.CheckConstraint("type IN ('Public', 'Profit')", name="ck_project_type"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("code"),
+    )
+    op.create_table(
+        "transaction_head",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("tx_date", sa.Date(), nullable=False),
+        sa.Column("description", sa.String(length=500), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("created_by", sa.UUID(), nullable=False),
+        sa.Column("approved_by", sa.UUID(), nullable=True),
+        sa.CheckConstraint("status IN ('DRAFT', 'APPROVED', 'REJECTED')", name="ck_transaction_head_status"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "allocation_rule",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("basis_type", sa.String(length=50), nullable=False),
+        sa.Column("basis_value", sa.Numeric(precision=18, scale=4), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("effective_from", sa.Date(), nullable=False),
+        sa.Column("effective_to", sa.Date(), nullable=True),
+        sa.CheckConstraint(
+            "basis_type IN ('HEADCOUNT', 'AREA', 'REVENUE', 'CUSTOM')", name="ck_allocation_rule_basis_type"
+        ),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "board_agenda",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("meeting_id", sa.UUID(), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("agenda_type", sa.String(length=50), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(["meeting_id"], ["board_meeting.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "board_attendance",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("meeting_id", sa.UUID(), nullable=False),
+        sa.Column("member_id", sa.UUID(), nullable=False),
+        sa.Column("attendance_type", sa.String(length=30), nullable=False),
+        sa.Column("proxy_name", sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(["meeting_id"], ["board_meeting.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["member_id"], ["board_member.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "budget",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("fiscal_year", sa.Integer(), nullable=False),
+        sa.Column("total_budget", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.Column("total_spent", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("project_id", "fiscal_year"),
+    )
+    op.create_table(
+        "donation",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("donor_id", sa.UUID(), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("donated_at", sa.Date(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column("purpose", sa.String(length=300), nullable=True),
+        sa.Column("payment_method", sa.String(length=50), nullable=False),
+        sa.Column("receipt_issued", sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.CheckConstraint(
+            "payment_method IN ('BANK', 'CARD', 'CASH', 'ONLINE', 'OTHER')", name="ck_donation_payment_method"
+        ),
+        sa.ForeignKeyConstraint(["donor_id"], ["donor.id"]),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "donor_sensitive",
+        sa.Column("donor_id", sa.UUID(), nullable=False),
+        sa.Column("rrn_encrypted", sa.LargeBinary(), nullable=False),
+        sa.Column("encryption_key_id", sa.String(length=100), nullable=False),
+        sa.ForeignKeyConstraint(["donor_id"], ["donor.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("donor_id"),
+    )
+    op.create_table(
+        "notary_package",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("meeting_id", sa.UUID(), nullable=False),
+        sa.Column("generated_at", sa.DateTime(), nullable=False),
+        sa.Column("merged_pdf_path", sa.String(length=300), nullable=False),
+        sa.Column("seal_certificate_issued_at", sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(["meeting_id"], ["board_meeting.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "transaction_approval",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("head_id", sa.UUID(), nullable=False),
+        sa.Column("step_id", sa.UUID(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("decided_by", sa.UUID(), nullable=True),
+        sa.ForeignKeyConstraint(["head_id"], ["transaction_head.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["step_id"], ["approval_step.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "transaction_line",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("head_id", sa.UUID(), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("account_code_id", sa.UUID(), nullable=False),
+        sa.Column("debit_amount", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.Column("credit_amount", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.Column("evidence_url", sa.String(), nullable=True),
+        sa.CheckConstraint(
+            "(debit_amount > 0 AND credit_amount = 0) OR (credit_amount > 0 AND debit_amount = 0)",
+            name="ck_transaction_line_one_side",
+        ),
+        sa.ForeignKeyConstraint(["account_code_id"], ["account_code.id"]),
+        sa.ForeignKeyConstraint(["head_id"], ["transaction_head.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "allocation_result",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("source_line_id", sa.UUID(), nullable=False),
+        sa.Column("allocated_line_id", sa.UUID(), nullable=False),
+        sa.Column("rule_id", sa.UUID(), nullable=False),
+        sa.Column("allocated_amount", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(["allocated_line_id"], ["transaction_line.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["rule_id"], ["allocation_rule.id"]),
+        sa.ForeignKeyConstraint(["source_line_id"], ["transaction_line.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "allocation_rule_item",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("rule_id", sa.UUID(), nullable=False),
+        sa.Column("target_project_id", sa.UUID(), nullable=False),
+        sa.Column("ratio", sa.Numeric(precision=6, scale=4), nullable=False),
+        sa.CheckConstraint("ratio > 0 AND ratio <= 1", name="ck_allocation_rule_item_ratio"),
+        sa.ForeignKeyConstraint(["rule_id"], ["allocation_rule.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["target_project_id"], ["project.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("rule_id", "target_project_id"),
+    )
+    op.create_table(
+        "donation_receipt",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("donation_id", sa.UUID(), nullable=False),
+        sa.Column("receipt_no", sa.String(length=50), nullable=False),
+        sa.Column("issued_amount", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(["donation_id"], ["donation.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("receipt_no"),
+    )
+
+    op.execute(CHECK_TRANSACTION_BALANCE)
+    op.execute(
+        """
+        CREATE TRIGGER trg_check_transaction_balance
+        AFTER INSERT OR UPDATE OR DELETE ON transaction_line
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION check_transaction_balance()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_check_transaction_balance ON transaction_line")
+    op.execute("DROP FUNCTION IF EXISTS check_transaction_balance()")
+    for table in (
+        "donation_receipt",
+        "allocation_rule_item",
+        "allocation_result",
+        "transaction_line",
+        "transaction_approval",
+        "notary_package",
+        "donor_sensitive",
+        "donation",
+        "budget",
+        "board_attendance",
+        "board_agenda",
+        "allocation_rule",
+        "transaction_head",
+        "project",
+        "donor",
+        "board_member",
+        "board_meeting",
+        "audit_log",
+        "approval_step",
+        "account_code",
+    ):
+        op.drop_table(table)
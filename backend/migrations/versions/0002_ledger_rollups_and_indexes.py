@@ -0,0 +1,195 @@
+"""Ledger rollups, fiscal periods, ledger triggers and hot-path indexes
+
+Everything the ledger gained on top of the 0001 baseline: the monthly
+``period_balance`` rollup, ``fiscal_period``/``closing_balance`` with the
+closed-year trigger, and the balance trigger, which databases built with
+``create_all`` never had (re-created idempotently, so schema.sql databases
+keep theirs). ``period_balance`` starts empty; on a database with approved
+lines run ``python -m app.commands.period_balance rebuild`` after upgrading.
+
+The indexes are built CONCURRENTLY so they can be applied to a live ledger
+without blocking postings; that needs to run outside the migration
+transaction.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+CHECK_TRANSACTION_BALANCE = """
+CREATE OR REPLACE FUNCTION check_transaction_balance()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_head_id UUID;
+  v_debit NUMERIC(18,2);
+  v_credit NUMERIC(18,2);
+BEGIN
+  IF (TG_OP = 'DELETE') THEN
+    v_head_id := OLD.head_id;
+  ELSE
+    v_head_id := NEW.head_id;
+  END IF;
+
+  SELECT COALESCE(SUM(debit_amount), 0), COALESCE(SUM(credit_amount), 0)
+  INTO v_debit, v_credit
+  FROM transaction_line
+  WHERE head_id = v_head_id;
+
+  IF v_debit <> v_credit THEN
+    RAISE EXCEPTION 'Transaction not balanced. head_id=%, debit=%, credit=%',
+      v_head_id, v_debit, v_credit;
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+CHECK_FISCAL_PERIOD_OPEN = """
+CREATE OR REPLACE FUNCTION check_fiscal_period_open()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF (TG_OP <> 'INSERT') AND EXISTS (
+    SELECT 1 FROM fiscal_period
+    WHERE fiscal_year = EXTRACT(YEAR FROM OLD.tx_date) AND status = 'CLOSED'
+  ) THEN
+    RAISE EXCEPTION 'Fiscal year % is closed', EXTRACT(YEAR FROM OLD.tx_date);
+  END IF;
+  IF (TG_OP <> 'DELETE') AND EXISTS (
+    SELECT 1 FROM fiscal_period
+    WHERE fiscal_year = EXTRACT(YEAR FROM NEW.tx_date) AND status = 'CLOSED'
+  ) THEN
+    RAISE EXCEPTION 'Fiscal year % is closed', EXTRACT(YEAR FROM NEW.tx_date);
+  END IF;
+  IF (TG_OP = 'DELETE') THEN
+    RETURN OLD;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+INDEXES = [
+    (
+        "ix_transaction_head_approved_date_id",
+        "transaction_head",
+        ["tx_date", "id"],
+        {"postgresql_where": sa.text("status = 'APPROVED'")},
+    ),
+    (
+        "ix_transaction_line_account_head_id",
+        "transaction_line",
+        ["account_code_id", "head_id", "id"],
+        {"postgresql_include": ["project_id", "debit_amount", "credit_amount"]},
+    ),
+    (
+        "ix_transaction_line_head_id",
+        "transaction_line",
+        ["head_id"],
+        {"postgresql_include": ["project_id", "account_code_id", "debit_amount", "credit_amount"]},
+    ),
+    (
+        "ix_transaction_line_project_account",
+        "transaction_line",
+        ["project_id", "account_code_id"],
+        {"postgresql_include": ["head_id", "debit_amount", "credit_amount"]},
+    ),
+    ("ix_transaction_head_status_date", "transaction_head", ["status", "tx_date"], {"postgresql_include": ["id"]}),
+    ("ix_transaction_approval_head_id", "transaction_approval", ["head_id"], {}),
+    ("ix_allocation_rule_project_effective", "allocation_rule", ["project_id", "effective_from"], {}),
+    ("ix_allocation_result_source_line_id", "allocation_result", ["source_line_id"], {}),
+    ("ix_allocation_result_allocated_line_id", "allocation_result", ["allocated_line_id"], {}),
+    ("ix_donation_project_donated_at", "donation", ["project_id", "donated_at"], {}),
+    ("ix_donation_donor_id", "donation", ["donor_id"], {}),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fiscal_period",
+        sa.Column("fiscal_year", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=10), server_default="OPEN", nullable=False),
+        sa.Column("closed_at", sa.DateTime(), nullable=True),
+        sa.Column("closed_by", sa.UUID(), nullable=True),
+        sa.Column("net_assets_account_id", sa.UUID(), nullable=True),
+        sa.CheckConstraint("status IN ('OPEN', 'CLOSED')", name="ck_fiscal_period_status"),
+        sa.ForeignKeyConstraint(["net_assets_account_id"], ["account_code.id"]),
+        sa.PrimaryKeyConstraint("fiscal_year"),
+    )
+    op.create_table(
+        "period_balance",
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("account_code_id", sa.UUID(), nullable=False),
+        sa.Column("year_month", sa.Integer(), nullable=False),
+        sa.Column("debit_total", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.Column("credit_total", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["account_code_id"], ["account_code.id"]),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"]),
+        sa.PrimaryKeyConstraint("project_id", "account_code_id", "year_month"),
+    )
+    op.create_index("ix_period_balance_year_month", "period_balance", ["year_month"])
+    op.create_table(
+        "closing_balance",
+        sa.Column("fiscal_year", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("account_code_id", sa.UUID(), nullable=False),
+        sa.Column("debit_total", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.Column("credit_total", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.Column("closing_debit", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.Column("closing_credit", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.Column("balance", sa.Numeric(precision=18, scale=2), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["account_code_id"], ["account_code.id"]),
+        sa.ForeignKeyConstraint(["fiscal_year"], ["fiscal_period.fiscal_year"]),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"]),
+        sa.PrimaryKeyConstraint("fiscal_year", "project_id", "account_code_id"),
+    )
+
+    # schema.sql databases already have the balance trigger; create_all ones never did
+    op.execute(CHECK_TRANSACTION_BALANCE)
+    op.execute("DROP TRIGGER IF EXISTS trg_check_transaction_balance ON transaction_line")
+    op.execute(
+        """
+        CREATE TRIGGER trg_check_transaction_balance
+        AFTER INSERT OR UPDATE OR DELETE ON transaction_line
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION check_transaction_balance()
+        """
+    )
+    op.execute(CHECK_FISCAL_PERIOD_OPEN)
+    op.execute(
+        """
+        CREATE TRIGGER trg_check_fiscal_period_open
+        BEFORE INSERT OR UPDATE OR DELETE ON transaction_head
+        FOR EACH ROW
+        EXECUTE FUNCTION check_fiscal_period_open()
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            # A failed CONCURRENTLY build leaves an INVALID index behind; drop it first
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+            op.create_index(name, table, columns, postgresql_concurrently=True, **kwargs)
+    op.execute(sa.text("ANALYZE transaction_line"))
+    op.execute(sa.text("ANALYZE transaction_head"))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+    # The balance trigger belongs to the 0001 baseline and stays
+    op.execute("DROP TRIGGER IF EXISTS trg_check_fiscal_period_open ON transaction_head")
+    op.execute("DROP FUNCTION IF EXISTS check_fiscal_period_open()")
+    op.drop_table("closing_balance")
+    op.drop_table("period_balance")
+    op.drop_table("fiscal_period")
@@ -0,0 +1,236 @@
+"""Partitioned ledger tables, filled online alongside the live ones
+
+Builds ``<table>_part`` copies of transaction_head, transaction_line,
+transaction_approval and allocation_result, range-partitioned by tx_date per
+fiscal year (line, approval and allocation rows carry their head's tx_date so
+the foreign keys and partition bounds line up). Row triggers on the live
+tables mirror every write into the copies while history is copied over in
+short keyset batches, so no statement holds more than a row lock for long.
+The swap itself is revision 0004.
+
+Run ``alembic upgrade 0003`` while the old version keeps serving, then stop
+writers and ``alembic upgrade head`` for the (seconds-long) swap.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+import logging
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+log = logging.getLogger("alembic.ledger_partitioning")
+
+COPY_BATCH_SIZE = 10_000
+YEARS_AHEAD = 1
+
+# (table, columns of the live table, tx_date of a live row ``{row}``); parents first
+LEDGER_TABLES = [
+    ("transaction_head", ["id", "tx_date", "description", "status", "created_by", "approved_by"], "{row}.tx_date"),
+    (
+        "transaction_line",
+        ["id", "head_id", "project_id", "account_code_id", "debit_amount", "credit_amount", "evidence_url"],
+        "(SELECT h.tx_date FROM transaction_head h WHERE h.id = {row}.head_id)",
+    ),
+    (
+        "transaction_approval",
+        ["id", "head_id", "step_id", "status", "decided_by"],
+        "(SELECT h.tx_date FROM transaction_head h WHERE h.id = {row}.head_id)",
+    ),
+    (
+        "allocation_result",
+        ["id", "source_line_id", "allocated_line_id", "rule_id", "allocated_amount"],
+        "(SELECT h.tx_date FROM transaction_line l JOIN transaction_head h ON h.id = l.head_id"
+        " WHERE l.id = {row}.source_line_id)",
+    ),
+]
+
+PARTITIONED_DDL = [
+    """
+    CREATE TABLE transaction_head_part (
+      id UUID NOT NULL,
+      tx_date DATE NOT NULL,
+      description VARCHAR(500),
+      status VARCHAR(20) NOT NULL CHECK (status IN ('DRAFT', 'APPROVED', 'REJECTED')),
+      created_by UUID NOT NULL,
+      approved_by UUID,
+      PRIMARY KEY (id, tx_date)
+    ) PARTITION BY RANGE (tx_date)
+    """,
+    """
+    CREATE TABLE transaction_line_part (
+      id UUID NOT NULL,
+      head_id UUID NOT NULL,
+      tx_date DATE NOT NULL,
+      project_id UUID NOT NULL REFERENCES project(id),
+      account_code_id UUID NOT NULL REFERENCES account_code(id),
+      debit_amount NUMERIC(18,2) NOT NULL DEFAULT 0,
+      credit_amount NUMERIC(18,2) NOT NULL DEFAULT 0,
+      evidence_url VARCHAR,
+      PRIMARY KEY (id, tx_date),
+      FOREIGN KEY (head_id, tx_date) REFERENCES transaction_head_part (id, tx_date) ON DELETE CASCADE,
+      CHECK (
+        (debit_amount > 0 AND credit_amount = 0)
+        OR (credit_amount > 0 AND debit_amount = 0)
+      )
+    ) PARTITION BY RANGE (tx_date)
+    """,
+    """
+    CREATE TABLE transaction_approval_part (
+      id UUID NOT NULL,
+      head_id UUID NOT NULL,
+      tx_date DATE NOT NULL,
+      step_id UUID NOT NULL REFERENCES approval_step(id),
+      status VARCHAR(20) NOT NULL,
+      decided_by UUID,
+      PRIMARY KEY (id, tx_date),
+      FOREIGN KEY (head_id, tx_date) REFERENCES transaction_head_part (id, tx_date) ON DELETE CASCADE
+    ) PARTITION BY RANGE (tx_date)
+    """,
+    """
+    CREATE TABLE allocation_result_part (
+      id UUID NOT NULL,
+      tx_date DATE NOT NULL,
+      source_line_id UUID NOT NULL,
+      allocated_line_id UUID NOT NULL,
+      rule_id UUID NOT NULL REFERENCES allocation_rule(id),
+      allocated_amount NUMERIC(18,2) NOT NULL,
+      PRIMARY KEY (id, tx_date),
+      FOREIGN KEY (source_line_id, tx_date) REFERENCES transaction_line_part (id, tx_date) ON DELETE CASCADE,
+      FOREIGN KEY (allocated_line_id, tx_date) REFERENCES transaction_line_part (id, tx_date) ON DELETE CASCADE
+    ) PARTITION BY RANGE (tx_date)
+    """,
+]
+
+# Same names as on the live tables once the copies take their place (0004)
+INDEXES = [
+    ("ix_transaction_head_approved_date_id", "transaction_head", "(tx_date, id) WHERE status = 'APPROVED'"),
+    ("ix_transaction_head_status_date", "transaction_head", "(status, tx_date) INCLUDE (id)"),
+    (
+        "ix_transaction_line_account_head_id",
+        "transaction_line",
+        "(account_code_id, head_id, id) INCLUDE (project_id, debit_amount, credit_amount)",
+    ),
+    (
+        "ix_transaction_line_head_id",
+        "transaction_line",
+        "(head_id) INCLUDE (project_id, account_code_id, debit_amount, credit_amount)",
+    ),
+    (
+        "ix_transaction_line_project_account",
+        "transaction_line",
+        "(project_id, account_code_id) INCLUDE (head_id, debit_amount, credit_amount)",
+    ),
+    ("ix_transaction_approval_head_id", "transaction_approval", "(head_id)"),
+    ("ix_allocation_result_source_line_id", "allocation_result", "(source_line_id)"),
+    ("ix_allocation_result_allocated_line_id", "allocation_result", "(allocated_line_id)"),
+]
+
+
+def _mirror_function(table: str, columns: list[str], tx_date_sql: str) -> str:
+    row_columns = ", ".join(f"NEW.{c}" for c in columns)
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in ("id", "tx_date"))
+    insert_columns = ", ".join(columns if "tx_date" in columns else [*columns, "tx_date"])
+    insert_values = row_columns if "tx_date" in columns else f"{row_columns}, {tx_date_sql.format(row='NEW')}"
+    return f"""
+    CREATE FUNCTION mirror_{table}() RETURNS TRIGGER AS $$
+    BEGIN
+      IF (TG_OP = 'DELETE') THEN
+        DELETE FROM {table}_part WHERE id = OLD.id;
+        RETURN NULL;
+      END IF;
+      INSERT INTO {table}_part ({insert_columns})
+      VALUES ({insert_values})
+      ON CONFLICT (id, tx_date) DO UPDATE SET {updates};
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+
+
+def _copy_sql(table: str, columns: list[str], tx_date_sql: str, first: bool) -> str:
+    insert_columns = ", ".join(columns if "tx_date" in columns else [*columns, "tx_date"])
+    select_columns = ", ".join(f"r.{c}" for c in columns)
+    if "tx_date" not in columns:
+        select_columns += f", {tx_date_sql.format(row='r')}"
+    return f"""
+    WITH batch AS (
+      SELECT * FROM {table} {"" if first else "WHERE id > :after"} ORDER BY id LIMIT :limit
+    ),
+    copied AS (
+      INSERT INTO {table}_part ({insert_columns})
+      SELECT {select_columns} FROM batch r
+      ON CONFLICT (id, tx_date) DO NOTHING
+    )
+    SELECT max(id::text)::uuid, count(*) FROM batch
+    """
+
+
+def _create_year_partitions(conn, parent_suffix: str, years: range) -> None:
+    for year in years:
+        for table, _, _ in LEDGER_TABLES:
+            conn.execute(
+                sa.text(
+                    f"CREATE TABLE IF NOT EXISTS {table}_y{year} PARTITION OF {table}{parent_suffix} "
+                    f"FOR VALUES FROM ('{date(year, 1, 1)}') TO ('{date(year + 1, 1, 1)}')"
+                )
+            )
+
+
+def upgrade() -> None:
+    if op.get_context().as_sql:
+        raise RuntimeError("0003 copies the ledger online; run it against the database, not with --sql")
+    conn = op.get_bind()
+
+    first_year, last_year = conn.execute(
+        sa.text("SELECT EXTRACT(YEAR FROM min(tx_date))::int, EXTRACT(YEAR FROM max(tx_date))::int FROM transaction_head")
+    ).one()
+    this_year = date.today().year
+    years = range(min(first_year or this_year, this_year), max(last_year or this_year, this_year) + YEARS_AHEAD + 1)
+
+    for ddl in PARTITIONED_DDL:
+        op.execute(ddl)
+    for name, table, definition in INDEXES:
+        op.execute(f"CREATE INDEX {name}_part ON {table}_part {definition}")
+    _create_year_partitions(conn, "_part", years)
+    for table, columns, tx_date_sql in LEDGER_TABLES:
+        op.execute(_mirror_function(table, columns, tx_date_sql))
+
+    with op.get_context().autocommit_block():
+        # Parents first: once a table is mirrored and copied, every row its
+        # children can reference already exists in the copy.
+        for table, columns, tx_date_sql in LEDGER_TABLES:
+            conn.execute(
+                sa.text(
+                    f"CREATE TRIGGER trg_mirror_{table} AFTER INSERT OR UPDATE OR DELETE ON {table} "
+                    f"FOR EACH ROW EXECUTE FUNCTION mirror_{table}()"
+                )
+            )
+            first_batch = sa.text(_copy_sql(table, columns, tx_date_sql, first=True))
+            next_batch = sa.text(_copy_sql(table, columns, tx_date_sql, first=False)).bindparams(
+                sa.bindparam("after", type_=sa.UUID())
+            )
+            after, copied = None, 0
+            while True:
+                copy = first_batch if after is None else next_batch
+                params = {"limit": COPY_BATCH_SIZE} if after is None else {"after": after, "limit": COPY_BATCH_SIZE}
+                last_id, count = conn.execute(copy, params).one()
+                if not count:
+                    break
+                after, copied = last_id, copied + count
+            log.info("copied %s rows of %s", copied, table)
+            conn.execute(sa.text(f"ANALYZE {table}_part"))
+
+
+def downgrade() -> None:
+    for table, _, _ in reversed(LEDGER_TABLES):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_mirror_{table} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS mirror_{table}()")
+        op.execute(f"DROP TABLE IF EXISTS {table}_part CASCADE")
@@ -0,0 +1,102 @@
+"""Swap the partitioned ledger tables in
+
+Short ACCESS EXCLUSIVE window: drops the mirror triggers from 0003, renames
+the live tables to ``<table>_unpartitioned`` (kept for verification; drop
+them once satisfied) and gives the partitioned copies their names, indexes
+and ledger triggers. Also adds ``ensure_ledger_partitions(year)`` used to
+create partitions ahead of time, and ``fiscal_period.archived_at``.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+LEDGER_TABLES = ["transaction_head", "transaction_line", "transaction_approval", "allocation_result"]
+INDEXES = [
+    "ix_transaction_head_approved_date_id",
+    "ix_transaction_head_status_date",
+    "ix_transaction_line_account_head_id",
+    "ix_transaction_line_head_id",
+    "ix_transaction_line_project_account",
+    "ix_transaction_approval_head_id",
+    "ix_allocation_result_source_line_id",
+    "ix_allocation_result_allocated_line_id",
+]
+
+ENSURE_LEDGER_PARTITIONS = """
+CREATE OR REPLACE FUNCTION ensure_ledger_partitions(p_year INT)
+RETURNS INT AS $$
+DECLARE
+  t TEXT;
+  created INT := 0;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['transaction_head', 'transaction_line', 'transaction_approval', 'allocation_result'] LOOP
+    IF to_regclass(t || '_y' || p_year) IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        t || '_y' || p_year, t, make_date(p_year, 1, 1), make_date(p_year + 1, 1, 1)
+      );
+      created := created + 1;
+    END IF;
+  END LOOP;
+  RETURN created;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute("SET LOCAL lock_timeout = '10s'")
+    op.execute(f"LOCK TABLE {', '.join(LEDGER_TABLES)} IN ACCESS EXCLUSIVE MODE")
+
+    for table in LEDGER_TABLES:
+        op.execute(f"DROP TRIGGER trg_mirror_{table} ON {table}")
+        op.execute(f"DROP FUNCTION mirror_{table}()")
+    op.execute("DROP TRIGGER trg_check_transaction_balance ON transaction_line")
+    op.execute("DROP TRIGGER trg_check_fiscal_period_open ON transaction_head")
+
+    for table in LEDGER_TABLES:
+        op.rename_table(table, f"{table}_unpartitioned")
+        op.execute(f"ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT {table}_pkey TO {table}_unpartitioned_pkey")
+    for name in INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_unpartitioned")
+
+    for table in LEDGER_TABLES:
+        op.rename_table(f"{table}_part", table)
+        op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {table}_part_pkey TO {table}_pkey")
+    for name in INDEXES:
+        op.execute(f"ALTER INDEX {name}_part RENAME TO {name}")
+
+    op.execute(
+        """
+        CREATE TRIGGER trg_check_transaction_balance
+        AFTER INSERT OR UPDATE OR DELETE ON transaction_line
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION check_transaction_balance()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_check_fiscal_period_open
+        BEFORE INSERT OR UPDATE OR DELETE ON transaction_head
+        FOR EACH ROW
+        EXECUTE FUNCTION check_fiscal_period_open()
+        """
+    )
+    op.execute(ENSURE_LEDGER_PARTITIONS)
+    op.add_column("fiscal_period", sa.Column("archived_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    raise RuntimeError(
+        "The partitioned ledger cannot be swapped back automatically; the *_unpartitioned tables "
+        "stopped receiving writes at 0004."
+    )
@@ -0,0 +1,32 @@
+"""Checkpoints for the online RRN key-rotation job
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "key_rotation_checkpoint",
+        sa.Column("table_name", sa.String(length=100), nullable=False),
+        sa.Column("target_key_id", sa.String(length=100), nullable=False),
+        sa.Column("last_pk", sa.String(length=100), nullable=True),
+        sa.Column("rows_rotated", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("rows_skipped", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("started_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("table_name", "target_key_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("key_rotation_checkpoint")
@@ -0,0 +1,45 @@
+"""Blind-index columns for RRN equality lookups
+
+The columns are added nullable (a catalog-only change) and filled by
+``python -m app.commands.backfill_rrn_blind_index``; the indexes are built
+CONCURRENTLY outside the migration transaction, together with the
+donation_receipt(donation_id) index the receipt lookup joins through.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+BLIND_INDEX_TABLES = ["donor_sensitive", "board_member"]
+
+INDEXES = [
+    ("ix_donor_sensitive_rrn_blind_index", "donor_sensitive", ["rrn_blind_index"]),
+    ("ix_board_member_rrn_blind_index", "board_member", ["rrn_blind_index"]),
+    ("ix_donation_receipt_donation_id", "donation_receipt", ["donation_id"]),
+]
+
+
+def upgrade() -> None:
+    for table in BLIND_INDEX_TABLES:
+        op.add_column(table, sa.Column("rrn_blind_index", sa.LargeBinary(), nullable=True))
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            # A failed CONCURRENTLY build leaves an INVALID index behind; drop it first
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+    for table in reversed(BLIND_INDEX_TABLES):
+        op.drop_column(table, "rrn_blind_index")
@@ -0,0 +1,52 @@
+"""Make the donor RRN blind index unique
+
+Replaces the plain donor_sensitive index from 0006 with a partial UNIQUE
+index over the non-NULL values, so two concurrent registrations of the same
+RRN cannot both commit. board_member keeps its plain index: a re-appointed
+member has one row per term. The build runs CONCURRENTLY outside the
+migration transaction and fails if donors indexed before this revision
+already share an RRN; find them with ``SELECT rrn_blind_index FROM
+donor_sensitive WHERE rrn_blind_index IS NOT NULL GROUP BY 1 HAVING
+count(*) > 1``, resolve them and re-run the upgrade.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+# (unique index, the 0006 index it replaces, table)
+INDEXES = [
+    ("uq_donor_sensitive_rrn_blind_index", "ix_donor_sensitive_rrn_blind_index", "donor_sensitive"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, replaced, table in INDEXES:
+            # A failed CONCURRENTLY build leaves an INVALID index behind; drop it first
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+            op.create_index(
+                name,
+                table,
+                ["rrn_blind_index"],
+                unique=True,
+                postgresql_where=sa.text("rrn_blind_index IS NOT NULL"),
+                postgresql_concurrently=True,
+            )
+            op.drop_index(replaced, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, replaced, table in reversed(INDEXES):
+            op.drop_index(replaced, table_name=table, if_exists=True, postgresql_concurrently=True)
+            op.create_index(replaced, table, ["rrn_blind_index"], postgresql_concurrently=True)
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
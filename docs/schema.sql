@@ -1,4 +1,5 @@
 -- Core schema for NPO-TrustOS (PostgreSQL)
+-- Applied through Alembic (backend/migrations); keep both in sync.
 
 CREATE EXTENSION IF NOT EXISTS pgcrypto;
 
@@ -31,27 +32,111 @@ CREATE TABLE account_code (
   is_active BOOLEAN NOT NULL DEFAULT TRUE
 );
 
+-- Ledger tables are range-partitioned by tx_date, one partition per fiscal year
+-- (transaction_head_y2025, transaction_line_y2025, ...). The partition key is part
+-- of the primary keys and of the foreign keys between ledger tables.
 CREATE TABLE transaction_head (
-  id UUID PRIMARY KEY,
+  id UUID NOT NULL,
   tx_date DATE NOT NULL,
   description VARCHAR(500),
   status VARCHAR(20) NOT NULL CHECK (status IN ('DRAFT', 'APPROVED', 'REJECTED')),
   created_by UUID NOT NULL,
-  approved_by UUID
-);
+  approved_by UUID,
+  PRIMARY KEY (id, tx_date)
+) PARTITION BY RANGE (tx_date);
 
 CREATE TABLE transaction_line (
-  id UUID PRIMARY KEY,
-  head_id UUID NOT NULL REFERENCES transaction_head(id) ON DELETE CASCADE,
+  id UUID NOT NULL,
+  head_id UUID NOT NULL,
+  tx_date DATE NOT NULL,  -- copied from the head
   project_id UUID NOT NULL REFERENCES project(id),
   account_code_id UUID NOT NULL REFERENCES account_code(id),
   debit_amount NUMERIC(18,2) NOT NULL DEFAULT 0,
   credit_amount NUMERIC(18,2) NOT NULL DEFAULT 0,
   evidence_url TEXT,
+  PRIMARY KEY (id, tx_date),
+  FOREIGN KEY (head_id, tx_date) REFERENCES transaction_head (id, tx_date) ON DELETE CASCADE,
   CHECK (
     (debit_amount > 0 AND credit_amount = 0)
     OR (credit_amount > 0 AND debit_amount = 0)
   )
+) PARTITION BY RANGE (tx_date);
+
+-- Creates the year's partition of every ledger table if missing; run ahead of
+-- time (background maintainer / app.commands.ledger_partitions), never by postings
+CREATE OR REPLACE FUNCTION ensure_ledger_partitions(p_year INT)
+RETURNS INT AS $$
+DECLARE
+  t TEXT;
+  created INT := 0;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['transaction_head', 'transaction_line', 'transaction_approval', 'allocation_result'] LOOP
+    IF to_regclass(t || '_y' || p_year) IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        t || '_y' || p_year, t, make_date(p_year, 1, 1), make_date(p_year + 1, 1, 1)
+      );
+      created := created + 1;
+    END IF;
+  END LOOP;
+  RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Keyset order of approved heads (account ledger / exports)
+CREATE INDEX ix_transaction_head_approved_date_id
+  ON transaction_head (tx_date, id) WHERE status = 'APPROVED';
+
+-- Account ledger pages and trial balance per account
+CREATE INDEX ix_transaction_line_account_head_id
+  ON transaction_line (account_code_id, head_id, id)
+  INCLUDE (project_id, debit_amount, credit_amount);
+
+-- Status queues and date-range filters on any status
+CREATE INDEX ix_transaction_head_status_date
+  ON transaction_head (status, tx_date) INCLUDE (id);
+
+-- Lines of a head: rollup apply, balance trigger, cascades, report joins
+CREATE INDEX ix_transaction_line_head_id
+  ON transaction_line (head_id)
+  INCLUDE (project_id, account_code_id, debit_amount, credit_amount);
+
+-- Per-project statements and ledgers
+CREATE INDEX ix_transaction_line_project_account
+  ON transaction_line (project_id, account_code_id)
+  INCLUDE (head_id, debit_amount, credit_amount);
+
+CREATE TABLE period_balance (
+  project_id UUID NOT NULL REFERENCES project(id),
+  account_code_id UUID NOT NULL REFERENCES account_code(id),
+  year_month INT NOT NULL,
+  debit_total NUMERIC(18,2) NOT NULL DEFAULT 0,
+  credit_total NUMERIC(18,2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (project_id, account_code_id, year_month)
+);
+
+CREATE INDEX ix_period_balance_year_month ON period_balance (year_month);
+
+CREATE TABLE fiscal_period (
+  fiscal_year INT PRIMARY KEY,
+  status VARCHAR(10) NOT NULL DEFAULT 'OPEN' CHECK (status IN ('OPEN', 'CLOSED')),
+  closed_at TIMESTAMP,
+  closed_by UUID,
+  net_assets_account_id UUID REFERENCES account_code(id),
+  archived_at TIMESTAMP  -- ledger partitions detached into the archive schema
+);
+
+-- Frozen year-end figures of a closed fiscal year
+CREATE TABLE closing_balance (
+  fiscal_year INT NOT NULL REFERENCES fiscal_period(fiscal_year),
+  project_id UUID NOT NULL REFERENCES project(id),
+  account_code_id UUID NOT NULL REFERENCES account_code(id),
+  debit_total NUMERIC(18,2) NOT NULL DEFAULT 0,
+  credit_total NUMERIC(18,2) NOT NULL DEFAULT 0,
+  closing_debit NUMERIC(18,2) NOT NULL DEFAULT 0,
+  closing_credit NUMERIC(18,2) NOT NULL DEFAULT 0,
+  balance NUMERIC(18,2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (fiscal_year, project_id, account_code_id)
 );
 
 CREATE TABLE allocation_rule (
@@ -64,6 +149,8 @@ CREATE TABLE allocation_rule (
   effective_to DATE
 );
 
+CREATE INDEX ix_allocation_rule_project_effective ON allocation_rule (project_id, effective_from);
+
 CREATE TABLE allocation_rule_item (
   id UUID PRIMARY KEY,
   rule_id UUID NOT NULL REFERENCES allocation_rule(id) ON DELETE CASCADE,
@@ -82,7 +169,24 @@ CREATE TABLE donor (
 CREATE TABLE donor_sensitive (
   donor_id UUID PRIMARY KEY REFERENCES donor(id) ON DELETE CASCADE,
   rrn_encrypted BYTEA NOT NULL,
-  encryption_key_id VARCHAR(100) NOT NULL
+  encryption_key_id VARCHAR(100) NOT NULL,
+  -- HMAC-SHA256 of the normalized RRN, for equality lookups without decryption
+  rrn_blind_index BYTEA
+);
+CREATE UNIQUE INDEX uq_donor_sensitive_rrn_blind_index ON donor_sensitive (rrn_blind_index)
+  WHERE rrn_blind_index IS NOT NULL;
+
+-- Progress of the online RRN key-rotation job (app.commands.rotate_rrn_keys)
+CREATE TABLE key_rotation_checkpoint (
+  table_name VARCHAR(100) NOT NULL,
+  target_key_id VARCHAR(100) NOT NULL,
+  last_pk VARCHAR(100),
+  rows_rotated BIGINT NOT NULL DEFAULT 0,
+  rows_skipped BIGINT NOT NULL DEFAULT 0,
+  started_at TIMESTAMP NOT NULL DEFAULT now(),
+  updated_at TIMESTAMP NOT NULL DEFAULT now(),
+  finished_at TIMESTAMP,
+  PRIMARY KEY (table_name, target_key_id)
 );
 
 CREATE TABLE donation (
@@ -96,6 +200,9 @@ CREATE TABLE donation (
   receipt_issued BOOLEAN NOT NULL DEFAULT FALSE
 );
 
+CREATE INDEX ix_donation_project_donated_at ON donation (project_id, donated_at);
+CREATE INDEX ix_donation_donor_id ON donation (donor_id);
+
 -- Balance check trigger (head debit == credit)
 CREATE OR REPLACE FUNCTION check_transaction_balance()
 RETURNS TRIGGER AS $$
@@ -128,3 +235,31 @@ CREATE TRIGGER trg_check_transaction_balance
 AFTER INSERT OR UPDATE OR DELETE ON transaction_line
 FOR EACH STATEMENT
 EXECUTE FUNCTION check_transaction_balance();
+
+-- Closed fiscal years reject changes to their transactions
+CREATE OR REPLACE FUNCTION check_fiscal_period_open()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF (TG_OP <> 'INSERT') AND EXISTS (
+    SELECT 1 FROM fiscal_period
+    WHERE fiscal_year = EXTRACT(YEAR FROM OLD.tx_date) AND status = 'CLOSED'
+  ) THEN
+    RAISE EXCEPTION 'Fiscal year % is closed', EXTRACT(YEAR FROM OLD.tx_date);
+  END IF;
+  IF (TG_OP <> 'DELETE') AND EXISTS (
+    SELECT 1 FROM fiscal_period
+    WHERE fiscal_year = EXTRACT(YEAR FROM NEW.tx_date) AND status = 'CLOSED'
+  ) THEN
+    RAISE EXCEPTION 'Fiscal year % is closed', EXTRACT(YEAR FROM NEW.tx_date);
+  END IF;
+  IF (TG_OP = 'DELETE') THEN
+    RETURN OLD;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_check_fiscal_period_open
+BEFORE INSERT OR UPDATE OR DELETE ON transaction_head
+FOR EACH ROW
+EXECUTE FUNCTION check_fiscal_period_open();